@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import ast
+import builtins
 import importlib
+import importlib.util
+import operator
 import os
 import re
 import sys
+import threading
+from collections import ChainMap, OrderedDict
+from fractions import Fraction
+from functools import lru_cache
+from math import factorial
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Sequence
+from types import CodeType, MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
 
 import numpy as np
 from fastmcp import FastMCP
@@ -31,6 +41,19 @@ USAGE_EXAMPLES: Dict[str, List[Dict[str, str]]] = {
             "description": "Positive root of x^2 - 9 using Brent's method.",
         },
     ],
+    "solve_equation_all": [
+        {
+            "call": "solve_equation_all('np.sin(x)', range_start=-4.0, range_end=4.0)",
+            "expected_result": "[-3.141592653589793, 0.0, 3.141592653589793]",
+            "description": "Every root of sin(x) in [-4, 4] from one scan.",
+        },
+        {
+            "call": "solve_equation_batch(['x**2 - a'], range_start=0.0, parameter='a', parameter_values=[4.0, 16.0])",
+            "expected_result": "[{'expression': 'x**2 - a', 'parameter_value': 4.0, 'roots': [2.0]}, "
+                               "{'expression': 'x**2 - a', 'parameter_value': 16.0, 'roots': [4.0]}]",
+            "description": "Positive roots of x^2 - a for several parameter values.",
+        },
+    ],
     "differentiate": [
         {
             "call": "differentiate('x**3 + 2*x', point=2.0)",
@@ -56,12 +79,12 @@ USAGE_EXAMPLES: Dict[str, List[Dict[str, str]]] = {
         },
         {
             "call": "integrate_function('np.sin(x)', lower=0.0, upper=np.pi)",
-            "expected_result": "{'value': 2.0, 'abserr': 2.220446049250313e-14}",
+            "expected_result": "{'value': 2.0, 'abserr': 2.2204460492503128e-14}",
             "description": "Integral of sin(x) over one half-period.",
         },
         {
             "call": "integrate_function('x**2', lower=-1.0, upper=1.0)",
-            "expected_result": "{'value': 0.6666666666666667, 'abserr': 7.401486830834377e-15}",
+            "expected_result": "{'value': 0.6666666666666666, 'abserr': 7.401486830834377e-15}",
             "description": "Definite integral of x^2 symmetric around the origin.",
         },
     ],
@@ -113,6 +136,18 @@ USAGE_EXAMPLES: Dict[str, List[Dict[str, str]]] = {
             "description": "Probability of <=2 successes in 5 fair Bernoulli trials.",
         },
     ],
+    "distribution_batch": [
+        {
+            "call": "distribution_cdf_batch('norm', x=[0.0, 1.96])",
+            "expected_result": "[0.5, 0.9750021048517795]",
+            "description": "Standard normal CDF at several points in one call.",
+        },
+        {
+            "call": "distribution_pdf_batch('binom', x=[3, 3], shape_args=[[10, 20], 0.5])",
+            "expected_result": "[0.1171875, 0.0010871887207031228]",
+            "description": "Binomial PMF at k=3 for 10 and 20 trials; list shape args broadcast.",
+        },
+    ],
     "z3_solve_constraints": [
         {
             "call": "z3_solve_constraints(['x > 2', 'x < 5'])",
@@ -140,19 +175,51 @@ SERVER_HOST = os.getenv("MATH_MCP_HOST", "10.0.0.1")
 SERVER_PORT = int(os.getenv("MATH_MCP_PORT", "2000"))
 SERVER_PATH = os.getenv("MATH_MCP_PATH", "/math")
 
+
+class _LazyNamespace(dict):
+    """Names resolved from source modules on first lookup and memoized.
+
+    Only names in each source's precomputed name set resolve, in source order, so nothing
+    is copied (and no lazily loaded NumPy submodule is imported) until an expression
+    actually uses it. Exposed read-only through MappingProxyType.
+    """
+
+    def __init__(self, *sources: tuple[object, frozenset]):
+        super().__init__()
+        self._sources = sources
+
+    def __missing__(self, name: str) -> object:
+        for module, names in self._sources:
+            if name in names:
+                value = getattr(module, name)
+                self[name] = value
+                return value
+        raise KeyError(name)
+
+
+def _public_names(module: object) -> frozenset:
+    return frozenset(name for name in dir(module) if not name.startswith("_"))
+
+
+_BUILTIN_NAMES = frozenset(dir(builtins))
+_NUMPY_NAMES = _public_names(np)
+
+# Expression globals: bare NumPy names (sin, exp, ...) shadow Python builtins, as eval
+# falls back to the read-only lazy namespace installed as __builtins__.
 _SAFE_GLOBALS: Dict[str, object] = {
     "np": np,
     "pi": np.pi,
     "e": np.e,
+    "__builtins__": MappingProxyType(_LazyNamespace((np, _NUMPY_NAMES), (builtins, _BUILTIN_NAMES))),
 }
 
-for _name in dir(np):
-    if not _name.startswith("_"):
-        _SAFE_GLOBALS.setdefault(_name, getattr(np, _name))
-
 
 def _load_z3_module():
     """Load the external z3-solver package without being shadowed by ./z3."""
+    z3_module = sys.modules.get("z3")
+    if hasattr(z3_module, "Solver"):
+        return z3_module
+
     script_dir = Path(__file__).resolve().parent
     removed_paths: list[str] = []
 
@@ -178,70 +245,524 @@ def _load_z3_module():
     return z3_module
 
 
+def _load_unsat_core_module():
+    """Load the shared unsat-core helper (z3/unsat_core.py) on top of the z3-solver package."""
+    module = sys.modules.get("unsat_core")
+    if hasattr(module, "explain_unsat"):
+        return module
+    path = Path(__file__).resolve().parent / "z3" / "unsat_core.py"
+    spec = importlib.util.spec_from_file_location("unsat_core", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules["unsat_core"] = module
+    return module
+
+
 _z3 = _load_z3_module()
-_Z3_GLOBALS: Dict[str, object] = {
-    name: getattr(_z3, name)
-    for name in dir(_z3)
-    if not name.startswith("_")
-}
-_Z3_RESERVED_NAMES = set(_Z3_GLOBALS) | {"And", "Or", "Not", "If", "True", "False"}
+_unsat_core = _load_unsat_core_module()
+_Z3_NAMES = _public_names(_z3)
+_Z3_RESERVED_NAMES = _Z3_NAMES | {"And", "Or", "Not", "If", "True", "False"}
+# Read-only z3 namespace shared by every constraint evaluation and theorem proof
+_Z3_NAMESPACE = MappingProxyType(_LazyNamespace((_z3, _Z3_NAMES)))
 
 solver_context: Dict[str, object] = {
     "solver": None,
     "variables": {},
     "constraints": [],
+    "terms": [],
 }
 
+DEFAULT_CORE_BUDGET_MS = _unsat_core.DEFAULT_CORE_BUDGET_MS
+
 
 def reset_solver_context() -> Dict[str, object]:
     """Reset the persistent Z3 solver context."""
     solver_context["solver"] = _z3.Solver()
     solver_context["variables"] = {}
     solver_context["constraints"] = []
+    solver_context["terms"] = []
     return solver_context
 
 
 reset_solver_context()
 
 
+DERIVATIVE_METHODS = ("central", "complex", "richardson")
+
+# Step ratio and number of step sizes combined by Richardson extrapolation
+_RICHARDSON_RATIO = 2.0
+_RICHARDSON_LEVELS = 3
+
+
+@lru_cache(maxsize=None)
+def _central_stencil(n: int, order: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """Return (offsets, weights, accuracy) of the central stencil for the n-th derivative.
+
+    `order` is the number of stencil points; it is widened to the smallest odd count that
+    can represent the derivative. Weights are solved exactly with fractions and points with
+    a zero weight are dropped, so each stencil costs as few evaluations as possible.
+    """
+    points = max(order, n + 1 + (n % 2))
+    half = points // 2
+    offsets = list(range(-half, half + 1))
+
+    # Solve sum_j w_j * s_j**k = n! * [k == n] for k = 0..points-1 (Gauss-Jordan, exact)
+    rows = [[Fraction(s) ** k for s in offsets] + [Fraction(factorial(n) if k == n else 0)]
+            for k in range(points)]
+    for col in range(points):
+        pivot = next(r for r in range(col, points) if rows[r][col] != 0)
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        pivot_value = rows[col][col]
+        rows[col] = [value / pivot_value for value in rows[col]]
+        for r in range(points):
+            if r != col and rows[r][col] != 0:
+                factor = rows[r][col]
+                rows[r] = [value - factor * pivot_entry for value, pivot_entry in zip(rows[r], rows[col])]
+    weights = [rows[j][-1] for j in range(points)]
+
+    kept = [(s, w) for s, w in zip(offsets, weights) if w != 0]
+    # Symmetric stencils cancel every other error term, so accuracy is even
+    accuracy = points - n + ((points - n) % 2)
+    return (
+        np.array([s for s, _ in kept], dtype=float),
+        np.array([float(w) for _, w in kept]),
+        accuracy,
+    )
+
+
+def _default_step(x0: float, n: int, accuracy: int) -> float:
+    """Step balancing truncation error (h**accuracy) against rounding error (eps * max(1, |x0|) / h**n).
+
+    Rounding grows with the float spacing around x0, so the step grows only like
+    |x0| ** (1 / (n + accuracy)): scaling it by |x0| itself loses accuracy at large x0
+    for functions that vary on a unit scale (exp, sin).
+    """
+    return float((np.finfo(float).eps * max(1.0, abs(x0))) ** (1.0 / (n + accuracy)))
+
+
 def numerical_derivative(
     func: Callable[[float], float],
     x0: float,
-    dx: float = 1e-6,
+    dx: Optional[float] = None,
     n: int = 1,
     order: int = 5,
+    method: str = "central",
 ) -> float:
-    """Numerically approximate the n-th derivative using recursive central differences."""
+    """Numerically approximate the n-th derivative of func at x0.
+
+    method="central" applies a cached `order`-point central finite-difference stencil,
+    evaluating all stencil points in one call. "richardson" applies the same stencil at
+    three step sizes and extrapolates. "complex" uses the complex step Im(f(x0 + ih)) / h,
+    exact to rounding for n=1 when the expression is analytic (np.abs, comparisons and the
+    like are not). dx=None picks a step suited to n and the stencil accuracy.
+    """
     if n < 1:
         raise ValueError("n must be a positive integer.")
     if order % 2 == 0:
         raise ValueError("order must be an odd integer for numerical differentiation.")
-    if dx <= 0:
+    if dx is not None and dx <= 0:
         raise ValueError("dx must be positive.")
-
-    if n == 1:
-        return float((func(x0 + dx) - func(x0 - dx)) / (2.0 * dx))
-
-    def lower(value: float) -> float:
-        return numerical_derivative(func, value, dx=dx, n=n - 1, order=order)
-
-    return float((lower(x0 + dx) - lower(x0 - dx)) / (2.0 * dx))
-
-
-def _build_callable(expression: str, variable: str) -> Callable[[float], float]:
-    """Compile expression into a callable f(x) with a restricted namespace."""
+    if method not in DERIVATIVE_METHODS:
+        raise ValueError(f"method must be one of {', '.join(DERIVATIVE_METHODS)}.")
+
+    if method == "complex":
+        if n != 1:
+            raise ValueError("The complex-step method only supports first derivatives (n=1).")
+        step = dx if dx is not None else 1e-20
+        value = func(np.array([complex(x0, step)]))
+        return float(np.imag(value[0]) / step)
+
+    offsets, weights, accuracy = _central_stencil(n, order)
+    if method == "central":
+        step = dx if dx is not None else _default_step(x0, n, accuracy)
+        values = np.asarray(func(x0 + offsets * step), dtype=float)
+        return float(values @ weights / step ** n)
+
+    # Richardson: one call for the stencils at h, h/r, h/r^2, then eliminate the leading
+    # error terms h**accuracy, h**(accuracy + 2), ...
+    # The default makes the finest step the balanced one for the extrapolated accuracy
+    extrapolated_accuracy = accuracy + 2 * (_RICHARDSON_LEVELS - 1)
+    if dx is not None:
+        step = dx
+    else:
+        step = _default_step(x0, n, extrapolated_accuracy) * _RICHARDSON_RATIO ** (_RICHARDSON_LEVELS - 1)
+    steps = step / _RICHARDSON_RATIO ** np.arange(_RICHARDSON_LEVELS)
+    points = x0 + offsets[None, :] * steps[:, None]
+    values = np.asarray(func(points.ravel()), dtype=float).reshape(points.shape)
+    estimates = list(values @ weights / steps ** n)
+    power = accuracy
+    while len(estimates) > 1:
+        factor = _RICHARDSON_RATIO ** power
+        estimates = [(factor * fine - coarse) / (factor - 1.0)
+                     for coarse, fine in zip(estimates, estimates[1:])]
+        power += 2
+    return float(estimates[0])
+
+
+# Non-integer sample points used to check that an expression evaluates element-wise
+_ARRAY_PROBE_POINTS = np.array([0.5772156649, 1.6180339887, 2.7182818284])
+
+
+def _build_callable(
+    expression: str, variable: str, constants: Optional[Dict[str, float]] = None
+) -> Callable[[float], float]:
+    """Compile expression into a callable f(x) with a restricted namespace.
+
+    The callable accepts a float (returning a float) or a NumPy array (returning an array of
+    the same shape). Array input is evaluated in a single `eval` when the expression is
+    array-safe, i.e. gives element-wise results matching scalar evaluation on probe points
+    (`func.array_safe`); otherwise the points are evaluated one at a time. `constants` binds
+    further names (e.g. a parameter value) alongside the variable.
+    """
     try:
         compiled = compile(expression, "<expression>", "eval")
     except SyntaxError as exc:
         raise ValueError(f"Invalid expression: {expression}") from exc
+    return _bind_callable(compiled, variable, constants)
+
+
+def _bind_callable(
+    compiled: CodeType,
+    variable: str,
+    constants: Optional[Dict[str, float]] = None,
+    array_safe: Optional[bool] = None,
+) -> Callable[[float], float]:
+    """Callable for compiled expression code with `constants` bound (see _build_callable).
 
-    def func(value: float) -> float:
-        local_env = {variable: value}
+    array_safe=None probes the expression; passing the flag of another callable for the
+    same code skips the probe when only constant values change.
+    """
+    constants = dict(constants or {})
+
+    def scalar(value: float) -> float:
+        local_env = {**constants, variable: value}
         return float(eval(compiled, _SAFE_GLOBALS, local_env))
 
+    def vectorized(values: np.ndarray) -> np.ndarray:
+        with np.errstate(all="ignore"):
+            result = np.asarray(eval(compiled, _SAFE_GLOBALS, {**constants, variable: values}), dtype=float)
+        # Expressions without the variable evaluate to a constant
+        return np.broadcast_to(result, values.shape)
+
+    def func(value):
+        if np.ndim(value) == 0:
+            return scalar(value)
+        if np.iscomplexobj(value):
+            # Complex-step differentiation: evaluate with complex arithmetic throughout
+            values = np.asarray(value, dtype=complex)
+            with np.errstate(all="ignore"):
+                result = np.asarray(eval(compiled, _SAFE_GLOBALS, {**constants, variable: values}), dtype=complex)
+            return np.broadcast_to(result, values.shape)
+        values = np.asarray(value, dtype=float)
+        if func.array_safe:
+            return vectorized(values)
+        return np.array([scalar(point) for point in values.ravel()]).reshape(values.shape)
+
+    func.compiled = compiled
+    if array_safe is not None:
+        func.array_safe = array_safe
+        return func
+    try:
+        expected = np.array([scalar(float(point)) for point in _ARRAY_PROBE_POINTS])
+        func.array_safe = bool(np.allclose(
+            vectorized(_ARRAY_PROBE_POINTS), expected, rtol=1e-12, atol=0.0, equal_nan=True
+        ))
+    except Exception:
+        func.array_safe = False
     return func
 
 
+# QUADPACK 21-point Gauss-Kronrod rule (the rule `quad` applies on finite intervals):
+# non-negative Kronrod nodes, their weights, and the weights of the embedded 10-point
+# Gauss-Legendre rule, whose nodes are every other Kronrod node.
+_GK21_HALF_NODES = np.array([
+    0.995657163025808080735527280689003, 0.973906528517171720077964012084452,
+    0.930157491355708226001207180059508, 0.865063366688984510732096688423493,
+    0.780817726586416897063717578345042, 0.679409568299024406234327365114874,
+    0.562757134668604683339000099272694, 0.433395394129247190799265943165784,
+    0.294392862701460198131126603103866, 0.148874338981631210884826001129720,
+    0.0,
+])
+_GK21_HALF_KRONROD_WEIGHTS = np.array([
+    0.011694638867371874278064396062192, 0.032558162307964727478818972459390,
+    0.054755896574351996031381300244580, 0.075039674810919952767043140916190,
+    0.093125454583697605535065465083366, 0.109387158802297641899210590325805,
+    0.123491976262065851077958109831074, 0.134709217311473325928054001771707,
+    0.142775938577060080797094273138717, 0.147739104901338491374841515972068,
+    0.149445554002916905664936468389821,
+])
+_GK21_HALF_GAUSS_WEIGHTS = np.array([
+    0.0, 0.066671344308688137593568809893332,
+    0.0, 0.149451349150580593145776339657697,
+    0.0, 0.219086362515982043995534934228163,
+    0.0, 0.269266719309996355091226921569469,
+    0.0, 0.295524224714752870173892994651338,
+    0.0,
+])
+_GK21_NODES = np.concatenate([-_GK21_HALF_NODES[:-1], _GK21_HALF_NODES[::-1]])
+_GK21_KRONROD_WEIGHTS = np.concatenate([_GK21_HALF_KRONROD_WEIGHTS[:-1], _GK21_HALF_KRONROD_WEIGHTS[::-1]])
+_EPMACH = np.finfo(float).eps
+_UFLOW = np.finfo(float).tiny
+# QUADPACK's qk21 adds the center, then the Gauss node pairs, then the remaining Kronrod
+# pairs; summing in that order reproduces quad's result on a single interval.
+_GK21_SUM_ORDER = (1, 3, 5, 7, 9, 0, 2, 4, 6, 8)
+
+
+def _gauss_kronrod_sums(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Kronrod and Gauss sums per row of 21 samples, accumulated in QUADPACK order."""
+    kronrod = _GK21_HALF_KRONROD_WEIGHTS[10] * values[:, 10]
+    gauss = np.zeros(len(values))
+    for node in _GK21_SUM_ORDER:
+        pair = values[:, node] + values[:, 20 - node]
+        gauss = gauss + _GK21_HALF_GAUSS_WEIGHTS[node] * pair
+        kronrod = kronrod + _GK21_HALF_KRONROD_WEIGHTS[node] * pair
+    return kronrod, gauss
+
+
+def _gauss_kronrod_integrate(
+    func: Callable[[float], float],
+    lower: float,
+    upper: float,
+    epsabs: float = 1.49e-8,
+    epsrel: float = 1.49e-8,
+    limit: int = 50,
+) -> tuple[float, float] | None:
+    """Adaptive Gauss-Kronrod (G10/K21) quadrature over an array-safe callable.
+
+    Uses QUADPACK's rule and error estimate, but each round evaluates the nodes of every
+    unfinished interval in a single call and bisects all intervals whose error exceeds their
+    share of the tolerance. Returns None when the bounds are infinite, a sample is not
+    finite, or more than `limit` intervals would be needed, so the caller can fall back to
+    `scipy.integrate.quad`.
+    """
+    if not (np.isfinite(lower) and np.isfinite(upper)):
+        return None
+    if lower == upper:
+        return 0.0, 0.0
+
+    starts = np.array([lower], dtype=float)
+    ends = np.array([upper], dtype=float)
+    done_value = 0.0
+    done_error = 0.0
+    intervals = 1
+    while True:
+        centers = (starts + ends) / 2.0
+        half_widths = (ends - starts) / 2.0
+        points = centers[:, None] + half_widths[:, None] * _GK21_NODES
+        values = np.asarray(func(points.ravel()), dtype=float).reshape(points.shape)
+        if not np.all(np.isfinite(values)):
+            return None
+
+        kronrod, gauss = _gauss_kronrod_sums(values)
+        scale = np.abs(half_widths)
+        resabs = (np.abs(values) @ _GK21_KRONROD_WEIGHTS) * scale
+        resasc = (np.abs(values - kronrod[:, None] / 2.0) @ _GK21_KRONROD_WEIGHTS) * scale
+        estimates = kronrod * half_widths
+        errors = np.abs((kronrod - gauss) * half_widths)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scaled = resasc * np.minimum(1.0, (200.0 * errors / resasc) ** 1.5)
+        errors = np.where((resasc != 0) & (errors != 0), scaled, errors)
+        errors = np.where(resabs > _UFLOW / (50 * _EPMACH), np.maximum(_EPMACH * 50 * resabs, errors), errors)
+
+        total = done_value + float(estimates.sum())
+        total_error = done_error + float(errors.sum())
+        tolerance = max(epsabs, epsrel * abs(total))
+        if total_error <= tolerance:
+            return total, total_error
+
+        # Keep intervals whose error fits their share of the tolerance, bisect the rest
+        accepted = errors <= tolerance * scale * 2.0 / abs(upper - lower)
+        done_value += float(estimates[accepted].sum())
+        done_error += float(errors[accepted].sum())
+        starts, ends, centers = starts[~accepted], ends[~accepted], centers[~accepted]
+        intervals += starts.size
+        if intervals > limit:
+            return None
+        starts, ends = np.concatenate([starts, centers]), np.concatenate([centers, ends])
+
+
+EXPRESSION_CACHE_SIZE = int(os.getenv("MATH_MCP_EXPRESSION_CACHE_SIZE", "256"))
+DISTRIBUTION_CACHE_SIZE = int(os.getenv("MATH_MCP_DISTRIBUTION_CACHE_SIZE", "128"))
+
+# Entries keyed by (expression, variable): compiled callable plus lazily built symbolic data
+_expression_cache: "OrderedDict[tuple[str, str], Dict[str, object]]" = OrderedDict()
+_expression_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+_expression_cache_lock = threading.Lock()
+
+# SymPy is optional; it is imported on first symbolic use because it is slow to import
+SYMPY_AVAILABLE = importlib.util.find_spec("sympy") is not None
+
+_SYMBOLIC_FUNCTIONS = {
+    "sin": "sin", "cos": "cos", "tan": "tan",
+    "arcsin": "asin", "arccos": "acos", "arctan": "atan",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh",
+    "arcsinh": "asinh", "arccosh": "acosh", "arctanh": "atanh",
+    "exp": "exp", "log": "log", "sqrt": "sqrt", "abs": "Abs", "absolute": "Abs",
+}
+_SYMBOLIC_CONSTANTS = {"pi": "pi", "e": "E"}
+_SYMBOLIC_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.Pow: operator.pow,
+}
+
+
+def _expression_entry(expression: str, variable: str) -> Dict[str, object]:
+    """Return the cache entry for (expression, variable), compiling it on a miss."""
+    key = (expression, variable)
+    with _expression_cache_lock:
+        entry = _expression_cache.get(key)
+        if entry is not None:
+            _expression_cache.move_to_end(key)
+            _expression_cache_stats["hits"] += 1
+            return entry
+        _expression_cache_stats["misses"] += 1
+
+    entry = {
+        "func": _build_callable(expression, variable),
+        "symbolic": None,
+        "symbolic_checked": False,
+        "derivatives": {},
+        "antiderivative": None,
+    }
+    with _expression_cache_lock:
+        _expression_cache[key] = entry
+        while len(_expression_cache) > EXPRESSION_CACHE_SIZE:
+            _expression_cache.popitem(last=False)
+            _expression_cache_stats["evictions"] += 1
+    return entry
+
+
+def _cached_callable(expression: str, variable: str) -> Callable[[float], float]:
+    return _expression_entry(expression, variable)["func"]
+
+
+def _to_sympy(node: ast.AST, variable: str, symbol, sympy):
+    """Translate a whitelisted expression AST (arithmetic, NumPy math functions) to SymPy."""
+    if isinstance(node, ast.Expression):
+        return _to_sympy(node.body, variable, symbol, sympy)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return sympy.Integer(node.value) if isinstance(node.value, int) else sympy.Float(node.value)
+    if isinstance(node, ast.Name):
+        if node.id == variable:
+            return symbol
+        if node.id in _SYMBOLIC_CONSTANTS:
+            return getattr(sympy, _SYMBOLIC_CONSTANTS[node.id])
+    if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+            and node.value.id == "np" and node.attr in _SYMBOLIC_CONSTANTS):
+        return getattr(sympy, _SYMBOLIC_CONSTANTS[node.attr])
+    if isinstance(node, ast.BinOp) and type(node.op) in _SYMBOLIC_OPERATORS:
+        return _SYMBOLIC_OPERATORS[type(node.op)](
+            _to_sympy(node.left, variable, symbol, sympy),
+            _to_sympy(node.right, variable, symbol, sympy),
+        )
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _to_sympy(node.operand, variable, symbol, sympy)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.Call) and len(node.args) == 1 and not node.keywords:
+        target = node.func
+        name = None
+        if isinstance(target, ast.Name):
+            name = target.id
+        elif isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "np":
+            name = target.attr
+        if name in _SYMBOLIC_FUNCTIONS:
+            return getattr(sympy, _SYMBOLIC_FUNCTIONS[name])(_to_sympy(node.args[0], variable, symbol, sympy))
+    raise ValueError(f"No symbolic form for {ast.dump(node)}")
+
+
+def _symbolic_form(expression: str, variable: str, entry: Dict[str, object]):
+    """Return (sympy, symbol, expr) for a cached expression, or None if it has no symbolic form."""
+    if not entry["symbolic_checked"]:
+        symbolic = None
+        if SYMPY_AVAILABLE:
+            import sympy
+
+            symbol = sympy.Symbol(variable, real=True)
+            try:
+                tree = ast.parse(expression, mode="eval")
+                symbolic = (sympy, symbol, _to_sympy(tree, variable, symbol, sympy))
+            except (ValueError, TypeError, SyntaxError, RecursionError):
+                symbolic = None
+        entry["symbolic"] = symbolic
+        entry["symbolic_checked"] = True
+    return entry["symbolic"]
+
+
+def _symbolic_derivative(expression: str, variable: str, n: int) -> Callable[[float], float] | None:
+    """Exact n-th derivative as a NumPy callable, cached per expression and n."""
+    entry = _expression_entry(expression, variable)
+    derivatives = entry["derivatives"]
+    if n not in derivatives:
+        symbolic = _symbolic_form(expression, variable, entry)
+        derivative = None
+        if symbolic is not None:
+            sympy, symbol, expr = symbolic
+            derivative = sympy.lambdify(symbol, sympy.diff(expr, symbol, n), modules=["numpy", "scipy"])
+        derivatives[n] = derivative
+    return derivatives[n]
+
+
+def _continuous_intervals(sympy, symbol, expr) -> list[tuple[float, float, bool, bool]] | None:
+    """Real intervals (start, end, left_open, right_open) on which expr is continuous.
+
+    Returns None when the domain is not a finite union of intervals (e.g. periodic poles).
+    """
+    from sympy.calculus.util import continuous_domain
+
+    domain = continuous_domain(expr, symbol, sympy.S.Reals)
+    pieces = domain.args if isinstance(domain, sympy.Union) else (domain,)
+    if not all(piece.is_Interval for piece in pieces):
+        return None
+    return [
+        (float(piece.start), float(piece.end), bool(piece.left_open), bool(piece.right_open))
+        for piece in pieces
+    ]
+
+
+def _symbolic_integral(expression: str, variable: str, lower: float, upper: float) -> tuple[float, float] | None:
+    """Integrate through a cached exact antiderivative when the integrand is continuous on the bounds."""
+    if not (np.isfinite(lower) and np.isfinite(upper)):
+        return None
+    entry = _expression_entry(expression, variable)
+    symbolic = _symbolic_form(expression, variable, entry)
+    if symbolic is None:
+        return None
+
+    if entry["antiderivative"] is None:
+        sympy, symbol, expr = symbolic
+        intervals = _continuous_intervals(sympy, symbol, expr)
+        antiderivative = None
+        if intervals is not None:
+            # Rule-based integration only: the full sympy.integrate can take seconds
+            from sympy.integrals.manualintegrate import manualintegrate
+
+            antiderivative = manualintegrate(expr, symbol)
+        if antiderivative is None or antiderivative.has(sympy.Integral):
+            entry["antiderivative"] = False
+        else:
+            entry["antiderivative"] = (
+                sympy.lambdify(symbol, antiderivative, modules=["numpy", "scipy"]),
+                intervals,
+            )
+    if entry["antiderivative"] is False:
+        return None
+
+    antiderivative, intervals = entry["antiderivative"]
+    low, high = min(lower, upper), max(lower, upper)
+    if not any(
+        (start < low or (start == low and not left_open)) and (high < end or (high == end and not right_open))
+        for start, end, left_open, right_open in intervals
+    ):
+        return None
+    with np.errstate(all="ignore"):
+        upper_value = float(np.real(antiderivative(upper)))
+        lower_value = float(np.real(antiderivative(lower)))
+    if not (np.isfinite(upper_value) and np.isfinite(lower_value)):
+        return None
+    rounding = _EPMACH * max(abs(upper_value), abs(lower_value), 1.0)
+    return upper_value - lower_value, rounding
+
+
 def _normalize_equation_expression(expression: str) -> str:
     """Normalize `lhs = rhs` into `lhs - (rhs)` so the numeric solver can find a root."""
     normalized = expression.strip()
@@ -262,51 +783,101 @@ def _get_distribution(name: str):
     return dist
 
 
+def _is_array_like(value) -> bool:
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+def _any_differs(value, default: float) -> bool:
+    if _is_array_like(value):
+        return bool(np.any(np.asarray(value, dtype=float) != default))
+    return value != default
+
+
 def _distribution_args_kwargs(
     dist,
     shape_args: Optional[Sequence[float]],
-    loc: float,
-    scale: float,
+    loc: float | Sequence[float],
+    scale: float | Sequence[float],
     extra_params: Optional[Dict[str, float]] = None,
 ):
     args = tuple(shape_args or [])
     kwargs: Dict[str, float] = dict(extra_params or {})
-    if loc != 0.0:
+    if _any_differs(loc, 0.0):
         kwargs.setdefault("loc", loc)
-    if scale != 1.0 and hasattr(dist, "pdf"):
+    if _any_differs(scale, 1.0) and hasattr(dist, "pdf"):
         kwargs.setdefault("scale", scale)
     return args, kwargs
 
 
-def _pmf_or_pdf(dist, x: float, args: Sequence[float], kwargs: Dict[str, float]) -> float:
-    if hasattr(dist, "pdf"):
-        return float(dist.pdf(x, *args, **kwargs))
-    if hasattr(dist, "pmf"):
-        return float(dist.pmf(x, *args, **kwargs))
-    raise ValueError("Distribution does not provide pdf/pmf evaluation.")
+@lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def _frozen_distribution(name: str, args: tuple, kwargs: tuple):
+    """Frozen SciPy distribution for (name, shape args, sorted keyword items)."""
+    return _get_distribution(name)(*args, **dict(kwargs))
+
+
+def _evaluate_distribution(
+    distribution: str,
+    method: str,
+    values,
+    shape_args: Optional[Sequence[float | Sequence[float]]],
+    loc: float | Sequence[float],
+    scale: float | Sequence[float],
+    extra_params: Optional[Dict[str, float]] = None,
+):
+    """Call a distribution method on scalar or array values in one vectorized SciPy call.
+
+    Scalar parameters go through a cache of frozen distributions; array-valued shape args,
+    loc or scale are broadcast against the values by the unfrozen distribution instead.
+    `method` may be "density" for pdf (continuous) or pmf (discrete).
+    """
+    dist = _get_distribution(distribution)
+    if method == "density":
+        if hasattr(dist, "pdf"):
+            method = "pdf"
+        elif hasattr(dist, "pmf"):
+            method = "pmf"
+        else:
+            raise ValueError("Distribution does not provide pdf/pmf evaluation.")
+    args, kwargs = _distribution_args_kwargs(dist, shape_args, loc, scale, extra_params)
+    parameters = list(args) + list(kwargs.values())
+    if not any(_is_array_like(parameter) for parameter in parameters):
+        frozen = _frozen_distribution(
+            distribution,
+            tuple(float(arg) for arg in args),
+            tuple(sorted((key, float(value)) for key, value in kwargs.items())),
+        )
+        return getattr(frozen, method)(values)
+    return getattr(dist, method)(values, *args, **kwargs)
+
+
+def _batch_result(values) -> List[float]:
+    return np.asarray(values, dtype=float).ravel().tolist()
 
 
 def _try_bracket(func: Callable[[float], float], start: float, end: float) -> tuple[float, float] | None:
-    """Return a sign-changing bracket if one exists in [start, end]."""
+    """Return a sign-changing bracket if one exists in [start, end].
+
+    All sample points are evaluated in one call; the first zero or sign change in scan order
+    wins. Non-finite samples (poles, domain errors) never form a bracket.
+    """
     if start == end:
         end = start + 1.0
 
     a, b = (start, end) if start < end else (end, start)
     sample_points = np.linspace(a, b, 25)
-    previous_x = float(sample_points[0])
-    previous_y = float(func(previous_x))
-    if abs(previous_y) < 1e-12:
-        return previous_x - 1e-6, previous_x + 1e-6
-
-    for point in sample_points[1:]:
-        current_x = float(point)
-        current_y = float(func(current_x))
-        if abs(current_y) < 1e-12:
-            return current_x - 1e-6, current_x + 1e-6
-        if previous_y * current_y < 0:
-            return previous_x, current_x
-        previous_x = current_x
-        previous_y = current_y
+    values = np.asarray(func(sample_points), dtype=float)
+    finite = np.isfinite(values)
+
+    zeros = np.flatnonzero(finite & (np.abs(values) < 1e-12))
+    changes = np.flatnonzero(finite[:-1] & finite[1:] & (values[:-1] * values[1:] < 0)) + 1
+    first_zero = int(zeros[0]) if zeros.size else None
+    first_change = int(changes[0]) if changes.size else None
+
+    if first_zero is not None and (first_change is None or first_zero <= first_change):
+        root = float(sample_points[first_zero])
+        return root - 1e-6, root + 1e-6
+    if first_change is not None:
+        return float(sample_points[first_change - 1]), float(sample_points[first_change])
     return None
 
 
@@ -332,6 +903,74 @@ def _find_bracket(func: Callable[[float], float], bracket_start: float, bracket_
     return None
 
 
+ROOT_SCAN_SAMPLES = 1000
+
+
+@lru_cache(maxsize=None)
+def _elementwise_root_finder():
+    """Return scipy.optimize.elementwise (SciPy >= 1.15) if available, else None."""
+    try:
+        from scipy.optimize import elementwise
+    except ImportError:
+        return None
+    return elementwise
+
+
+def _refine_brackets(func: Callable[[float], float], lows: np.ndarray, highs: np.ndarray) -> np.ndarray:
+    """Refine every sign-changing bracket; failed brackets give NaN.
+
+    All brackets are solved together with SciPy's vectorized bracketing root finder when it is
+    available, otherwise one brentq call per bracket.
+    """
+    elementwise = _elementwise_root_finder()
+    if elementwise is not None:
+        with np.errstate(all="ignore"):
+            result = elementwise.find_root(func, (lows, highs))
+        return np.where(result.success, result.x, np.nan)
+
+    roots = np.full(lows.shape, np.nan)
+    for index, (low, high) in enumerate(zip(lows, highs)):
+        try:
+            roots[index] = optimize.brentq(func, low, high)
+        except (ValueError, RuntimeError):
+            pass
+    return roots
+
+
+def _find_all_roots(
+    func: Callable[[float], float], start: float, end: float, samples: int = ROOT_SCAN_SAMPLES
+) -> List[float]:
+    """Return every root found in [start, end], in increasing order.
+
+    The range is sampled in one vectorized call; exact zeros are kept and each sign change
+    between neighbouring finite samples is refined. A refined point whose residual exceeds
+    both bracket ends is a pole (e.g. tan at pi/2) and is dropped. Roots where the function
+    only touches zero between samples (no sign change) are not detected.
+    """
+    if samples < 2:
+        raise ValueError("samples must be at least 2.")
+    if start == end:
+        end = start + 1.0
+    a, b = (start, end) if start < end else (end, start)
+
+    points = np.linspace(a, b, samples)
+    values = np.asarray(func(points), dtype=float)
+    finite = np.isfinite(values)
+    zeros = finite & (values == 0.0)
+    changes = np.flatnonzero(
+        finite[:-1] & finite[1:] & ~zeros[:-1] & ~zeros[1:] & (values[:-1] * values[1:] < 0)
+    )
+
+    roots = points[zeros]
+    if changes.size:
+        refined = _refine_brackets(func, points[changes], points[changes + 1])
+        with np.errstate(all="ignore"):
+            residuals = np.abs(np.asarray(func(np.nan_to_num(refined)), dtype=float))
+        bound = np.minimum(np.abs(values[changes]), np.abs(values[changes + 1]))
+        roots = np.concatenate([roots, refined[np.isfinite(refined) & (residuals <= bound)]])
+    return [float(root) for root in np.unique(roots)]
+
+
 def _extract_symbol_names(expression: str) -> list[str]:
     names = set(re.findall(r"\b[a-zA-Z_][a-zA-Z0-9_]*\b", expression))
     return sorted(name for name in names if name not in _Z3_RESERVED_NAMES)
@@ -341,11 +980,9 @@ def _coerce_model_value(value: object) -> str:
     return str(value)
 
 
-def _build_z3_eval_env(variables: Dict[str, object] | None = None) -> Dict[str, object]:
-    env = dict(_Z3_GLOBALS)
-    if variables:
-        env.update(variables)
-    return env
+def _build_z3_eval_env(variables: Dict[str, object] | None = None) -> Mapping[str, object]:
+    """Locals for evaluating a constraint: the variables layered over the z3 namespace."""
+    return ChainMap(variables if variables is not None else {}, _Z3_NAMESPACE)
 
 
 def _ensure_context_variables(expressions: Sequence[str]) -> Dict[str, object]:
@@ -401,7 +1038,7 @@ def solve_equation(
     5.0
     """
     normalized_expression = _normalize_equation_expression(expression)
-    func = _build_callable(normalized_expression, variable)
+    func = _cached_callable(normalized_expression, variable)
 
     bracket = _find_bracket(func, bracket_start, bracket_end)
     if bracket is not None:
@@ -418,6 +1055,72 @@ def solve_equation(
     return float(result.root)
 
 
+@mcp.tool
+def solve_equation_all(
+    expression: str,
+    range_start: float = -10.0,
+    range_end: float = 10.0,
+    variable: str = "x",
+    samples: int = ROOT_SCAN_SAMPLES,
+) -> List[float]:
+    """Return every root in [range_start, range_end] found by a vectorized sign-change scan.
+
+    The range is sampled at `samples` points and each bracket is refined; raise `samples`
+    for closely spaced roots. Accepts the same expression forms as solve_equation.
+    >>> solve_equation_all('np.sin(x)', range_start=-4.0, range_end=4.0)
+    [-3.141592653589793, 0.0, 3.141592653589793]
+    """
+    func = _cached_callable(_normalize_equation_expression(expression), variable)
+    return _find_all_roots(func, range_start, range_end, samples)
+
+
+@mcp.tool
+def solve_equation_batch(
+    expressions: List[str],
+    range_start: float = -10.0,
+    range_end: float = 10.0,
+    variable: str = "x",
+    parameter: Optional[str] = None,
+    parameter_values: Optional[List[float]] = None,
+    samples: int = ROOT_SCAN_SAMPLES,
+) -> List[Dict[str, object]]:
+    """Find all roots of many expressions, or of one family over many parameter values.
+
+    With `parameter` and `parameter_values`, each expression is solved once per value with
+    the parameter bound to it. Results are in input order (expression-major).
+    >>> solve_equation_batch(['x**2 - a'], range_start=0.0, parameter='a', parameter_values=[4.0, 16.0])
+    [{'expression': 'x**2 - a', 'parameter_value': 4.0, 'roots': [2.0]}, {'expression': 'x**2 - a', 'parameter_value': 16.0, 'roots': [4.0]}]
+    """
+    if not expressions:
+        raise ValueError("expressions must not be empty.")
+    if (parameter is None) != (parameter_values is None):
+        raise ValueError("parameter and parameter_values must be given together.")
+    if parameter == variable:
+        raise ValueError("parameter must differ from the solve variable.")
+
+    results: List[Dict[str, object]] = []
+    for expression in expressions:
+        normalized = _normalize_equation_expression(expression)
+        if parameter is None:
+            func = _cached_callable(normalized, variable)
+            results.append({"expression": expression, "roots": _find_all_roots(func, range_start, range_end, samples)})
+            continue
+        func = None
+        for value in parameter_values:
+            # Compile and probe the expression once; later values only rebind the parameter
+            constants = {parameter: float(value)}
+            if func is None:
+                func = _build_callable(normalized, variable, constants)
+            else:
+                func = _bind_callable(func.compiled, variable, constants, func.array_safe)
+            results.append({
+                "expression": expression,
+                "parameter_value": float(value),
+                "roots": _find_all_roots(func, range_start, range_end, samples),
+            })
+    return results
+
+
 @mcp.tool
 def z3_solve_constraints(constraints: List[str]) -> Dict[str, object]:
     """Solve one or more symbolic constraints with Z3 and return a model if satisfiable."""
@@ -444,10 +1147,14 @@ def z3_add_constraint(constraint: str) -> Dict[str, object]:
     assert solver is not None
     variables = _ensure_context_variables([constraint])
     eval_env = _build_z3_eval_env(variables)
-    solver.add(eval(constraint, {"__builtins__": {}}, eval_env))
+    term = eval(constraint, {"__builtins__": {}}, eval_env)
+    solver.add(term)
     constraints = solver_context["constraints"]
+    terms = solver_context["terms"]
     assert isinstance(constraints, list)
+    assert isinstance(terms, list)
     constraints.append(constraint)
+    terms.append(term)
     return {
         "message": "Constraint added",
         "constraint": constraint,
@@ -456,15 +1163,32 @@ def z3_add_constraint(constraint: str) -> Dict[str, object]:
 
 
 @mcp.tool
-def z3_check_satisfiability() -> Dict[str, object]:
-    """Check the persistent Z3 solver context and return its satisfiability status."""
+def z3_check_satisfiability(
+    unsat_core: bool = False,
+    minimize_core: bool = False,
+    core_budget_ms: int = DEFAULT_CORE_BUDGET_MS,
+) -> Dict[str, object]:
+    """Check the persistent Z3 solver context and return its satisfiability status.
+
+    With unsat_core=True an unsat result also lists the conflicting constraints;
+    minimize_core=True shrinks that list within core_budget_ms milliseconds.
+    """
     solver = solver_context["solver"]
     variables = solver_context["variables"]
     constraints = solver_context["constraints"]
+    terms = solver_context["terms"]
     assert solver is not None
     assert isinstance(variables, dict)
     assert isinstance(constraints, list)
-    return _check_solver_result(solver, variables, constraints)
+    assert isinstance(terms, list)
+    payload = _check_solver_result(solver, variables, constraints)
+    if payload["status"] == "unsat" and (unsat_core or minimize_core):
+        explanation = _unsat_core.explain_unsat(terms, minimize_core, core_budget_ms)
+        payload["unsat_core"] = [constraints[index] for index in explanation["core"]]
+        payload["unsat_core_indices"] = explanation["core"]
+        payload["core_minimal"] = explanation["minimal"]
+        payload["core_checks"] = explanation["checks"]
+    return payload
 
 
 @mcp.tool
@@ -503,7 +1227,7 @@ def z3_prove_theorem(premises: List[str], conclusion: str) -> Dict[str, object]:
         "Object": context["sorts"]["Object"],
         "s": context["solver"],
     }
-    exec_globals = {"__builtins__": {}, **_Z3_GLOBALS}
+    exec_globals = {"__builtins__": _Z3_NAMESPACE}
 
     for premise in premises:
         exec(premise, exec_globals, locals_dict)
@@ -530,13 +1254,20 @@ def differentiate(
     expression: str,
     point: float,
     variable: str = "x",
-    dx: float = 1e-6,
+    dx: Optional[float] = None,
     order: int = 5,
     n: int = 1,
+    method: Optional[str] = None,
+    symbolic: bool = False,
 ) -> float:
     """Evaluate the n-th derivative of the expression at the given point.
 
-    Uses central differences for numerical differentiation. Examples:
+    By default an `order`-point central finite-difference stencil is used; method="richardson"
+    adds Richardson extrapolation and method="complex" the complex-step formula (n=1 only).
+    Leave dx unset to pick the step automatically. With symbolic=True (and SymPy installed)
+    expressions built from arithmetic and NumPy math functions are differentiated exactly
+    instead, which costs SymPy time on the first call per expression and n; dx and method
+    cannot be combined with it. Examples:
     >>> differentiate('x**3 + 2*x', point=2.0)
     14.0
     >>> differentiate('np.sin(x)', point=0.0)
@@ -544,8 +1275,17 @@ def differentiate(
     """
     if order % 2 == 0:
         raise ValueError("order must be an odd integer for numerical differentiation.")
-    func = _build_callable(expression, variable)
-    return float(numerical_derivative(func, point, dx=dx, n=n, order=order))
+    if symbolic and (dx is not None or method is not None):
+        raise ValueError("dx and method apply to numerical differentiation; pass symbolic=False.")
+    if symbolic and n >= 1:
+        derivative = _symbolic_derivative(expression, variable, n)
+        if derivative is not None:
+            with np.errstate(all="ignore"):
+                value = float(np.real(derivative(point)))
+            if np.isfinite(value):
+                return value
+    func = _cached_callable(expression, variable)
+    return float(numerical_derivative(func, point, dx=dx, n=n, order=order, method=method or "central"))
 
 
 @mcp.tool
@@ -554,20 +1294,58 @@ def integrate_function(
     lower: float,
     upper: float,
     variable: str = "x",
+    symbolic: bool = False,
 ) -> Dict[str, float]:
     """Compute the definite integral of the expression between lower and upper bounds.
 
-    Uses `scipy.integrate.quad`. Examples:
+    Array-safe expressions on finite bounds use vectorized adaptive Gauss-Kronrod quadrature
+    (the rule `scipy.integrate.quad` uses), and anything else, or a non-converging case, uses
+    `scipy.integrate.quad`. With symbolic=True (and SymPy installed) a cached exact
+    antiderivative is tried first when the integrand is continuous on the bounds; finding it
+    can take seconds for a new expression. Examples:
     >>> integrate_function('np.exp(-x**2)', lower=0.0, upper=1.0)
     {'value': 0.7468241328124271, 'abserr': 8.291413475940725e-15}
     >>> integrate_function('np.sin(x)', lower=0.0, upper=np.pi)
-    {'value': 2.0, 'abserr': 2.220446049250313e-14}
+    {'value': 2.0, 'abserr': 2.2204460492503128e-14}
     """
-    func = _build_callable(expression, variable)
-    value, error = integrate.quad(func, lower, upper)
+    result = None
+    if symbolic:
+        try:
+            result = _symbolic_integral(expression, variable, lower, upper)
+        except Exception:
+            # Any SymPy failure just means no exact result; integrate numerically
+            result = None
+    func = _cached_callable(expression, variable)
+    if result is None and func.array_safe:
+        result = _gauss_kronrod_integrate(func, lower, upper)
+    if result is None:
+        result = integrate.quad(func, lower, upper)
+    value, error = result
     return {"value": float(value), "abserr": float(error)}
 
 
+@mcp.tool
+def expression_cache_stats(clear: bool = False) -> Dict[str, object]:
+    """Report (and optionally clear) the compiled expression cache.
+
+    Expressions are cached per (expression, variable) with LRU eviction, together with their
+    symbolic derivatives and antiderivative when SymPy is available.
+    """
+    with _expression_cache_lock:
+        stats_payload: Dict[str, object] = {
+            "size": len(_expression_cache),
+            "max_size": EXPRESSION_CACHE_SIZE,
+            **_expression_cache_stats,
+            "symbolic_available": SYMPY_AVAILABLE,
+            "symbolic_entries": sum(1 for entry in _expression_cache.values() if entry["symbolic"]),
+        }
+        if clear:
+            _expression_cache.clear()
+            for key in _expression_cache_stats:
+                _expression_cache_stats[key] = 0
+    return stats_payload
+
+
 @mcp.tool
 def distribution_pdf(
     distribution: str,
@@ -584,9 +1362,7 @@ def distribution_pdf(
     >>> distribution_pdf('binom', x=3, shape_args=[10, 0.5])
     0.1171875
     """
-    dist = _get_distribution(distribution)
-    args, kwargs = _distribution_args_kwargs(dist, shape_args, loc, scale, extra_params)
-    return _pmf_or_pdf(dist, x, args, kwargs)
+    return float(_evaluate_distribution(distribution, "density", x, shape_args, loc, scale, extra_params))
 
 
 @mcp.tool
@@ -604,11 +1380,8 @@ def distribution_cdf(
     >>> distribution_cdf('norm', x=1.96)
     0.9750021048517795
     """
-    dist = _get_distribution(distribution)
-    args, kwargs = _distribution_args_kwargs(dist, shape_args, loc, scale, extra_params)
-    if lower_tail:
-        return float(dist.cdf(x, *args, **kwargs))
-    return float(dist.sf(x, *args, **kwargs))
+    method = "cdf" if lower_tail else "sf"
+    return float(_evaluate_distribution(distribution, method, x, shape_args, loc, scale, extra_params))
 
 
 @mcp.tool
@@ -626,11 +1399,23 @@ def distribution_quantile(
     >>> distribution_quantile('norm', probability=0.975)
     1.959963984540054
     """
-    dist = _get_distribution(distribution)
-    args, kwargs = _distribution_args_kwargs(dist, shape_args, loc, scale, extra_params)
-    if lower_tail:
-        return float(dist.ppf(probability, *args, **kwargs))
-    return float(dist.isf(probability, *args, **kwargs))
+    method = "ppf" if lower_tail else "isf"
+    return float(_evaluate_distribution(distribution, method, probability, shape_args, loc, scale, extra_params))
+
+
+def _probability_between(distribution, lower, upper, shape_args, loc, scale, extra_params):
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    if np.any(lower > upper):
+        raise ValueError("lower must be less than or equal to upper.")
+    bounds = np.stack(np.broadcast_arrays(upper, lower))
+    cdf_upper, cdf_lower = _evaluate_distribution(distribution, "cdf", bounds, shape_args, loc, scale, extra_params)
+    probability = cdf_upper - cdf_lower
+    if hasattr(_get_distribution(distribution), "pmf"):
+        probability = probability + _evaluate_distribution(
+            distribution, "pmf", lower, shape_args, loc, scale, extra_params
+        )
+    return probability
 
 
 @mcp.tool
@@ -649,16 +1434,92 @@ def distribution_probability_between(
     >>> distribution_probability_between('norm', lower=-1.0, upper=1.0)
     0.6826894921370859
     """
-    if lower > upper:
-        raise ValueError("lower must be less than or equal to upper.")
-    dist = _get_distribution(distribution)
-    args, kwargs = _distribution_args_kwargs(dist, shape_args, loc, scale, extra_params)
-    cdf_upper = dist.cdf(upper, *args, **kwargs)
-    cdf_lower = dist.cdf(lower, *args, **kwargs)
-    probability = cdf_upper - cdf_lower
-    if hasattr(dist, "pmf"):
-        probability += dist.pmf(lower, *args, **kwargs)
-    return float(probability)
+    return float(_probability_between(distribution, lower, upper, shape_args, loc, scale, extra_params))
+
+
+@mcp.tool
+def distribution_pdf_batch(
+    distribution: str,
+    x: List[float],
+    shape_args: Optional[List[float | List[float]]] = None,
+    loc: float | List[float] = 0.0,
+    scale: float | List[float] = 1.0,
+    extra_params: Optional[Dict[str, float]] = None,
+) -> List[float]:
+    """Evaluate the PDF/PMF at many points in one vectorized call.
+
+    Shape args, loc and scale may be lists; they broadcast against x.
+    >>> distribution_pdf_batch('binom', x=[3, 3], shape_args=[[10, 20], 0.5])
+    [0.1171875, 0.0010871887207031228]
+    """
+    return _batch_result(_evaluate_distribution(distribution, "density", x, shape_args, loc, scale, extra_params))
+
+
+@mcp.tool
+def distribution_cdf_batch(
+    distribution: str,
+    x: List[float],
+    shape_args: Optional[List[float | List[float]]] = None,
+    loc: float | List[float] = 0.0,
+    scale: float | List[float] = 1.0,
+    lower_tail: bool = True,
+    extra_params: Optional[Dict[str, float]] = None,
+) -> List[float]:
+    """Evaluate the CDF (or survival function) at many points in one vectorized call.
+
+    >>> distribution_cdf_batch('norm', x=[0.0, 1.96])
+    [0.5, 0.9750021048517795]
+    """
+    method = "cdf" if lower_tail else "sf"
+    return _batch_result(_evaluate_distribution(distribution, method, x, shape_args, loc, scale, extra_params))
+
+
+@mcp.tool
+def distribution_quantile_batch(
+    distribution: str,
+    probabilities: List[float],
+    shape_args: Optional[List[float | List[float]]] = None,
+    loc: float | List[float] = 0.0,
+    scale: float | List[float] = 1.0,
+    lower_tail: bool = True,
+    extra_params: Optional[Dict[str, float]] = None,
+) -> List[float]:
+    """Return the quantiles of many cumulative probabilities in one vectorized call.
+
+    >>> distribution_quantile_batch('norm', probabilities=[0.5, 0.975])
+    [0.0, 1.959963984540054]
+    """
+    method = "ppf" if lower_tail else "isf"
+    return _batch_result(
+        _evaluate_distribution(distribution, method, probabilities, shape_args, loc, scale, extra_params)
+    )
+
+
+@mcp.tool
+def distribution_probability_between_batch(
+    distribution: str,
+    lower: List[float],
+    upper: List[float],
+    shape_args: Optional[List[float | List[float]]] = None,
+    loc: float | List[float] = 0.0,
+    scale: float | List[float] = 1.0,
+    extra_params: Optional[Dict[str, float]] = None,
+) -> List[float]:
+    """Compute P(lower[i] <= X <= upper[i]) for many intervals at once.
+
+    >>> distribution_probability_between_batch('norm', lower=[-1.0, -2.0], upper=[1.0, 2.0])
+    [0.6826894921370859, 0.9544997361036416]
+    """
+    return _batch_result(_probability_between(distribution, lower, upper, shape_args, loc, scale, extra_params))
+
+
+@mcp.tool
+def distribution_cache_stats(clear: bool = False) -> Dict[str, int]:
+    """Report (and optionally clear) the frozen-distribution cache statistics."""
+    info = _frozen_distribution.cache_info()
+    if clear:
+        _frozen_distribution.cache_clear()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "capacity": info.maxsize}
 
 
 @mcp.tool
@@ -0,0 +1,287 @@
+import os
+import subprocess
+import sys
+from collections import ChainMap
+
+import numpy as np
+from scipy import integrate, optimize
+
+import math_MCP
+
+# Opt-in budget for the self time of the math_MCP module body (excluding its imports), in
+# milliseconds; wall-clock timing depends on the machine, so the check only runs when set
+IMPORT_TIME_BUDGET_MS = os.getenv("MATH_MCP_IMPORT_BUDGET_MS")
+
+
+def test_vectorized_callable_matches_scalar():
+    func = math_MCP._build_callable("np.exp(-x**2) * np.sin(3*x)", "x")
+    assert func.array_safe
+    points = np.linspace(-2.0, 2.0, 9)
+    assert np.allclose(func(points), [func(float(point)) for point in points])
+    assert func(0.5) == math_MCP._build_callable("np.exp(-x**2) * np.sin(3*x)", "x")(0.5)
+
+
+def test_non_array_safe_expressions_fall_back():
+    for expression in ("x if x > 0 else -x", "np.sum(x)"):
+        func = math_MCP._build_callable(expression, "x")
+        assert not func.array_safe
+        assert list(func(np.array([-1.0, 2.0]))) == [func(-1.0), func(2.0)]
+    constant = math_MCP._build_callable("5", "x")
+    assert list(constant(np.array([1.0, 2.0]))) == [5.0, 5.0]
+
+
+def test_try_bracket_first_sign_change():
+    func = math_MCP._build_callable("(x - 0.3) * (x - 2.2)", "x")
+    low, high = math_MCP._try_bracket(func, 0.0, 3.0)
+    assert low <= 0.3 <= high
+    assert math_MCP._try_bracket(math_MCP._build_callable("x**2 + 1", "x"), -1.0, 1.0) is None
+
+
+def test_integration_matches_quad():
+    for expression, lower, upper in [("np.exp(-x**2)", 0.0, 1.0), ("np.sin(50*x)", 0.0, 10.0),
+                                     ("x**2", 1.0, -1.0), ("1/np.sqrt(x)", 0.0, 1.0),
+                                     ("np.exp(-x)", 0.0, np.inf), ("x if x > 0 else -x", -1.0, 1.0)]:
+        result = math_MCP.integrate_function(expression, lower, upper)
+        expected, _ = integrate.quad(math_MCP._build_callable(expression, "x"), lower, upper)
+        assert abs(result["value"] - expected) <= max(1e-8, result["abserr"])
+    # One interval is summed in QUADPACK's order, so smooth integrands match quad exactly
+    for expression, lower, upper in [("np.sin(x)", 0.0, np.pi), ("np.exp(-x**2)", 0.0, 1.0)]:
+        result = math_MCP.integrate_function(expression, lower, upper, symbolic=False)
+        assert result["value"] == integrate.quad(math_MCP._build_callable(expression, "x"), lower, upper)[0]
+
+
+def test_solve_equation_examples():
+    assert abs(math_MCP.solve_equation("np.cos(x) - x", 0.0, 1.0) - 0.7390851332151607) < 1e-9
+    assert math_MCP.solve_equation("x + 6 = 11") == 5.0
+
+
+def test_stencil_weights():
+    offsets, weights, accuracy = math_MCP._central_stencil(1, 5)
+    assert list(offsets) == [-2.0, -1.0, 1.0, 2.0]
+    assert np.allclose(weights, [1 / 12, -2 / 3, 2 / 3, -1 / 12])
+    assert accuracy == 4
+    offsets, weights, _ = math_MCP._central_stencil(4, 5)
+    assert list(weights) == [1.0, -4.0, 6.0, -4.0, 1.0]
+
+
+def test_derivative_methods():
+    calls = []
+    exp = math_MCP._build_callable("np.exp(x)", "x")
+
+    def counted(value):
+        calls.append(np.size(value))
+        return exp(value)
+
+    fourth = math_MCP.numerical_derivative(counted, 1.0, n=4)
+    assert abs(fourth - np.e) < 1e-5
+    assert len(calls) == 1 and calls[0] == 5
+
+    assert abs(math_MCP.numerical_derivative(exp, 1.0, n=4, method="richardson") - np.e) < 1e-7
+    assert math_MCP.numerical_derivative(exp, 1.0, method="complex") == np.e
+    assert abs(math_MCP.differentiate("np.exp(-x**2)", point=0.0, n=2) + 2.0) < 1e-8
+    assert abs(math_MCP.differentiate("x**3 + 2*x", point=2.0) - 14.0) < 1e-9
+
+    # The default step must not grow with |x0| for functions varying on a unit scale
+    sin = math_MCP._build_callable("np.sin(x)", "x")
+    for method in ("central", "richardson"):
+        assert abs(math_MCP.numerical_derivative(exp, 100.0, method=method) / np.exp(100.0) - 1.0) < 1e-10
+        assert abs(math_MCP.numerical_derivative(sin, 1000.0, method=method) - np.cos(1000.0)) < 1e-10
+
+
+def test_expression_cache_hits_and_eviction():
+    math_MCP.expression_cache_stats(clear=True)
+    for point in (0.1, 0.2, 0.3):
+        math_MCP.differentiate("x**4 - x", point=point, symbolic=False)
+    stats = math_MCP.expression_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 2 and stats["size"] == 1
+
+    original_size = math_MCP.EXPRESSION_CACHE_SIZE
+    math_MCP.EXPRESSION_CACHE_SIZE = 2
+    try:
+        for expression in ("x + 1", "x + 2", "x + 3"):
+            math_MCP._cached_callable(expression, "x")
+        stats = math_MCP.expression_cache_stats(clear=True)
+        assert stats["size"] == 2 and stats["evictions"] == 2
+    finally:
+        math_MCP.EXPRESSION_CACHE_SIZE = original_size
+
+
+def test_symbolic_paths():
+    if not math_MCP.SYMPY_AVAILABLE:
+        return
+    assert math_MCP.differentiate("x**3 + 2*x", point=2.0, symbolic=True) == 14.0
+    assert math_MCP.differentiate("np.exp(-x**2)", point=0.0, n=2, symbolic=True) == -2.0
+    assert math_MCP.integrate_function("x**3 + 2*x", 0.0, 2.0, symbolic=True)["value"] == 8.0
+    # Periodic poles rule out the antiderivative, so this is integrated numerically
+    result = math_MCP.integrate_function("np.tan(x)", 0.0, 1.0, symbolic=True)
+    assert abs(result["value"] + np.log(np.cos(1.0))) < 1e-12
+    # Python conditionals have no symbolic form
+    assert math_MCP.differentiate("x if x > 0 else -x", point=1.0, symbolic=True) == math_MCP.differentiate(
+        "x if x > 0 else -x", point=1.0)
+    # Step and method only apply to finite differences
+    for options in ({"dx": 1e-3}, {"method": "richardson"}):
+        try:
+            math_MCP.differentiate("x**2", point=1.0, symbolic=True, **options)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_symbolic_is_opt_in():
+    math_MCP.expression_cache_stats(clear=True)
+    math_MCP.differentiate("x**5 - 3*x", point=1.0)
+    math_MCP.integrate_function("x**5 - 3*x", 0.0, 1.0)
+    assert math_MCP.expression_cache_stats()["symbolic_entries"] == 0
+    assert math_MCP.differentiate("x**2", point=1.0, dx=1e-3, method="richardson") == math_MCP.numerical_derivative(
+        math_MCP._build_callable("x**2", "x"), 1.0, dx=1e-3, method="richardson")
+
+
+def test_unsat_core_uses_shared_helper():
+    import unsat_core
+
+    assert math_MCP._unsat_core is unsat_core
+    math_MCP.reset_solver_context()
+    try:
+        for constraint in ("x > 5", "y > 0", "x < 3"):
+            math_MCP.z3_add_constraint(constraint)
+        payload = math_MCP.z3_check_satisfiability(unsat_core=True, minimize_core=True)
+        assert payload["unsat_core"] == ["x > 5", "x < 3"] and payload["core_minimal"]
+    finally:
+        math_MCP.reset_solver_context()
+
+
+def test_solve_equation_all_roots():
+    roots = math_MCP.solve_equation_all("np.sin(x)", range_start=-10.0, range_end=10.0)
+    assert np.allclose(roots, np.pi * np.arange(-3, 4), atol=1e-12, rtol=0.0)
+    assert math_MCP.solve_equation_all("x**3 - x = 0") == [-1.0, 0.0, 1.0]
+    # Sign changes across poles are not roots
+    assert math_MCP.solve_equation_all("1/x", range_start=-1.0, range_end=1.0) == []
+    assert np.allclose(math_MCP.solve_equation_all("np.tan(x)", -4.0, 4.0), [-np.pi, 0.0, np.pi])
+
+    # The per-bracket brentq fallback agrees with the vectorized refinement
+    func = math_MCP._cached_callable("np.cos(3*x) - x / 4", "x")
+    points = np.linspace(-5.0, 5.0, 200)
+    values = func(points)
+    changes = np.flatnonzero(values[:-1] * values[1:] < 0)
+    expected = [optimize.brentq(func, points[i], points[i + 1]) for i in changes]
+    assert np.allclose(math_MCP._refine_brackets(func, points[changes], points[changes + 1]), expected,
+                       atol=1e-12, rtol=0.0)
+
+
+def test_solve_equation_batch():
+    results = math_MCP.solve_equation_batch(["x**2 - 2", "np.cos(x) - x"])
+    assert [result["expression"] for result in results] == ["x**2 - 2", "np.cos(x) - x"]
+    assert np.allclose(results[0]["roots"], [-np.sqrt(2), np.sqrt(2)])
+    assert np.allclose(results[1]["roots"], [0.7390851332151607])
+
+    results = math_MCP.solve_equation_batch(
+        ["x**2 - a"], range_start=0.0, parameter="a", parameter_values=[1.0, 4.0, 9.0])
+    assert [result["parameter_value"] for result in results] == [1.0, 4.0, 9.0]
+    assert np.allclose([result["roots"][0] for result in results], [1.0, 2.0, 3.0])
+
+    # The expression is compiled and probed once, not once per parameter value
+    builds = []
+    original = math_MCP._build_callable
+    math_MCP._build_callable = lambda *args: builds.append(args) or original(*args)
+    try:
+        results = math_MCP.solve_equation_batch(
+            ["np.sin(x) - a"], range_start=-1.0, range_end=1.0, parameter="a", parameter_values=[-0.5, 0.0, 0.5])
+    finally:
+        math_MCP._build_callable = original
+    assert len(builds) == 1
+    assert np.allclose([result["roots"][0] for result in results], np.arcsin([-0.5, 0.0, 0.5]))
+    try:
+        math_MCP.solve_equation_batch(["x - a"], parameter="a")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_lazy_namespaces():
+    builtins_namespace = math_MCP._SAFE_GLOBALS["__builtins__"]
+    assert eval("sin", math_MCP._SAFE_GLOBALS) is np.sin
+    # NumPy names shadow Python builtins; other builtins remain available
+    assert eval("abs", math_MCP._SAFE_GLOBALS) is np.abs
+    assert eval("range", math_MCP._SAFE_GLOBALS) is range
+    try:
+        builtins_namespace["sin"] = None
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
+    try:
+        eval("not_a_numpy_name", math_MCP._SAFE_GLOBALS)
+        assert False, "expected NameError"
+    except NameError:
+        pass
+
+    env = math_MCP._build_z3_eval_env({"x": 1})
+    assert isinstance(env, ChainMap) and env.maps[1] is math_MCP._Z3_NAMESPACE
+    assert env["x"] == 1 and env["Solver"] is math_MCP._z3.Solver
+    assert "Solver" in math_MCP._Z3_RESERVED_NAMES
+
+
+def test_import_time_budget():
+    if IMPORT_TIME_BUDGET_MS is None:
+        return
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", "import math_MCP"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+    ).stderr
+    line = next(line for line in output.splitlines() if line.rstrip().endswith("| math_MCP"))
+    self_ms = int(line.split(":")[1].split("|")[0]) / 1000.0
+    assert self_ms < float(IMPORT_TIME_BUDGET_MS), f"math_MCP import took {self_ms:.0f} ms"
+
+
+def test_distribution_batches_match_scalar_tools():
+    xs = [-1.5, 0.0, 0.7, 2.0]
+    batch = math_MCP.distribution_pdf_batch("gamma", x=xs, shape_args=[2.0], scale=1.5)
+    assert batch == [math_MCP.distribution_pdf("gamma", x=x, shape_args=[2.0], scale=1.5) for x in xs]
+    assert math_MCP.distribution_cdf_batch("norm", x=xs, lower_tail=False) == [
+        math_MCP.distribution_cdf("norm", x=x, lower_tail=False) for x in xs]
+    assert math_MCP.distribution_quantile_batch("t", probabilities=[0.1, 0.9], shape_args=[4]) == [
+        math_MCP.distribution_quantile("t", probability=p, shape_args=[4]) for p in (0.1, 0.9)]
+
+    # Shape args, loc and scale broadcast against the evaluation points
+    sizes = [10, 12, 20]
+    batch = math_MCP.distribution_probability_between_batch(
+        "binom", lower=[2, 2, 2], upper=[5, 5, 5], shape_args=[sizes, 0.5])
+    assert batch == [math_MCP.distribution_probability_between("binom", 2, 5, shape_args=[n, 0.5])
+                     for n in sizes]
+    batch = math_MCP.distribution_cdf_batch("norm", x=[1.0, 1.0], loc=[0.0, 1.0], scale=2.0)
+    assert batch == [math_MCP.distribution_cdf("norm", x=1.0, loc=loc, scale=2.0) for loc in (0.0, 1.0)]
+
+    try:
+        math_MCP.distribution_probability_between_batch("norm", lower=[0.0, 2.0], upper=[1.0, 1.0])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_frozen_distribution_cache():
+    math_MCP.distribution_cache_stats(clear=True)
+    for x in (0.1, 0.2, 0.3):
+        math_MCP.distribution_pdf("gamma", x=x, shape_args=[2.0], scale=1.5)
+    math_MCP.distribution_cdf_batch("gamma", x=[0.1, 0.2], shape_args=[2], scale=1.5)
+    stats = math_MCP.distribution_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 3 and stats["size"] == 1
+
+
+if __name__ == "__main__":
+    test_vectorized_callable_matches_scalar()
+    test_non_array_safe_expressions_fall_back()
+    test_try_bracket_first_sign_change()
+    test_integration_matches_quad()
+    test_solve_equation_examples()
+    test_stencil_weights()
+    test_derivative_methods()
+    test_expression_cache_hits_and_eviction()
+    test_symbolic_paths()
+    test_symbolic_is_opt_in()
+    test_unsat_core_uses_shared_helper()
+    test_solve_equation_all_roots()
+    test_solve_equation_batch()
+    test_lazy_namespaces()
+    test_import_time_budget()
+    test_distribution_batches_match_scalar_tools()
+    test_frozen_distribution_cache()
+    print("All math MCP tests passed!")
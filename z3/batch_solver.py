@@ -0,0 +1,72 @@
+"""
+Worker pool for solving many independent constraint sets in one request.
+
+Every worker thread owns its own Z3 Context, so problems never share terms
+and Z3 calls (which release the GIL) run in parallel.  Each problem gets a
+solver-level timeout so a single hard instance cannot stall the batch.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from z3 import Context
+
+# Number of worker threads shared by all batch requests
+BATCH_WORKERS = int(os.getenv("Z3_BATCH_WORKERS", str(os.cpu_count() or 4)))
+
+# Default per-problem solver timeout in milliseconds
+DEFAULT_ITEM_TIMEOUT_MS = 5000
+
+_executor = None
+_executor_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="z3-batch")
+        return _executor
+
+
+def _thread_context():
+    """Return the Z3 context owned by the current worker thread."""
+    ctx = getattr(_thread_state, 'ctx', None)
+    if ctx is None:
+        ctx = Context()
+        _thread_state.ctx = ctx
+    return ctx
+
+
+def _run_one(solve_fn, problem, timeout_ms):
+    try:
+        return solve_fn(problem, ctx=_thread_context(), timeout_ms=timeout_ms)
+    except Exception as e:
+        return f"Invalid equation: {str(e)}"
+
+
+def solve_batch(problems, solve_fn, timeout_ms=DEFAULT_ITEM_TIMEOUT_MS):
+    """
+    Solve independent problems on the worker pool.
+    :param problems: Sequence of problems understood by solve_fn.
+    :param solve_fn: Callable(problem, ctx=..., timeout_ms=...) returning a result.
+    :param timeout_ms: Solver timeout applied to each problem.
+    :return: Results in the same order as problems.
+    """
+    executor = _get_executor()
+    return list(executor.map(lambda problem: _run_one(solve_fn, problem, timeout_ms), problems))
+
+
+def iter_solve_batch(problems, solve_fn, timeout_ms=DEFAULT_ITEM_TIMEOUT_MS):
+    """
+    Solve independent problems on the worker pool, yielding results as they complete.
+    :return: Iterator of (index, result) pairs in completion order.
+    """
+    executor = _get_executor()
+    futures = {
+        executor.submit(_run_one, solve_fn, problem, timeout_ms): index
+        for index, problem in enumerate(problems)
+    }
+    for future in as_completed(futures):
+        yield futures[future], future.result()
@@ -0,0 +1,69 @@
+"""
+Benchmark model serialization for large variable sets.
+
+Compares the shared single-pass serializer against the previous per-variable
+lookups used by z3_backend.solve_equation and working/processing.solve_equation.
+
+    python bench_model_serialization.py --variables 10000
+"""
+import argparse
+import time
+
+from z3 import Q, Real, Solver, sat
+
+from model_serialization import serialize_model, format_assignments
+
+
+def build_model(count):
+    variables = {f"v{i}": Real(f"v{i}") for i in range(count)}
+    s = Solver()
+    for i, var in enumerate(variables.values()):
+        s.add(var == Q(i, 3))
+    assert s.check() == sat
+    return s.model(), variables
+
+
+def legacy_backend(model, variables):
+    """Previous z3_backend.solve_equation formatting: one model lookup per variable."""
+    return ", ".join([f"{var} = {model[variables[var]]}" for var in variables])
+
+
+def legacy_processing(model, variables):
+    """Previous working/processing.solve_equation loop: rebuilds the decl names per variable."""
+    result = {}
+    for var in variables:
+        if var in [decl.name() for decl in model.decls()]:
+            result[var] = str(model[variables[var]])
+    return result
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Z3 model serialization")
+    parser.add_argument("--variables", type=int, default=10000)
+    parser.add_argument("--legacy-max", type=int, default=1000,
+                        help="Largest size for the quadratic legacy loop")
+    args = parser.parse_args()
+
+    sizes = sorted({min(args.legacy_max, args.variables), args.variables})
+    for count in sizes:
+        model, variables = build_model(count)
+        print(f"{count} variables:")
+        timed("serialize_model (all)", serialize_model, model)
+        timed("serialize_model (names)", serialize_model, model, variables)
+        timed("serialize_model (decimal)", serialize_model, model, None, "decimal")
+        timed("format_assignments (compact)", lambda: format_assignments(serialize_model(model), True))
+        timed("legacy backend lookups", legacy_backend, model, variables)
+        if count <= args.legacy_max:
+            timed("legacy processing loop", legacy_processing, model, variables)
+
+
+if __name__ == "__main__":
+    main()
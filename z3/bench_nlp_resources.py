@@ -0,0 +1,119 @@
+"""
+Benchmark per-sentence resource cost in extract_entities_and_predicates.
+
+Compares building the stopword set, the chunk grammar and the relation-phrase
+scan for every sentence (the previous behaviour) against the shared bundle
+from nlp_resources, checks that worker threads share one bundle, and shows
+keyword detection cost as the keyword vocabulary grows.
+
+    python bench_nlp_resources.py --sentences 2000
+"""
+import argparse
+import threading
+import time
+
+from nltk.chunk import RegexpParser
+from nltk.corpus import stopwords
+
+from keyword_matcher import build_keyword_index, scan_keywords
+from nlp_resources import (KEYWORD_GROUPS, RELATION_GRAMMAR, RELATION_PHRASES,
+                           get_nlp_resources, refresh_nlp_resources)
+
+SENTENCES = [
+    "all humans are mortal",
+    "alice is the parent of bob and bob is related to carol",
+    "the number seven is greater than the number three",
+    "every dog is an animal that belongs to a household",
+    "the committee includes members who are connected to the board",
+]
+
+TAGGED = [("alice", "NN"), ("loves", "VBZ"), ("bob", "NN"), ("in", "IN"), ("paris", "NN")]
+
+
+def stopwords_available():
+    try:
+        stopwords.words('english')
+        return True
+    except LookupError:
+        return False
+
+
+def legacy_sentence(text, use_stopwords):
+    if use_stopwords:
+        set(stopwords.words('english'))
+    RegexpParser(RELATION_GRAMMAR).parse(TAGGED)
+    return {phrase for phrase in RELATION_PHRASES if phrase in text}
+
+
+def bundled_sentence(text, use_stopwords):
+    resources = get_nlp_resources()
+    resources['chunk_parser'].parse(TAGGED)
+    return scan_keywords(resources['keyword_index'], text.split())['relation']
+
+
+def legacy_keywords(tokens, vocabulary):
+    """Previous style: one membership scan of the token list per keyword."""
+    return [keyword for keyword in vocabulary if keyword in tokens]
+
+
+def keyword_scaling(count, sizes):
+    """Per-sentence keyword detection cost as the keyword vocabulary grows."""
+    base = [keyword for phrases in KEYWORD_GROUPS.values() for keyword in phrases]
+    token_lists = [sentence.split() for sentence in SENTENCES]
+    for size in sizes:
+        vocabulary = base + [f"keyword{i}" for i in range(max(0, size - len(base)))]
+        index = build_keyword_index({"all": vocabulary})
+        timings = []
+        for func, arg in ((legacy_keywords, vocabulary), (scan_keywords, index)):
+            start = time.perf_counter()
+            for i in range(count):
+                if func is scan_keywords:
+                    func(arg, token_lists[i % len(token_lists)])
+                else:
+                    func(token_lists[i % len(token_lists)], arg)
+            timings.append((time.perf_counter() - start) / count * 1e6)
+        print(f"  {len(vocabulary):>6} keywords: list scans {timings[0]:10.1f} us, "
+              f"matcher {timings[1]:8.1f} us per sentence")
+
+
+def per_sentence(label, func, count, use_stopwords):
+    start = time.perf_counter()
+    for i in range(count):
+        func(SENTENCES[i % len(SENTENCES)], use_stopwords)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {elapsed / count * 1e6:10.1f} us/sentence")
+
+
+def shared_across_threads(workers):
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(id(get_nlp_resources())))
+               for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(set(seen)) == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared NLP resources")
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    use_stopwords = stopwords_available()
+    if not use_stopwords:
+        # Without the corpus the default bundle cannot be built; time the rest only
+        refresh_nlp_resources(stop_words=())
+        print("NLTK stopwords corpus not found; stopword loading excluded from timings")
+
+    print(f"{args.sentences} sentences:")
+    per_sentence("per-call construction", legacy_sentence, args.sentences, use_stopwords)
+    per_sentence("shared bundle", bundled_sentence, args.sentences, use_stopwords)
+    print(f"  bundle shared by {args.threads} threads: {shared_across_threads(args.threads)}")
+    print("keyword detection:")
+    keyword_scaling(args.sentences, (50, 500, 5000))
+
+
+if __name__ == "__main__":
+    main()
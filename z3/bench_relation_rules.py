@@ -0,0 +1,83 @@
+"""
+Benchmark per-sentence relation extraction from parsed spaCy documents.
+
+Times extract_doc_relations on the golden corpus and on one long document made
+of its sentences.  Parsing is excluded so only the extraction step is timed; no
+model download is needed.  The dependency walk is timed on its own (singular
+forms disabled), then with inflect called for every phrase as before and with
+the memoized singular_phrase of spacy_relation_extract, so the cost of the
+walk and the saving of the memoization are reported separately.
+
+    python bench_relation_rules.py --repeat 200
+    python bench_relation_rules.py --regenerate   # rewrite expected triples from the current rules
+"""
+import argparse
+import json
+import time
+from functools import lru_cache
+
+import inflect
+import spacy
+from spacy.tokens import Doc
+
+from relation_rules import GOLDEN_CORPUS_PATH, extract_doc_relations, load_golden_docs
+
+p = inflect.engine()
+
+
+def singularize(text):
+    return p.singular_noun(text) or text
+
+
+def unchanged(text):
+    return text
+
+
+def per_sentence(docs, repeat, singularize):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for doc in docs:
+            extract_doc_relations(doc, singularize)
+    return (time.perf_counter() - start) / (repeat * len(docs)) * 1e6
+
+
+def report(label, docs, repeat):
+    walk = per_sentence(docs, repeat, unchanged)
+    inflected = per_sentence(docs, repeat, singularize)
+    # Same size as spacy_relation_extract.singular_phrase
+    memoized = per_sentence(docs, repeat, lru_cache(maxsize=4096)(singularize))
+    print(f"  {label:<16} walk {walk:8.1f} us, + inflect per phrase {inflected:8.1f} us, "
+          f"+ memoized {memoized:8.1f} us per doc (memoization {inflected / memoized:.2f}x)")
+
+
+def regenerate(vocab):
+    with open(GOLDEN_CORPUS_PATH, encoding="utf-8") as handle:
+        corpus = json.load(handle)
+    for entry, doc in zip(corpus["sentences"], load_golden_docs(vocab)):
+        entry["relations"] = [list(relation) for relation in extract_doc_relations(doc, singularize)]
+    with open(GOLDEN_CORPUS_PATH, "w", encoding="utf-8") as handle:
+        json.dump(corpus, handle, indent=1)
+        handle.write("\n")
+    print(f"Rewrote expected relations for {len(corpus['sentences'])} sentences")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dependency relation extraction")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--regenerate", action="store_true")
+    args = parser.parse_args()
+
+    vocab = spacy.blank("en").vocab
+    if args.regenerate:
+        regenerate(vocab)
+        return
+
+    docs = load_golden_docs(vocab)
+    long_doc = [Doc.from_docs(docs)]
+    print(f"{len(docs)} golden sentences, long document of {len(long_doc[0])} tokens, {args.repeat} repeats:")
+    report("sentences", docs, args.repeat)
+    report("long document", long_doc, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
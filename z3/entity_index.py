@@ -0,0 +1,298 @@
+"""
+Canonical entity ids for relation subjects and objects.
+
+Surface forms such as "the sun", "Sun", "suns" and "the Sun" become separate
+graph nodes when saved as extracted.  ``normalize_entity`` maps a surface form
+to a canonical form:
+
+    1. collapse whitespace, trim punctuation, lowercase
+    2. drop a leading article (a, an, the)
+    3. alias table lookup
+    4. singular form of the last word (WordNet if available, else inflect),
+       unless it is capitalized: "Athens", "United States" are names
+    5. alias table lookup again
+
+and ``entity_id`` hashes the canonical form, so every process and document
+assigns the same id without coordination.  Aliases map normalized surface
+forms to a canonical name and are read from the JSON file named by
+``Z3_ENTITY_ALIASES`` ({"alias": "canonical", ...}).
+
+Resolutions are kept in an in-process LRU (``Z3_ENTITY_CACHE_SIZE``) in front
+of an optional SQLite index (``Z3_ENTITY_INDEX_PATH``) shared between workers
+and runs.  The index records the alias table and normalization version it was
+built with and is cleared when either changes.  ``canonicalize_entities`` resolves a whole batch with
+one query for the cache misses and one insert transaction.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import inflect
+
+# Canonicalize subjects and objects of PDF extractions (pdf_pipeline)
+CANONICALIZE_ENTITIES = os.environ.get("Z3_CANONICALIZE_ENTITIES", "1").lower() not in ("0", "false", "no")
+ENTITY_CACHE_SIZE = int(os.environ.get("Z3_ENTITY_CACHE_SIZE", "50000"))
+ENTITY_INDEX_PATH = os.environ.get("Z3_ENTITY_INDEX_PATH")
+ENTITY_ALIASES_PATH = os.environ.get("Z3_ENTITY_ALIASES")
+
+ARTICLES = ("a", "an", "the")
+# inflect strips the "s" of these endings ("gas" -> "ga", "process" -> "proces")
+_SINGULAR_KEEP_SUFFIXES = ("ss", "us", "is", "ics")
+# Singular nouns ending in "s" that inflect would still truncate
+_SINGULAR_KEEP_WORDS = frozenset({"atlas", "bias", "canvas", "chaos", "lens", "means"})
+# Part of the index fingerprint: bump when normalization changes so stored resolutions are redone
+_NORMALIZATION_VERSION = 2
+# Words this short are never singularized
+_SINGULAR_MIN_LENGTH = 4
+# SQLite limits the number of parameters per statement
+_QUERY_CHUNK = 500
+
+_TRIM = re.compile(r"^[\W_]+|[\W_]+$")
+_inflect = inflect.engine()
+_lemmatizer = None
+
+_entity_cache = OrderedDict()
+_entity_cache_lock = threading.RLock()
+_entity_cache_stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+_entity_aliases = {}
+_entity_store = None
+_entity_store_pid = None
+
+
+def _lemmatize_noun(word):
+    """WordNet noun lemma, or None without WordNet data (checked once)."""
+    global _lemmatizer
+    if _lemmatizer is None:
+        from nltk.stem import WordNetLemmatizer
+
+        _lemmatizer = WordNetLemmatizer()
+    if _lemmatizer is False:
+        return None
+    try:
+        return _lemmatizer.lemmatize(word, "n")
+    except LookupError:
+        _lemmatizer = False
+        return None
+
+
+def singular_word(word):
+    """Singular form of a lowercase word, or the word unchanged."""
+    if (len(word) < _SINGULAR_MIN_LENGTH or not word.isalpha() or word in _SINGULAR_KEEP_WORDS
+            or word.endswith(_SINGULAR_KEEP_SUFFIXES)):
+        return word
+    # WordNet knows "lens" is singular; inflect only applies suffix rules
+    lemma = _lemmatize_noun(word)
+    if lemma is not None:
+        return lemma
+    return _inflect.singular_noun(word) or word
+
+
+def _surface_words(surface):
+    words = _TRIM.sub("", " ".join(surface.split())).split()
+    if len(words) > 1 and words[0].lower() in ARTICLES:
+        words = words[1:]
+    return words
+
+
+def _base_form(surface):
+    return " ".join(_surface_words(surface)).lower()
+
+
+def normalize_entity(surface, aliases=None):
+    """
+    Canonical form of an entity surface form.
+    :param surface: Subject or object as extracted.
+    :param aliases: Alias table (normalized alias -> canonical); defaults to the loaded table.
+    :return: Canonical form; the lowercased surface if nothing word-like is left.
+    """
+    aliases = _entity_aliases if aliases is None else aliases
+    words = _surface_words(surface)
+    if not words:
+        return surface.strip().lower()
+    form = " ".join(words).lower()
+    if form in aliases:
+        return aliases[form]
+    # Without part-of-speech tags a capitalized last word is taken for a proper noun
+    if words[-1][:1].isupper():
+        return form
+    words = form.split(" ")
+    words[-1] = singular_word(words[-1])
+    form = " ".join(words)
+    return aliases.get(form, form)
+
+
+def entity_id(canonical):
+    """Stable id of a canonical form (16 hex digits of its SHA-1)."""
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_aliases(aliases):
+    # Canonical names go through the same normalization, without the alias table
+    normalized = {}
+    for alias, canonical in aliases.items():
+        target = normalize_entity(canonical, {})
+        normalized[_base_form(alias)] = target
+        normalized[normalize_entity(alias, {})] = target
+    return normalized
+
+
+def load_entity_aliases(path):
+    """Read a JSON alias file ({"alias": "canonical", ...})."""
+    with open(path, encoding="utf-8") as handle:
+        aliases = json.load(handle)
+    if not isinstance(aliases, dict):
+        raise ValueError(f"Entity alias file {path} must contain a JSON object")
+    return aliases
+
+
+def _aliases_fingerprint():
+    state = [_NORMALIZATION_VERSION, sorted(_entity_aliases.items())]
+    return hashlib.sha256(json.dumps(state).encode("utf-8")).hexdigest()
+
+
+def _get_entity_store():
+    """Open the on-disk entity index once per process; called with the cache lock held."""
+    global _entity_store, _entity_store_pid
+    if ENTITY_INDEX_PATH and (_entity_store is None or _entity_store_pid != os.getpid()):
+        connection = sqlite3.connect(ENTITY_INDEX_PATH, timeout=30, check_same_thread=False)
+        connection.execute("CREATE TABLE IF NOT EXISTS entities "
+                           "(surface TEXT PRIMARY KEY, entity_id TEXT NOT NULL, canonical TEXT NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS entities_by_id ON entities (entity_id)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        _sync_aliases(connection)
+        _entity_store = connection
+        _entity_store_pid = os.getpid()
+    return _entity_store
+
+
+def _sync_aliases(connection):
+    # Resolutions made with another alias table or normalization version are stale
+    fingerprint = _aliases_fingerprint()
+    row = connection.execute("SELECT value FROM meta WHERE key = 'aliases'").fetchone()
+    if row is None or row[0] != fingerprint:
+        connection.execute("DELETE FROM entities")
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aliases', ?)", (fingerprint,))
+    connection.commit()
+
+
+def set_entity_aliases(aliases):
+    """
+    Replace the alias table.
+    :param aliases: Dictionary alias -> canonical name (any surface form on either side).
+    """
+    global _entity_aliases
+    with _entity_cache_lock:
+        _entity_aliases = _normalize_aliases(aliases)
+        _entity_cache.clear()
+        if _entity_store is not None and _entity_store_pid == os.getpid():
+            _sync_aliases(_entity_store)
+
+
+def _remember_entity(surface, resolved):
+    _entity_cache[surface] = resolved
+    _entity_cache.move_to_end(surface)
+    while len(_entity_cache) > ENTITY_CACHE_SIZE:
+        _entity_cache.popitem(last=False)
+
+
+def canonicalize_entities(surfaces):
+    """
+    Resolve surface forms in bulk.
+    :param surfaces: Iterable of subject/object strings.
+    :return: List of (entity_id, canonical) in input order.
+    """
+    surfaces = list(surfaces)
+    resolved = {}
+    with _entity_cache_lock:
+        missing = []
+        for surface in dict.fromkeys(surfaces):
+            cached = _entity_cache.get(surface)
+            if cached is None:
+                missing.append(surface)
+            else:
+                _entity_cache.move_to_end(surface)
+                resolved[surface] = cached
+        _entity_cache_stats["hits"] += len(resolved)
+
+        store = _get_entity_store()
+        if store is not None and missing:
+            for start in range(0, len(missing), _QUERY_CHUNK):
+                chunk = missing[start:start + _QUERY_CHUNK]
+                rows = store.execute("SELECT surface, entity_id, canonical FROM entities WHERE surface IN "
+                                     f"({', '.join('?' * len(chunk))})", chunk).fetchall()
+                for surface, identifier, canonical in rows:
+                    resolved[surface] = (identifier, canonical)
+                    _remember_entity(surface, (identifier, canonical))
+                _entity_cache_stats["disk_hits"] += len(rows)
+            missing = [surface for surface in missing if surface not in resolved]
+
+        new_rows = []
+        for surface in missing:
+            canonical = normalize_entity(surface)
+            resolved[surface] = (entity_id(canonical), canonical)
+            _remember_entity(surface, resolved[surface])
+            new_rows.append((surface, *resolved[surface]))
+        _entity_cache_stats["misses"] += len(missing)
+        if store is not None and new_rows:
+            store.executemany("INSERT OR REPLACE INTO entities (surface, entity_id, canonical) VALUES (?, ?, ?)",
+                              new_rows)
+            store.commit()
+    return [resolved[surface] for surface in surfaces]
+
+
+def canonicalize_relations(relations):
+    """
+    Replace subject and object of relation dictionaries by their canonical form
+    and add subject_id / object_id, in place.
+    :return: The same list.
+    """
+    entities = canonicalize_entities(term for relation in relations
+                                     for term in (relation["subject"], relation["object"]))
+    for relation, subject, obj in zip(relations, entities[0::2], entities[1::2]):
+        relation["subject_id"], relation["subject"] = subject
+        relation["object_id"], relation["object"] = obj
+    return relations
+
+
+def entity_surface_forms(identifier):
+    """Return the surface forms resolved to an entity id (from the index, else the in-process cache)."""
+    with _entity_cache_lock:
+        store = _get_entity_store()
+        if store is not None:
+            rows = store.execute("SELECT surface FROM entities WHERE entity_id = ? ORDER BY surface",
+                                 (identifier,)).fetchall()
+            return [row[0] for row in rows]
+        return sorted(surface for surface, (cached_id, _) in _entity_cache.items() if cached_id == identifier)
+
+
+def entity_index_info():
+    """Return hit/miss counters, the hit ratio and the size of the entity cache."""
+    with _entity_cache_lock:
+        hits = _entity_cache_stats["hits"] + _entity_cache_stats["disk_hits"]
+        lookups = hits + _entity_cache_stats["misses"]
+        return {
+            "hits": _entity_cache_stats["hits"],
+            "disk_hits": _entity_cache_stats["disk_hits"],
+            "misses": _entity_cache_stats["misses"],
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "size": len(_entity_cache),
+            "max_size": ENTITY_CACHE_SIZE,
+            "aliases": len(_entity_aliases),
+            "store": ENTITY_INDEX_PATH,
+        }
+
+
+def clear_entity_cache():
+    """Empty the in-process entity cache and reset its counters (the index file is kept)."""
+    with _entity_cache_lock:
+        _entity_cache.clear()
+        for key in _entity_cache_stats:
+            _entity_cache_stats[key] = 0
+
+
+if ENTITY_ALIASES_PATH:
+    set_entity_aliases(load_entity_aliases(ENTITY_ALIASES_PATH))
@@ -0,0 +1,271 @@
+"""
+Batch relation extraction for a directory of PDFs.
+
+Files are sharded over a process pool whose workers load the spaCy pipeline
+and NLTK tagger once, then run the same pipeline as /extract_relations_from_pdf
+(pdf_pipeline).  Triples go to a sink:
+
+    jsonl    one relation per line, appended to --output
+    parquet  dictionary-encoded part files (triple_export) in the --output directory
+    mongo    bulk inserts through mongo_client.save_relations_bulk
+
+Completed files are appended to a checkpoint file (``<output>.checkpoint`` by
+default) only after the sink has flushed their relations, so an interrupted
+run resumes with the files that are not done yet.  A file interrupted between
+the flush and the checkpoint write is processed again, so sinks see every
+file at least once.
+
+    python ingest_pdfs.py papers/ --output relations.jsonl --workers 4
+    python ingest_pdfs.py papers/ --sink parquet --output relations_parquet/
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+# Files between sink flushes / checkpoint writes
+DEFAULT_CHECKPOINT_EVERY = 100
+
+_worker_settings = {}
+
+
+def find_pdfs(directory):
+    """Return the paths of all PDFs below a directory, sorted."""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+    return sorted(paths)
+
+
+def load_checkpoint(path):
+    """Return the set of files recorded as done in a checkpoint file."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as handle:
+        return {line.rstrip("\n") for line in handle if line.strip()}
+
+
+def _init_worker(quality_threshold):
+    """Load models once per worker process."""
+    from spacy_relation_extract import get_pos_tagger, load_spacy_model
+
+    _worker_settings["quality_threshold"] = quality_threshold
+    load_spacy_model()
+    try:
+        get_pos_tagger()
+    except LookupError as e:
+        print(f"NLTK tagger unavailable in worker {os.getpid()}: {e}")
+
+
+def process_pdf(path):
+    """
+    Extract relations from one PDF file.
+    :return: Dictionary with the path, relations, sentence counts and an error message or None.
+    """
+    from pdf_pipeline import clean_pdf_text, extract_pdf_relations, read_pdf_pages, split_pdf_sentences
+
+    try:
+        with open(path, "rb") as handle:
+            pages = read_pdf_pages(handle, path)
+        text, _ = clean_pdf_text(pages)
+        sentences = split_pdf_sentences(text)
+        relations, quality = extract_pdf_relations(sentences, _worker_settings.get("quality_threshold"))
+        return {"path": path, "relations": relations, "sentences": len(sentences),
+                "parsed": quality["kept"], "error": None}
+    except Exception as e:
+        return {"path": path, "relations": [], "sentences": 0, "parsed": 0, "error": str(e)}
+
+
+class JsonlSink:
+    """Append relations as JSON lines."""
+
+    def __init__(self, path):
+        self.handle = open(path, "a", encoding="utf-8")
+
+    def write(self, document, relations):
+        for relation in relations:
+            self.handle.write(json.dumps({"document": document, **relation}) + "\n")
+
+    def flush(self):
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+
+    def close(self):
+        self.handle.close()
+
+
+class ParquetSink:
+    """Write buffered relations as dictionary-encoded Parquet part files into a directory."""
+
+    def __init__(self, directory):
+        from triple_export import write_triples
+
+        os.makedirs(directory, exist_ok=True)
+        self.write_triples = write_triples
+        self.directory = directory
+        self.prefix = f"part-{int(time.time())}-{os.getpid()}"
+        self.parts = 0
+        self.rows = []
+
+    def write(self, document, relations):
+        self.rows.extend({"document": document, **relation} for relation in relations)
+
+    def flush(self):
+        if not self.rows:
+            return
+        self.parts += 1
+        self.write_triples(os.path.join(self.directory, f"{self.prefix}-{self.parts:05d}.parquet"), self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+
+
+class MongoSink:
+    """Buffer relations and save them with one bulk insert per flush."""
+
+    def __init__(self, label="Entity"):
+        import mongo_client
+
+        self.mongo_client = mongo_client
+        self.label = label
+        self.relations = []
+
+    @staticmethod
+    def _props(relation, role):
+        props = {"name": relation[role]}
+        if f"{role}_id" in relation:
+            props["entity_id"] = relation[f"{role}_id"]
+        return props
+
+    def write(self, document, relations):
+        for relation in relations:
+            self.relations.append({
+                "source_node": {"label": self.label, "props": self._props(relation, "subject")},
+                "target_node": {"label": self.label, "props": self._props(relation, "object")},
+                "relation_type": relation["relation"],
+                "properties": {"document": document, "source_sentence": relation["source_sentence"]},
+            })
+
+    def flush(self):
+        if not self.relations:
+            return
+        saved = self.mongo_client.save_relations_bulk(self.relations)
+        if saved < len(self.relations):
+            raise RuntimeError(f"Only {saved} of {len(self.relations)} relations were saved to MongoDB")
+        self.relations = []
+
+    def close(self):
+        self.flush()
+
+
+def make_sink(kind, output):
+    """Create a sink by name ('jsonl', 'parquet' or 'mongo')."""
+    if kind == "jsonl":
+        return JsonlSink(output)
+    if kind == "parquet":
+        return ParquetSink(output)
+    if kind == "mongo":
+        return MongoSink()
+    raise ValueError(f"Unknown sink '{kind}'")
+
+
+def _results(paths, workers, quality_threshold, process, initializer, max_tasks_per_child):
+    if workers <= 1:
+        initializer(quality_threshold)
+        for path in paths:
+            yield process(path)
+        return
+    with multiprocessing.Pool(workers, initializer=initializer, initargs=(quality_threshold,),
+                              maxtasksperchild=max_tasks_per_child) as pool:
+        yield from pool.imap_unordered(process, paths)
+
+
+def ingest(paths, sink, checkpoint_path, workers=1, quality_threshold=None,
+           checkpoint_every=DEFAULT_CHECKPOINT_EVERY, process=process_pdf, initializer=_init_worker,
+           max_tasks_per_child=None):
+    """
+    Extract relations from PDF files into a sink, skipping files already checkpointed.
+    :param paths: PDF file paths.
+    :param sink: Sink object (write/flush/close).
+    :param checkpoint_path: File listing completed paths, one per line.
+    :param workers: Worker processes; 1 runs in this process.
+    :param quality_threshold: Optional sentence quality threshold.
+    :param checkpoint_every: Files between sink flushes and checkpoint writes.
+    :param process: Function mapping a path to a result (see process_pdf).
+    :param initializer: Function run once per worker with the quality threshold.
+    :param max_tasks_per_child: Optional number of files after which a worker is replaced.
+    :return: Statistics dictionary with counts and throughput.
+    """
+    done = load_checkpoint(checkpoint_path)
+    pending = [path for path in paths if path not in done]
+    stats = {"files": len(paths), "skipped": len(paths) - len(pending), "documents": 0, "failed": 0,
+             "sentences": 0, "parsed_sentences": 0, "relations": 0, "errors": {}}
+    print(f"{len(pending)} of {len(paths)} files to process with {workers} worker(s)")
+
+    start = time.perf_counter()
+    completed = []
+
+    def checkpoint():
+        sink.flush()
+        with open(checkpoint_path, "a", encoding="utf-8") as handle:
+            handle.writelines(path + "\n" for path in completed)
+        completed.clear()
+
+    try:
+        for result in _results(pending, workers, quality_threshold, process, initializer,
+                                 max_tasks_per_child):
+            if result["error"] is not None:
+                # Failed files are not checkpointed and are retried by the next run
+                stats["failed"] += 1
+                stats["errors"][result["path"]] = result["error"]
+                continue
+            sink.write(result["path"], result["relations"])
+            completed.append(result["path"])
+            stats["documents"] += 1
+            stats["sentences"] += result["sentences"]
+            stats["parsed_sentences"] += result["parsed"]
+            stats["relations"] += len(result["relations"])
+            if len(completed) >= checkpoint_every:
+                checkpoint()
+                _print_progress(stats, time.perf_counter() - start)
+        checkpoint()
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["documents_per_s"] = round(stats["documents"] / elapsed, 3) if elapsed else 0.0
+    stats["sentences_per_s"] = round(stats["sentences"] / elapsed, 3) if elapsed else 0.0
+    return stats
+
+
+def _print_progress(stats, elapsed):
+    print(f"  {stats['documents']} documents, {stats['relations']} relations, "
+          f"{stats['documents'] / elapsed:.2f} docs/s, {stats['sentences'] / elapsed:.1f} sentences/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract relations from a directory of PDFs")
+    parser.add_argument("directory")
+    parser.add_argument("--sink", choices=("jsonl", "parquet", "mongo"), default="jsonl")
+    parser.add_argument("--output", default="relations.jsonl",
+                        help="JSONL file or Parquet directory (ignored for mongo except as checkpoint name)")
+    parser.add_argument("--checkpoint", help=f"Checkpoint file (default: <output>{CHECKPOINT_SUFFIX})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--quality-threshold", type=float)
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY)
+    parser.add_argument("--max-tasks-per-child", type=int)
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or args.output.rstrip("/\\") + CHECKPOINT_SUFFIX
+    stats = ingest(find_pdfs(args.directory), make_sink(args.sink, args.output), checkpoint_path,
+                   workers=args.workers, quality_threshold=args.quality_threshold,
+                   checkpoint_every=args.checkpoint_every, max_tasks_per_child=args.max_tasks_per_child)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
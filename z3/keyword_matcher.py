@@ -0,0 +1,135 @@
+"""
+Aho–Corasick multi-pattern matching.
+
+``build_matcher`` compiles a list of patterns into an automaton once; ``find_matches``
+then reports every occurrence of every pattern in a single left-to-right pass,
+so the cost of a search does not grow with the number of patterns.
+
+Patterns are sequences: a plain string is matched character by character
+(substring search), a tuple of tokens is matched against a token list.
+
+``build_keyword_index`` / ``scan_keywords`` wrap a token-level matcher for
+named keyword groups (negations, quantifiers, relation phrases ...) and return
+every hit of every group from one scan of a sentence.
+"""
+from collections import deque
+
+
+def build_matcher(patterns):
+    """
+    Compile patterns into an Aho–Corasick automaton.
+    :param patterns: Iterable of non-empty strings or token tuples.
+    :return: Matcher dictionary for find_matches.
+    """
+    patterns = list(dict.fromkeys(patterns))
+    goto = [{}]
+    output = [[]]
+    for pattern_id, pattern in enumerate(patterns):
+        if not pattern:
+            raise ValueError("Patterns must be non-empty")
+        state = 0
+        for symbol in pattern:
+            next_state = goto[state].get(symbol)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][symbol] = next_state
+                goto.append({})
+                output.append([])
+            state = next_state
+        output[state].append(pattern_id)
+
+    # Breadth-first pass: failure links, with the outputs of each failure
+    # state merged in so a match never needs to walk the failure chain.
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for symbol, next_state in goto[state].items():
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and symbol not in goto[fallback]:
+                fallback = fail[fallback]
+            target = goto[fallback].get(symbol, 0)
+            fail[next_state] = target if target != next_state else 0
+            output[next_state] = output[next_state] + output[fail[next_state]]
+
+    return {"patterns": patterns, "goto": goto, "fail": fail, "output": output}
+
+
+def find_matches(matcher, sequence):
+    """
+    Find all pattern occurrences in one pass.
+    :param matcher: Result of build_matcher.
+    :param sequence: String (for string patterns) or token list (for token tuples).
+    :return: List of (start, end, pattern) tuples ordered by end position; end is exclusive.
+    """
+    goto, fail, output, patterns = matcher["goto"], matcher["fail"], matcher["output"], matcher["patterns"]
+    matches = []
+    state = 0
+    for position, symbol in enumerate(sequence):
+        while state and symbol not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(symbol, 0)
+        for pattern_id in output[state]:
+            pattern = patterns[pattern_id]
+            matches.append((position + 1 - len(pattern), position + 1, pattern))
+    return matches
+
+
+def matched_patterns(matcher, sequence):
+    """Return the set of patterns occurring anywhere in the sequence."""
+    return {pattern for _, _, pattern in find_matches(matcher, sequence)}
+
+
+def build_keyword_index(groups, tokenize=None):
+    """
+    Compile named keyword groups into a single token-level matcher.
+    :param groups: Dictionary of category name to keywords or phrases ("not", "there is").
+                   A keyword may appear in several categories.
+    :param tokenize: Optional tokenizer; each phrase is also matched in the form it
+                     produces, so "don't" matches both "don't" and "do n't".
+    :return: Keyword index for scan_keywords.
+    """
+    entries = {}
+    for category, phrases in groups.items():
+        for phrase in phrases:
+            forms = {tuple(phrase.split())}
+            if tokenize is not None:
+                forms.add(tuple(tokenize(phrase)))
+            for form in forms:
+                entries.setdefault(form, []).append((category, phrase))
+    return {
+        "categories": tuple(groups),
+        "entries": entries,
+        "matcher": build_matcher(entries),
+    }
+
+
+def scan_keywords(index, tokens):
+    """
+    Find every keyword of every category in one pass over a token list.
+    :param index: Result of build_keyword_index.
+    :param tokens: Token list.
+    :return: Dictionary of category to (start, end, phrase) hits in text order.
+    """
+    hits = {category: [] for category in index["categories"]}
+    entries = index["entries"]
+    for start, end, pattern in find_matches(index["matcher"], tokens):
+        for category, phrase in entries[pattern]:
+            hits[category].append((start, end, phrase))
+    return hits
+
+
+def hit_positions(hits, category, phrase=None):
+    """
+    Token positions of the hits in a category, optionally for one phrase only.
+    The position of a multi-token hit is its last token, so the next token is
+    always position + 1.
+    """
+    return sorted({end - 1 for _, end, hit in hits[category] if phrase is None or hit == phrase})
+
+
+def first_position(hits, category, phrase=None):
+    """Position of the first hit in a category (see hit_positions), or None."""
+    positions = hit_positions(hits, category, phrase)
+    return positions[0] if positions else None
@@ -0,0 +1,167 @@
+"""
+Reusable knowledge bases for proving many conclusions against fixed premises.
+
+A premise set is registered once: its sorts, functions and constants are
+built and every premise is asserted on a retained solver.  Each conclusion is
+then checked incrementally with push / add(Not(conclusion)) / check / pop, so
+the per-query cost is a single incremental check instead of a full rebuild.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import z3
+from z3 import DeclareSort, Not, Solver, sat, unsat
+
+from model_serialization import serialize_model
+from premise_compiler import compile_premises, compile_conclusion
+
+# Oldest knowledge bases are dropped once this many are registered
+MAX_KNOWLEDGE_BASES = 64
+
+PREMISE_FORMATS = ("python", "json", "smt2")
+
+_knowledge_bases = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def _build_python_kb(premises):
+    """Execute legacy Python-statement premises once against a fresh solver."""
+    exec_globals = dict(vars(z3))
+    locals_dict = {
+        'Object': DeclareSort('Object'),
+        's': Solver(),
+    }
+    for premise in premises:
+        try:
+            exec(premise, exec_globals, locals_dict)
+        except Exception as e:
+            raise ValueError(f"Error in premise '{premise}': {str(e)}")
+    # Premises may rebind 's' to their own Solver()
+    return locals_dict['s'], {'globals': exec_globals, 'locals': locals_dict}
+
+
+def register_knowledge_base(premises, premise_format="python"):
+    """
+    Register a premise set and keep its solver for repeated queries.
+    :param premises: Python statements (list), JSON premise document or SMT-LIB2 text.
+    :param premise_format: "python", "json" or "smt2".
+    :return: Identifier of the new knowledge base.
+    """
+    if premise_format not in PREMISE_FORMATS:
+        raise ValueError(f"Unsupported premise format '{premise_format}'")
+
+    if premise_format == "python":
+        solver, scope = _build_python_kb(premises)
+        compiled = None
+        premise_count = len(premises)
+    else:
+        compiled = compile_premises(premises, premise_format)
+        solver = Solver()
+        solver.add(compiled['assertions'])
+        scope = None
+        premise_count = len(compiled['assertions'])
+
+    kb_id = uuid.uuid4().hex
+    kb = {
+        'id': kb_id,
+        'format': premise_format,
+        'solver': solver,
+        'compiled': compiled,
+        'scope': scope,
+        'premise_count': premise_count,
+        'queries': 0,
+        'created': time.time(),
+        'lock': threading.Lock(),
+    }
+
+    with _registry_lock:
+        _knowledge_bases[kb_id] = kb
+        while len(_knowledge_bases) > MAX_KNOWLEDGE_BASES:
+            _knowledge_bases.popitem(last=False)
+
+    return kb_id
+
+
+def _get_kb(kb_id):
+    with _registry_lock:
+        kb = _knowledge_bases.get(kb_id)
+        if kb is None:
+            raise KeyError(f"Unknown knowledge base '{kb_id}'")
+        _knowledge_bases.move_to_end(kb_id)
+        return kb
+
+
+def _conclusion_term(kb, conclusion):
+    if kb['format'] == "python":
+        scope = kb['scope']
+        try:
+            return eval(conclusion, scope['globals'], scope['locals'])
+        except Exception as e:
+            raise ValueError(f"Error in conclusion '{conclusion}': {str(e)}")
+    return compile_conclusion(conclusion, kb['compiled'])
+
+
+def _check_locked(kb, conclusion):
+    """Check one conclusion; the caller must hold the knowledge base lock."""
+    result = {"conclusion": conclusion}
+    try:
+        negated_conclusion = Not(_conclusion_term(kb, conclusion))
+    except (ValueError, z3.Z3Exception) as e:
+        result.update({"proved": False, "status": "error", "error": str(e)})
+        return result
+
+    solver = kb['solver']
+    solver.push()
+    try:
+        solver.add(negated_conclusion)
+        outcome = solver.check()
+        result["proved"] = outcome == unsat
+        result["status"] = str(outcome)
+        if outcome == sat:
+            result["counterexample"] = serialize_model(solver.model())
+    finally:
+        solver.pop()
+        kb['queries'] += 1
+    return result
+
+
+def prove_conclusions(kb_id, conclusions):
+    """
+    Check several conclusions against a registered knowledge base.
+    :param kb_id: Identifier returned by register_knowledge_base.
+    :param conclusions: Conclusions in the knowledge base's premise format.
+    :return: One result dictionary per conclusion, in input order.
+    """
+    kb = _get_kb(kb_id)
+    with kb['lock']:
+        return [_check_locked(kb, conclusion) for conclusion in conclusions]
+
+
+def prove_conclusion(kb_id, conclusion):
+    """Check a single conclusion against a registered knowledge base."""
+    return prove_conclusions(kb_id, [conclusion])[0]
+
+
+def delete_knowledge_base(kb_id):
+    """Forget a knowledge base. Returns True if it existed."""
+    with _registry_lock:
+        return _knowledge_bases.pop(kb_id, None) is not None
+
+
+def knowledge_base_info(kb_id=None):
+    """Describe one knowledge base, or all of them when kb_id is None."""
+    def describe(kb):
+        return {
+            "kb_id": kb['id'],
+            "format": kb['format'],
+            "premise_count": kb['premise_count'],
+            "queries": kb['queries'],
+            "created": kb['created'],
+        }
+
+    if kb_id is not None:
+        return describe(_get_kb(kb_id))
+    with _registry_lock:
+        return [describe(kb) for kb in _knowledge_bases.values()]
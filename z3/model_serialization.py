@@ -0,0 +1,71 @@
+"""
+Shared model serialization for Z3 results.
+
+``serialize_model`` walks ``model.decls()`` exactly once and converts the
+interpretations it needs to strings, so the cost is linear in the number of
+declarations no matter how many variables are requested.
+"""
+from z3 import is_algebraic_value, is_rational_value
+
+NUMBER_FORMATS = ("default", "exact", "decimal")
+
+
+def format_value(value, number_format="default", precision=10):
+    """
+    Convert a model value to a string.
+    :param value: Interpretation returned by model[decl].
+    :param number_format: "default" uses Z3's own printing, "exact" keeps rationals as
+                          fractions (e.g. 1/3) and irrational values as root objects,
+                          "decimal" prints numbers with the given precision (a trailing
+                          '?' marks a truncated value, as Z3 does).
+    :param precision: Number of decimal places used by the decimal format.
+    """
+    if value is None:
+        return None
+    if number_format == "decimal":
+        if is_rational_value(value) or is_algebraic_value(value):
+            return value.as_decimal(precision)
+    elif number_format == "exact" and is_algebraic_value(value):
+        # Irrational algebraic numbers have no exact fraction; keep the root object
+        return value.sexpr()
+    return str(value)
+
+
+def serialize_model(model, names=None, number_format="default", precision=10):
+    """
+    Serialize a model into a {name: value} dictionary.
+    :param model: Z3 model.
+    :param names: Optional iterable of names to keep. When given, the result follows
+                  its order and names without an interpretation map to None.
+    :param number_format: "default", "exact" or "decimal", see format_value.
+    :param precision: Decimal places for the decimal format.
+    :return: Dictionary of name to value string.
+    """
+    if number_format not in NUMBER_FORMATS:
+        raise ValueError(f"Unsupported number format '{number_format}'")
+
+    if names is None:
+        return {
+            decl.name(): format_value(model[decl], number_format, precision)
+            for decl in model.decls()
+        }
+
+    names = list(names)
+    wanted = set(names)
+    values = {}
+    for decl in model.decls():
+        name = decl.name()
+        if name in wanted:
+            values[name] = format_value(model[decl], number_format, precision)
+    return {name: values.get(name) for name in names}
+
+
+def format_assignments(assignments, compact=False):
+    """
+    Render serialized assignments as text.
+    :param assignments: Dictionary returned by serialize_model.
+    :param compact: Use "x=1,y=2" instead of "x = 1, y = 2".
+    """
+    if compact:
+        return ",".join(f"{name}={value}" for name, value in assignments.items())
+    return ", ".join(f"{name} = {value}" for name, value in assignments.items())
@@ -1,4 +1,5 @@
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 
 # MongoDB connection settings - update with your MongoDB connection info
 MONGO_URI = "mongodb://192.168.137.7:27017/"
@@ -67,6 +68,54 @@ def save_relation(source_node, target_node, relation_type, properties=None):
     finally:
         client.close()
 
+def save_relations_bulk(relations):
+    """
+    Save many relations to MongoDB with one insert_many call.
+    
+    Args:
+        relations: List of dictionaries with 'source_node', 'target_node',
+                   'relation_type' and optional 'properties' (as for save_relation)
+        
+    Returns:
+        int: Number of relations inserted
+    """
+    documents = []
+    for relation in relations:
+        relation_doc = {
+            "source": {
+                "label": relation["source_node"]["label"],
+                "props": relation["source_node"]["props"]
+            },
+            "target": {
+                "label": relation["target_node"]["label"],
+                "props": relation["target_node"]["props"]
+            },
+            "relation_type": relation["relation_type"]
+        }
+        if relation.get("properties"):
+            relation_doc["properties"] = relation["properties"]
+        documents.append(relation_doc)
+    if not documents:
+        return 0
+    
+    client = get_mongo_client()
+    if not client:
+        return 0
+    
+    try:
+        collection = client[DB_NAME][COLLECTION_NAME]
+        # Unordered: one bad document does not stop the rest of the batch
+        result = collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        print(f"Some relations were not saved to MongoDB: {e}")
+        return e.details.get("nInserted", 0)
+    except Exception as e:
+        print(f"Error saving relations to MongoDB: {e}")
+        return 0
+    finally:
+        client.close()
+
 def find_relations(query):
     """
     Find relations in MongoDB based on a search query.
@@ -0,0 +1,76 @@
+"""
+Single-pass sentence analysis for the natural-language-to-logic pipeline.
+
+Every stage of ``natural_language_to_logic`` used to tokenize and POS-tag the
+same premise on its own.  ``analyze_sentence`` does the work once and returns
+a dictionary that every stage reads from:
+
+    text    original sentence
+    lower   lowercased sentence
+    tokens  word tokens of the lowercased sentence
+    tagged  (token, POS tag) pairs
+    chunks  named-entity chunk tree from ne_chunk
+    lemmas  one lemma per token (nouns, verbs and adjectives lemmatized)
+    hits    keyword hits per KEYWORD_GROUPS category, from one matcher pass
+
+``AnalysisCache`` holds the analyses for one request so repeated sentences
+(a conclusion that restates a premise, duplicated rules) are analyzed once.
+"""
+from nltk.chunk import ne_chunk
+from nltk.stem import WordNetLemmatizer
+from nltk.tag import pos_tag
+from nltk.tokenize import word_tokenize
+
+from keyword_matcher import scan_keywords
+from nlp_resources import get_nlp_resources
+
+_lemmatizer = WordNetLemmatizer()
+
+
+def _lemma_for(word, tag):
+    if tag.startswith('NN'):
+        return _lemmatizer.lemmatize(word, 'n')
+    if tag.startswith('VB'):
+        return _lemmatizer.lemmatize(word, 'v')
+    if tag.startswith('JJ'):
+        return _lemmatizer.lemmatize(word, 'a')
+    return word
+
+
+def analyze_sentence(text):
+    """
+    Tokenize, tag, chunk and lemmatize a sentence once.
+    :param text: Natural language sentence.
+    :return: Analysis dictionary (see module docstring).
+    """
+    lower = text.lower()
+    tokens = word_tokenize(lower)
+    tagged = pos_tag(tokens)
+    return {
+        "text": text,
+        "lower": lower,
+        "tokens": tokens,
+        "tagged": tagged,
+        "chunks": ne_chunk(tagged),
+        "lemmas": [_lemma_for(word, tag) for word, tag in tagged],
+        "hits": scan_keywords(get_nlp_resources()['keyword_index'], tokens),
+    }
+
+
+class AnalysisCache:
+    """Per-request store of sentence analyses keyed by the sentence text."""
+
+    def __init__(self):
+        self._analyses = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        analysis = self._analyses.get(text)
+        if analysis is None:
+            self.misses += 1
+            analysis = analyze_sentence(text)
+            self._analyses[text] = analysis
+        else:
+            self.hits += 1
+        return analysis
@@ -0,0 +1,98 @@
+"""
+Precompiled NLP resources shared by the natural-language-to-logic pipeline.
+
+The stopword set, the relation chunk grammar and the keyword lists used to
+be rebuilt or rescanned for every premise.  They are built once, on first
+use, into a read-only bundle that every request thread shares:
+
+    stop_words        frozenset of English stopwords
+    quantifiers       frozenset of quantifier words skipped as entities
+    chunk_parser      compiled RegexpParser for relation chunks
+    relation_phrases  tuple of multi-word relation phrases
+    keyword_index     Aho–Corasick keyword index over KEYWORD_GROUPS
+"""
+import threading
+
+from nltk.chunk import RegexpParser
+from nltk.corpus import stopwords
+from nltk.tokenize import word_tokenize
+
+from keyword_matcher import build_keyword_index
+
+RELATION_GRAMMAR = r"""
+    Relation: {<NN.*><VB.*><NN.*>}                 # Noun-Verb-Noun pattern
+             {<NN.*><IN><NN.*>}                    # Noun-Preposition-Noun pattern
+             {<NN.*><JJ.*><NN.*>}                  # Noun-Adjective-Noun pattern
+    """
+
+RELATION_PHRASES = (
+    "greater than", "less than", "equal to", "parent of", "child of",
+    "subset of", "element of", "member of", "belongs to", "contains",
+    "includes", "part of", "related to", "connected to", "linked to",
+)
+
+QUANTIFIERS = frozenset(['all', 'every', 'some', 'any'])
+
+# Keyword groups found by a single scan of each sentence (see analyze_sentence)
+KEYWORD_GROUPS = {
+    "universal": ("all", "every", "any"),
+    "existential": ("some", "exists", "there is", "there are"),
+    "copula": ("is", "are"),
+    "condition": ("if",),
+    "consequence": ("then",),
+    # Clause negation handled by the premise and conclusion converters
+    "negation": ("not", "don't", "doesn't", "isn't", "aren't"),
+    # Further negative words recognised by detect_negation_patterns
+    "negative": ("no", "never", "none", "neither", "nor", "nothing", "nowhere",
+                 "wasn't", "weren't", "didn't", "won't", "wouldn't", "can't",
+                 "cannot", "couldn't"),
+    "neither": ("neither",),
+    "nor": ("nor",),
+    "relation": RELATION_PHRASES,
+}
+
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def _tokenize_keyword(phrase):
+    # Match keywords as the word tokenizer splits them ("don't" -> "do n't")
+    return word_tokenize(phrase, preserve_line=True)
+
+
+def build_nlp_resources(stop_words=None):
+    """
+    Build a fresh resource bundle.
+    :param stop_words: Optional stopword list; defaults to the NLTK English stopwords.
+    :return: Dictionary of shared NLP resources (see module docstring).
+    """
+    if stop_words is None:
+        stop_words = stopwords.words('english')
+    return {
+        "stop_words": frozenset(stop_words),
+        "quantifiers": QUANTIFIERS,
+        "chunk_parser": RegexpParser(RELATION_GRAMMAR),
+        "relation_phrases": RELATION_PHRASES,
+        "keyword_index": build_keyword_index(KEYWORD_GROUPS, _tokenize_keyword),
+    }
+
+
+def get_nlp_resources():
+    """Return the shared resource bundle, building it on first use."""
+    global _resources
+    resources = _resources
+    if resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = build_nlp_resources()
+            resources = _resources
+    return resources
+
+
+def refresh_nlp_resources(stop_words=None):
+    """Rebuild the shared bundle, e.g. after NLTK data has been downloaded."""
+    global _resources
+    resources = build_nlp_resources(stop_words)
+    with _resources_lock:
+        _resources = resources
+    return resources
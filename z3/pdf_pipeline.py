@@ -0,0 +1,215 @@
+"""
+PDF-to-relations pipeline shared by the PDF endpoint, the MCP tool and the
+batch ingester (ingest_pdfs.py):
+
+    read_pdf_pages         page texts from PyPDF2
+    clean_pdf_text         structure stripping (pdf_structure) and PDF text repair
+    extract_pdf_relations  sentence quality gate, extract_relations, triple filter,
+                           entity canonicalization (entity_index)
+    collect_pdf_relations  the same, aggregated into a TripleStore (triple_store)
+"""
+import re
+from itertools import islice
+
+import nltk
+import PyPDF2
+from nltk.corpus import words as _nltk_words_corpus
+from nltk.tokenize import sent_tokenize
+
+import entity_index
+from pdf_structure import strip_document_structure
+from sentence_quality import filter_sentences
+from spacy_relation_extract import extract_relations, flush_relation_store
+from triple_store import TripleStore
+
+# Build an English vocabulary set for PDF word-fragment repair.
+# Loaded once at startup so PDF requests are fast.
+try:
+    nltk.download('words', quiet=True)
+    ENGLISH_VOCAB = set(w.lower() for w in _nltk_words_corpus.words())
+except Exception:
+    ENGLISH_VOCAB = set()
+
+# Compile the reusable suffix+morpheme merge pattern once.
+# Group A: recognised English suffixes (ed, ing, tion …)
+# Group B: Latin/Greek-derived bound morphemes that PyPDF2 frequently splits
+#           (cess, ther, tial, ture, ance, ence, ward, wise, hood, ship …)
+SUFFIX_PATTERN = re.compile(
+    r'(\b\w{3,})\s+'
+    r'(ed|ing|tion|ation|sion|ment|ness|ity|ies|ive'
+    r'|ous|ful|less|able|ible|ize|ise|ized|ised|izing|ising|ers|er'
+    r'|cess|ther|tial|ture|ance|ence|ward|wise|ship|hood'
+    r'|ling|ling|age|ary|ory|ory|ure|ure|al|ance)\b'
+)
+
+# Fragments this short are never parsed
+MIN_SENTENCE_CHARS = 10
+# Triples whose entities are canonicalized together by collect_pdf_relations
+CANONICALIZE_BATCH_SIZE = 4096
+
+
+def repair_word_spaces(text):
+    """
+    Merge adjacent token-pairs where PDF font-encoding inserted a spurious
+    space inside a word.  Strategy: if left+right concatenation is a valid
+    English word AND at least one side alone is NOT a valid English word,
+    collapse the space.  Only operates on short, all-alpha tokens.
+    """
+    def _try_merge(m):
+        left, right = m.group(1).lower(), m.group(2).lower()
+        merged = left + right
+        # Merge if the joined form is a valid English word AND long enough that
+        # it's unlikely to be two intentional separate words.
+        # Min length 5 guards against short false-positives like 'in to' → 'into'
+        # while still catching 'pro cess' (7), 'fur ther' (7), 'Clas s' (5), etc.
+        if merged in ENGLISH_VOCAB and len(merged) >= 5:
+            return m.group(1) + m.group(2)  # preserve original casing
+        return m.group(0)  # leave unchanged
+
+    # Allow single-char right fragments ('Clas s' → 'Class', 'sys tem' → 'system')
+    return re.sub(r'\b([a-zA-Z]{2,6}) ([a-zA-Z]{1,7})\b', _try_merge, text)
+
+
+def read_pdf_pages(stream, name):
+    """
+    Extract the text of every page of a PDF.
+    :param stream: Binary file object or path of the PDF.
+    :param name: File name used in warnings.
+    :return: List of non-empty page texts.
+    """
+    pdf_reader = PyPDF2.PdfReader(stream)
+    pages = []
+    for page in pdf_reader.pages:
+        try:
+            page_text = page.extract_text()
+            if page_text:
+                pages.append(page_text)
+        except Exception as e:
+            print(f"Warning: Could not extract text from a page in {name}: {e}")
+    return pages
+
+
+def clean_pdf_text(pages):
+    """
+    Turn PDF page texts into clean running text.
+    :param pages: List of page texts.
+    :return: (text, removed_chars) where removed_chars is the strip_document_structure report.
+    """
+    # Drop running headers/footers, the references section and tables before any parsing
+    text, removed_chars = strip_document_structure(pages)
+
+    # 0. Strip inline citation references like [2], [19], [64] from raw text
+    text = re.sub(r'\[\d+\]', ' ', text)
+    # 1. Rejoin words broken by a hyphen + newline  "environ-\nment" → "environment"
+    text = re.sub(r'-\n', '', text)
+    # 2. Rejoin words broken by a hyphen + space   "nec- essary" → "necessary"
+    text = re.sub(r'(\w)-\s+(\w)', r'\1\2', text)
+    # 3. Replace remaining newlines with spaces
+    text = text.replace('\n', ' ')
+    # 4. Rejoin word fragments split by PDF font-encoding artefacts
+    #    Pass A: suffix-only patterns (fast regex, covers ~80 % of cases)
+    text = SUFFIX_PATTERN.sub(r'\1\2', text)
+    #    Pass B: dictionary-backed merge for arbitrary mid-word spaces
+    #    e.g. "fur ther" → "further", "pro cess" → "process", "th e" → "the"
+    if ENGLISH_VOCAB:
+        text = repair_word_spaces(text)
+    # 5. Insert a missing space when a word is fused to the next via a period
+    #    e.g. "mitigation.science" → "mitigation. science"
+    text = re.sub(r'([a-z]{3,})\.([a-zA-Z]{3,})', r'\1. \2', text)
+    # 6. Collapse multiple whitespace characters into a single space
+    text = re.sub(r' {2,}', ' ', text).strip()
+    return text, removed_chars
+
+
+def split_pdf_sentences(text):
+    """Split clean PDF text into sentences using NLTK."""
+    return sent_tokenize(text)
+
+
+def is_meaningful(token):
+    """Return True if a token is a meaningful word (not punctuation, not 1-2 chars)."""
+    token = token.strip()
+    if len(token) <= 2:
+        return False
+    # Reject tokens that are only punctuation/symbols/digits
+    if re.match(r'^[^a-zA-Z]+$', token):
+        return False
+    # Reject phrases that don't start with a letter (PDF number/bracket artifacts)
+    if not token[0].isalpha():
+        return False
+    # Reject unrealistically long noun phrases (> 6 words = noise)
+    if len(token.split()) > 6:
+        return False
+    # Reject multi-word phrases where any component word is ≤ 2 chars
+    # (indicates a spurious space inserted mid-word by the PDF extractor,
+    # e.g. 'th e', 'a p').
+    words_in_phrase = token.split()
+    if len(words_in_phrase) > 1 and any(len(w) <= 2 for w in words_in_phrase):
+        return False
+    return True
+
+
+def _pdf_triples(sentences, quality_threshold, timings):
+    """Yield (sentence, subject, relation, object) for the filtered relations, and the quality report."""
+    # Skip very short fragments, then sentences too garbled to yield triples
+    candidates = [sentence for sentence in sentences if len(sentence.strip()) > MIN_SENTENCE_CHARS]
+    candidates, sentence_quality = filter_sentences(candidates, ENGLISH_VOCAB or None, quality_threshold)
+
+    def triples():
+        for sentence in candidates:
+            for subj, rel, obj in extract_relations(sentence, timings):
+                # Filter out garbage relations with meaningless tokens
+                if is_meaningful(subj) and is_meaningful(rel) and is_meaningful(obj):
+                    yield sentence, subj, rel, obj
+        # Commit the document's new cache rows in one transaction
+        flush_relation_store()
+
+    return triples(), sentence_quality
+
+
+def extract_pdf_relations(sentences, quality_threshold=None, timings=None):
+    """
+    Extract filtered relations from PDF sentences.
+    :param sentences: Sentences of the document.
+    :param quality_threshold: Optional sentence quality threshold (see sentence_quality).
+    :param timings: Optional dictionary collecting milliseconds per pipeline component.
+    :return: (relations, sentence_quality): relation dictionaries with their
+             source_sentence, and the sentence quality report.
+    """
+    triples, sentence_quality = _pdf_triples(sentences, quality_threshold, timings)
+    all_relations = [{
+        "subject": subj,
+        "relation": rel,
+        "object": obj,
+        "source_sentence": sentence
+    } for sentence, subj, rel, obj in triples]
+    if entity_index.CANONICALIZE_ENTITIES:
+        # Map "the Sun" / "suns" to one entity, adding subject_id and object_id
+        entity_index.canonicalize_relations(all_relations)
+    return all_relations, sentence_quality
+
+
+def collect_pdf_relations(sentences, store=None, quality_threshold=None, timings=None):
+    """
+    Extract filtered relations from PDF sentences into a TripleStore, without
+    building a dictionary per relation.
+    :param sentences: Sentences of the document.
+    :param store: TripleStore to add to (e.g. shared across documents); a new one by default.
+    :param quality_threshold: Optional sentence quality threshold (see sentence_quality).
+    :param timings: Optional dictionary collecting milliseconds per pipeline component.
+    :return: (store, sentence_quality).
+    """
+    if store is None:
+        store = TripleStore()
+    triples, sentence_quality = _pdf_triples(sentences, quality_threshold, timings)
+    if not entity_index.CANONICALIZE_ENTITIES:
+        for sentence, subj, rel, obj in triples:
+            store.add(subj, rel, obj, sentence)
+        return store, sentence_quality
+    while True:
+        batch = list(islice(triples, CANONICALIZE_BATCH_SIZE))
+        if not batch:
+            return store, sentence_quality
+        entities = entity_index.canonicalize_entities(term for _, subj, _, obj in batch for term in (subj, obj))
+        for (sentence, _, rel, _), (_, subj), (_, obj) in zip(batch, entities[0::2], entities[1::2]):
+            store.add(subj, rel, obj, sentence)
@@ -0,0 +1,128 @@
+"""
+Document-structure cleanup of extracted PDF pages before sentence splitting.
+
+Three kinds of lines never yield useful relations and are dropped before any
+NLP work is done on them:
+
+    header_footer  lines repeated on many pages (running titles, disclaimers,
+                   "Page 3 of 12") and bare page numbers
+    references     the references / bibliography section up to an appendix
+    tables         runs of lines that are mostly numbers
+
+Short lines are also compared with their digits masked, so a footer whose
+page number changes still counts as the same line on every page.  Every removed line is
+counted under the first kind that matches, in the order above.
+"""
+import re
+from collections import Counter
+
+# A line repeated on at least this fraction of pages (and on two or more) is a header or footer
+REPEATED_LINE_PAGE_RATIO = 0.5
+# Longer lines are body text even when repeated
+REPEATED_LINE_MAX_CHARS = 200
+# Lines of at most this many words also match when only their numbers differ
+NUMBERED_LINE_MAX_WORDS = 6
+# The references heading must start in the later part of the document (not a table of contents)
+REFERENCES_MIN_POSITION = 0.3
+# Minimum numeric tokens and consecutive lines for a table block
+TABLE_MIN_TOKENS = 3
+TABLE_NUMERIC_RATIO = 0.5
+TABLE_MIN_ROWS = 2
+
+_DIGITS = re.compile(r"\d+")
+_PAGE_NUMBER = re.compile(r"^(page\s*)?(\d+|[ivx]{1,5})(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+_REFERENCES_HEADING = re.compile(
+    r"^(\d+(\.\d+)*\.?\s*|[ivx]+\.\s*)?(references|bibliography|works cited|literature cited|reference list)\s*:?$",
+    re.IGNORECASE,
+)
+_APPENDIX_HEADING = re.compile(r"^(appendix|appendices|supplementary (material|information))\b", re.IGNORECASE)
+_NUMERIC_TOKEN = re.compile(r"^[(\[]?[-+±]?[$€£]?\d[\d.,:/%]*[)\]%*]?$")
+
+
+def _line_key(line):
+    words = line.lower().split()
+    key = " ".join(words)
+    return _DIGITS.sub("#", key) if len(words) <= NUMBERED_LINE_MAX_WORDS else key
+
+
+def _repeated_lines(pages):
+    page_counts = Counter()
+    for lines in pages:
+        page_counts.update({_line_key(line) for line in lines if line.strip()})
+    threshold = max(2, REPEATED_LINE_PAGE_RATIO * len(pages))
+    return {key for key, count in page_counts.items()
+            if count >= threshold and len(key) <= REPEATED_LINE_MAX_CHARS}
+
+
+def _is_table_row(line):
+    tokens = line.split()
+    numeric = sum(1 for token in tokens if _NUMERIC_TOKEN.match(token))
+    return numeric >= TABLE_MIN_TOKENS and numeric >= TABLE_NUMERIC_RATIO * len(tokens)
+
+
+def _references_span(lines):
+    """(start, end) line indices of the references section, or None."""
+    start = None
+    for i in range(len(lines) - 1, int(REFERENCES_MIN_POSITION * len(lines)) - 1, -1):
+        if _REFERENCES_HEADING.match(lines[i].strip()):
+            start = i
+            break
+    if start is None:
+        return None
+    end = len(lines)
+    for i in range(start + 1, len(lines)):
+        if _APPENDIX_HEADING.match(lines[i].strip()):
+            end = i
+            break
+    return start, end
+
+
+def strip_document_structure(pages):
+    """
+    Remove headers/footers, the references section and numeric tables from PDF pages.
+    :param pages: List of page texts as returned by the PDF reader.
+    :return: (text, report): the remaining text with a newline after every page,
+             and a dictionary with the number of characters removed per kind.
+    """
+    page_lines = [page.split("\n") for page in pages]
+    repeated = _repeated_lines(page_lines) if len(page_lines) > 1 else set()
+
+    # One flat list of lines so sections and tables may cross page boundaries
+    lines = [line for page in page_lines for line in page]
+    labels = [None] * len(lines)
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped and (_line_key(stripped) in repeated or _PAGE_NUMBER.match(stripped)):
+            labels[i] = "header_footer"
+
+    span = _references_span(lines)
+    if span is not None:
+        for i in range(*span):
+            labels[i] = labels[i] or "references"
+
+    i = 0
+    while i < len(lines):
+        end = i
+        while end < len(lines) and labels[end] is None and _is_table_row(lines[end]):
+            end += 1
+        if end - i >= TABLE_MIN_ROWS:
+            labels[i:end] = ["tables"] * (end - i)
+        i = max(end, i + 1)
+
+    report = {"header_footer": 0, "references": 0, "tables": 0}
+    kept_pages = []
+    position = 0
+    for page in page_lines:
+        kept = []
+        for line in page:
+            label = labels[position]
+            if label is None:
+                kept.append(line)
+            else:
+                report[label] += len(line) + 1
+            position += 1
+        kept_pages.append("\n".join(kept))
+
+    report["removed"] = report["header_footer"] + report["references"] + report["tables"]
+    report["input"] = sum(len(page) + 1 for page in pages)
+    return "".join(page + "\n" for page in kept_pages), report
@@ -0,0 +1,351 @@
+"""
+Declarative premise compiler for the theorem prover.
+
+Instead of exec'ing Python snippets such as ``"Human = Function(...)"`` and
+``"s.add(...)"``, premises can be described as a JSON document that is
+compiled straight into Z3 terms:
+
+    {
+        "sorts": ["Object"],
+        "functions": [
+            {"name": "Human", "domain": ["Object"], "range": "Bool"},
+            {"name": "Mortal", "domain": ["Object"], "range": "Bool"}
+        ],
+        "constants": [
+            {"name": "socrates", "sort": "Object"},
+            {"name": "x", "sort": "Object"}
+        ],
+        "assertions": [
+            ["ForAll", ["x"], ["Implies", ["Human", "x"], ["Mortal", "x"]]],
+            ["Human", "socrates"]
+        ]
+    }
+
+Terms are nested lists ``[operator, arg1, arg2, ...]``.  Strings name
+constants or bound variables, JSON numbers and booleans become literals.
+Quantifiers take a list of variables, either names of declared constants or
+``[name, sort]`` pairs that are bound only inside the quantifier body.
+
+SMT-LIB2 text is accepted as an alternative and parsed with
+``parse_smt2_string``.  Compiled premise sets are kept in a bounded LRU cache
+so the same premise library is only compiled once.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from z3 import (
+    And, BoolSort, BoolVal, Const, DeclareSort, Distinct, Exists, ForAll,
+    Function, If, Implies, IntSort, IntVal, Not, Or, RealSort, RealVal,
+    Xor, Z3Exception, Z3_OP_UNINTERPRETED, Z3_UNINTERPRETED_SORT, is_app,
+    is_quantifier, is_var, parse_smt2_string,
+)
+
+# Maximum number of compiled premise sets kept in memory
+COMPILED_CACHE_SIZE = 256
+
+BUILTIN_SORTS = {
+    "Bool": BoolSort,
+    "Int": IntSort,
+    "Real": RealSort,
+}
+
+_NARY_OPERATORS = {
+    "And": lambda args: And(*args),
+    "Or": lambda args: Or(*args),
+    "Distinct": lambda args: Distinct(*args),
+    "+": lambda args: _fold(args, lambda a, b: a + b),
+    "*": lambda args: _fold(args, lambda a, b: a * b),
+}
+
+_FIXED_OPERATORS = {
+    "Not": (1, lambda a: Not(a)),
+    "Implies": (2, lambda a, b: Implies(a, b)),
+    "Xor": (2, lambda a, b: Xor(a, b)),
+    "If": (3, lambda c, a, b: If(c, a, b)),
+    "==": (2, lambda a, b: a == b),
+    "!=": (2, lambda a, b: a != b),
+    "<": (2, lambda a, b: a < b),
+    "<=": (2, lambda a, b: a <= b),
+    ">": (2, lambda a, b: a > b),
+    ">=": (2, lambda a, b: a >= b),
+    "/": (2, lambda a, b: a / b),
+}
+
+_QUANTIFIERS = {
+    "ForAll": ForAll,
+    "Exists": Exists,
+}
+
+_compiled_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _fold(args, combine):
+    result = args[0]
+    for arg in args[1:]:
+        result = combine(result, arg)
+    return result
+
+
+def _new_compiled(source_format):
+    """Return an empty compiled premise set."""
+    return {
+        "format": source_format,
+        "sorts": {"Object": DeclareSort("Object")},
+        "functions": {},
+        "constants": {},
+        "assertions": [],
+    }
+
+
+def _resolve_sort(name, sorts):
+    if name in BUILTIN_SORTS:
+        return BUILTIN_SORTS[name]()
+    if name in sorts:
+        return sorts[name]
+    raise ValueError(f"Unknown sort '{name}'")
+
+
+def compile_term(term, compiled, bound=None):
+    """
+    Compile a JSON term into a Z3 expression.
+    :param term: Nested list / string / number describing the term.
+    :param compiled: Compiled premise set providing the symbol table.
+    :param bound: Optional mapping of quantifier-bound variable names.
+    :return: Z3 expression.
+    """
+    bound = bound or {}
+
+    if isinstance(term, bool):
+        return BoolVal(term)
+    if isinstance(term, int):
+        return IntVal(term)
+    if isinstance(term, float):
+        return RealVal(term)
+    if isinstance(term, str):
+        if term in bound:
+            return bound[term]
+        if term in compiled["constants"]:
+            return compiled["constants"][term]
+        if term in compiled["functions"] and compiled["functions"][term].arity() == 0:
+            return compiled["functions"][term]()
+        raise ValueError(f"Unknown symbol '{term}'")
+    if not isinstance(term, list) or not term:
+        raise ValueError(f"Invalid term: {term!r}")
+
+    operator, raw_args = term[0], term[1:]
+    if not isinstance(operator, str):
+        raise ValueError(f"Operator must be a string, got {operator!r}")
+
+    if operator in _QUANTIFIERS:
+        if len(raw_args) != 2:
+            raise ValueError(f"{operator} expects a variable list and a body")
+        variables, body = raw_args
+        scope = dict(bound)
+        quantified = []
+        for variable in variables:
+            if isinstance(variable, list):
+                var_name, sort_name = variable
+                scope[var_name] = Const(var_name, _resolve_sort(sort_name, compiled["sorts"]))
+                quantified.append(scope[var_name])
+            else:
+                quantified.append(compile_term(variable, compiled, scope))
+        return _QUANTIFIERS[operator](quantified, compile_term(body, compiled, scope))
+
+    args = [compile_term(arg, compiled, bound) for arg in raw_args]
+
+    if operator in _NARY_OPERATORS:
+        if not args:
+            raise ValueError(f"{operator} expects at least one argument")
+        return _NARY_OPERATORS[operator](args)
+    if operator == "-":
+        if len(args) == 1:
+            return -args[0]
+        return _fold(args, lambda a, b: a - b)
+    if operator in _FIXED_OPERATORS:
+        arity, build = _FIXED_OPERATORS[operator]
+        if len(args) != arity:
+            raise ValueError(f"{operator} expects {arity} argument(s), got {len(args)}")
+        return build(*args)
+    if operator in compiled["functions"]:
+        function = compiled["functions"][operator]
+        if len(args) != function.arity():
+            raise ValueError(
+                f"Function '{operator}' expects {function.arity()} argument(s), got {len(args)}"
+            )
+        return function(*args)
+
+    raise ValueError(f"Unknown operator or function '{operator}'")
+
+
+def _compile_json(spec):
+    if not isinstance(spec, dict):
+        raise ValueError("Structured premises must be a JSON object")
+
+    compiled = _new_compiled("json")
+    sorts = compiled["sorts"]
+
+    for sort_name in spec.get("sorts", []):
+        if sort_name in BUILTIN_SORTS:
+            continue
+        if sort_name not in sorts:
+            sorts[sort_name] = DeclareSort(sort_name)
+
+    for declaration in spec.get("functions", []):
+        name = declaration["name"]
+        domain = [_resolve_sort(sort_name, sorts) for sort_name in declaration.get("domain", [])]
+        range_sort = _resolve_sort(declaration.get("range", "Bool"), sorts)
+        compiled["functions"][name] = Function(name, *domain, range_sort)
+
+    for declaration in spec.get("constants", []):
+        name = declaration["name"]
+        compiled["constants"][name] = Const(name, _resolve_sort(declaration.get("sort", "Object"), sorts))
+
+    for assertion in spec.get("assertions", []):
+        compiled["assertions"].append(compile_term(assertion, compiled))
+
+    return compiled
+
+
+def _collect_smt2_symbols(compiled):
+    """Walk the parsed assertions once and record every uninterpreted symbol."""
+    seen = set()
+    stack = list(compiled["assertions"])
+
+    def register_sort(sort):
+        if sort.kind() == Z3_UNINTERPRETED_SORT:
+            compiled["sorts"].setdefault(sort.name(), sort)
+
+    while stack:
+        expr = stack.pop()
+        expr_id = expr.get_id()
+        if expr_id in seen:
+            continue
+        seen.add(expr_id)
+
+        if is_quantifier(expr):
+            for index in range(expr.num_vars()):
+                register_sort(expr.var_sort(index))
+            stack.append(expr.body())
+        elif is_app(expr):
+            decl = expr.decl()
+            if decl.kind() == Z3_OP_UNINTERPRETED:
+                if decl.arity() == 0:
+                    compiled["constants"][decl.name()] = expr
+                else:
+                    compiled["functions"][decl.name()] = decl
+                for index in range(decl.arity()):
+                    register_sort(decl.domain(index))
+                register_sort(decl.range())
+            stack.extend(expr.children())
+        elif not is_var(expr):
+            register_sort(expr.sort())
+
+
+def _compile_smt2(text):
+    if not isinstance(text, str):
+        raise ValueError("SMT-LIB2 premises must be a string")
+
+    compiled = _new_compiled("smt2")
+    try:
+        compiled["assertions"] = list(parse_smt2_string(text))
+    except Z3Exception as e:
+        raise ValueError(f"Invalid SMT-LIB2 premises: {e}")
+    compiled["source"] = text
+    _collect_smt2_symbols(compiled)
+    return compiled
+
+
+def _cache_key(premises, premise_format):
+    if premise_format == "json":
+        canonical = json.dumps(premises, sort_keys=True, separators=(",", ":"))
+    else:
+        canonical = premises
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{premise_format}:{digest}"
+
+
+def compile_premises(premises, premise_format="json"):
+    """
+    Compile a premise set, reusing a cached compilation when available.
+    :param premises: JSON premise document (dict) or SMT-LIB2 text.
+    :param premise_format: "json" or "smt2".
+    :return: Compiled premise set with sorts, functions, constants and assertions.
+    """
+    if premise_format not in ("json", "smt2"):
+        raise ValueError(f"Unsupported premise format '{premise_format}'")
+    # Checked before hashing, which would fail with AttributeError/TypeError instead
+    if premise_format == "smt2" and not isinstance(premises, str):
+        raise ValueError("SMT-LIB2 premises must be a string")
+    if premise_format == "json" and not isinstance(premises, dict):
+        raise ValueError("Structured premises must be a JSON object")
+
+    key = _cache_key(premises, premise_format)
+    with _cache_lock:
+        compiled = _compiled_cache.get(key)
+        if compiled is not None:
+            _compiled_cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return compiled
+        _cache_stats["misses"] += 1
+
+    if premise_format == "json":
+        compiled = _compile_json(premises)
+    else:
+        compiled = _compile_smt2(premises)
+    compiled["key"] = key
+
+    with _cache_lock:
+        _compiled_cache[key] = compiled
+        _compiled_cache.move_to_end(key)
+        while len(_compiled_cache) > COMPILED_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+
+    return compiled
+
+
+def compile_conclusion(conclusion, compiled):
+    """
+    Compile a conclusion against an already compiled premise set.
+    :param conclusion: JSON term (json format) or SMT-LIB2 term text (smt2 format).
+    :param compiled: Result of compile_premises.
+    :return: Z3 boolean expression.
+    """
+    if compiled["format"] == "json":
+        return compile_term(conclusion, compiled)
+
+    if not isinstance(conclusion, str):
+        raise ValueError("SMT-LIB2 conclusion must be a string")
+
+    decls = {**compiled["functions"], **compiled["constants"]}
+    try:
+        return parse_smt2_string(f"(assert {conclusion})", sorts=compiled["sorts"], decls=decls)[0]
+    except Z3Exception:
+        # The conclusion may use a symbol that was declared but never asserted
+        # on, so it is missing from the collected table; parse with the source.
+        try:
+            return parse_smt2_string(f"{compiled['source']}\n(assert {conclusion})")[-1]
+        except Z3Exception as e:
+            raise ValueError(f"Invalid SMT-LIB2 conclusion: {e}")
+
+
+def compiled_cache_info():
+    """Return hit/miss counters and the current size of the compiled-premise cache."""
+    with _cache_lock:
+        return {
+            "hits": _cache_stats["hits"],
+            "misses": _cache_stats["misses"],
+            "size": len(_compiled_cache),
+            "max_size": COMPILED_CACHE_SIZE,
+        }
+
+
+def clear_compiled_cache():
+    """Drop all cached premise compilations."""
+    with _cache_lock:
+        _compiled_cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
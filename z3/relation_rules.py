@@ -0,0 +1,104 @@
+"""
+Dependency relation rules for the spaCy extractor.
+
+``extract_doc_relations`` walks a parsed document once per rule family:
+
+    subject-verb-object   first nsubj/nsubjpass and first dobj/pobj/attr child of a verb
+    copula                "is a human": the article is dropped from the attribute
+    preposition           noun -> prep -> pobj
+
+Subjects and objects are read as noun phrases (the noun with its adjacent
+compound/amod/det modifiers).  Extraction is dominated by singularizing those
+phrases, so callers pass a memoized ``singularize`` (see
+``spacy_relation_extract.singular_phrase``).
+"""
+import json
+import os
+
+from spacy.tokens import Doc
+
+# Parsed sentences with the triples the extractor must produce for them
+GOLDEN_CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "relation_golden_corpus.json")
+
+ARTICLES = ("a", "an", "the")
+_ARTICLE_PREFIXES = tuple(f"{article} " for article in ARTICLES)
+SUBJECT_DEPS = ("nsubj", "nsubjpass")
+OBJECT_DEPS = ("dobj", "pobj", "attr")
+NOUN_POS = ("NOUN", "PROPN")
+
+# Modifiers included in a noun phrase before / after its head noun
+PHRASE_LEFT_DEPS = ("compound", "amod", "det")
+PHRASE_RIGHT_DEPS = ("compound", "amod")
+
+
+def get_span_for_token(token, doc):
+    """Get the full noun phrase span for a token (the token alone if it is not a noun)."""
+    if token.pos_ not in NOUN_POS:
+        return doc[token.i:token.i + 1]
+    start = token.i
+    while start > 0 and doc[start - 1].dep_ in PHRASE_LEFT_DEPS and doc[start - 1].head == token:
+        start -= 1
+    end = token.i + 1
+    while end < len(doc) and doc[end].dep_ in PHRASE_RIGHT_DEPS and doc[end].head == token:
+        end += 1
+    return doc[start:end]
+
+
+def _strip_articles(phrase):
+    return phrase.replace("a ", "").replace("an ", "").replace("the ", "").strip()
+
+
+def extract_doc_relations(doc, singularize):
+    """
+    Extract (subject, relation, object) triples from one parsed document.
+    :param doc: Parsed spaCy Doc.
+    :param singularize: Function mapping a phrase to its singular form.
+    :return: List of triples: verb relations in token order, then preposition relations.
+    """
+    relations = []
+    for token in doc:
+        if token.pos_ != "VERB" and token.lemma_ != "be":
+            continue
+        # Children are visited in token order, so the first subject / object wins
+        subj = obj = None
+        attrs = []
+        for child in token.children:
+            if subj is None and child.dep_ in SUBJECT_DEPS:
+                subj = singularize(get_span_for_token(child, doc).text.lower())
+            elif child.dep_ in OBJECT_DEPS:
+                if obj is None:
+                    obj = singularize(get_span_for_token(child, doc).text.lower())
+                if child.dep_ == "attr":
+                    attrs.append(child)
+        if token.lemma_ == "be" and obj:
+            # "Socrates is a human": drop the article from the attribute
+            for attr in attrs:
+                has_article = any(grandchild.dep_ == "det" and grandchild.lower_ in ARTICLES
+                                  for grandchild in attr.children)
+                if has_article or obj.startswith(_ARTICLE_PREFIXES):
+                    obj = _strip_articles(obj)
+        if subj and obj:
+            relations.append((subj, token.lemma_.lower(), obj))
+
+    for token in doc:
+        if token.dep_ == "pobj" and token.head.dep_ == "prep":
+            head_noun = token.head.head
+            if head_noun.pos_ in NOUN_POS:
+                relations.append((singularize(head_noun.lower_), token.head.lower_, singularize(token.lower_)))
+    return relations
+
+
+def load_golden_docs(vocab, path=GOLDEN_CORPUS_PATH):
+    """
+    Build Docs from the golden corpus annotations (words, pos, deps, heads, lemmas).
+    :param vocab: Vocab to create the documents in.
+    :param path: Corpus file.
+    :return: List of Docs; expected triples are in each entry's "relations".
+    """
+    with open(path, encoding="utf-8") as handle:
+        corpus = json.load(handle)
+    return [
+        Doc(vocab, words=entry["words"], pos=entry["pos"], deps=entry["deps"],
+            heads=entry["heads"], lemmas=entry["lemmas"])
+        for entry in corpus["sentences"]
+    ]
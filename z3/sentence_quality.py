@@ -0,0 +1,151 @@
+"""
+Cheap quality scores for PDF sentences, computed before relation extraction.
+
+Garbled OCR lines, stray table cells and hyphenation debris never yield
+triples that pass the relation filters, but they still cost a full parse.
+``score_sentences`` scores a whole batch at once from four metrics:
+
+    alpha_ratio       letters / non-space characters
+    tokens            whitespace-separated tokens
+    avg_word_length   mean length of alphabetic words
+    dictionary_ratio  share of alphabetic words found in the vocabulary
+
+The sentences are joined into one array of code points; character-class masks
+are summed per sentence with ``np.add.reduceat`` and words are mapped to their
+sentence with ``np.searchsorted``.  Character classes and vocabulary
+membership are looked up once per distinct character and word.
+
+Each metric is mapped to a 0..1 score and the sentence score is their weighted
+geometric mean, so a sentence has to look reasonable on every metric: a line
+of single letters scores low even though it is all alphabetic.
+"""
+import os
+import re
+
+import numpy as np
+
+# Sentences scoring below this are not parsed
+SENTENCE_QUALITY_THRESHOLD = float(os.environ.get("Z3_SENTENCE_QUALITY_THRESHOLD", "0.5"))
+
+# Weights of the metric scores; dictionary_ratio is left out when there is no vocabulary
+QUALITY_WEIGHTS = {
+    "alpha_ratio": 0.25,
+    "dictionary_ratio": 0.35,
+    "avg_word_length": 0.25,
+    "tokens": 0.15,
+}
+# Component scores are clipped to this before taking logarithms
+_MIN_COMPONENT_SCORE = 1e-6
+# Piecewise-linear scores: (metric values, scores) for np.interp
+AVG_WORD_LENGTH_SCORE = ((1.0, 3.0, 12.0, 20.0), (0.0, 1.0, 1.0, 0.0))
+TOKEN_COUNT_SCORE = ((1.0, 3.0, 80.0, 200.0), (0.0, 1.0, 1.0, 0.0))
+# Technical prose has many words outside the vocabulary; 40% hits already score fully
+DICTIONARY_RATIO_SCORE = ((0.0, 0.4), (0.05, 1.0))
+# Inflections tried when a word is not in the vocabulary itself (word lists hold base forms)
+_SUFFIXES = ("s", "es", "ed", "d", "ing", "ly")
+
+_WORD = re.compile(r"[^\W\d_]+")
+METRICS = ("alpha_ratio", "tokens", "avg_word_length", "dictionary_ratio")
+
+
+def _in_vocabulary(word, vocabulary):
+    if word in vocabulary:
+        return True
+    return any(word.endswith(suffix) and word[:-len(suffix)] in vocabulary for suffix in _SUFFIXES)
+
+
+def _per_sentence_sums(mask, offsets):
+    if not len(offsets):
+        return np.zeros(0)
+    return np.add.reduceat(mask.astype(np.int64), offsets)
+
+
+def score_sentences(sentences, vocabulary=None):
+    """
+    Score a batch of sentences.
+    :param sentences: List of sentence strings.
+    :param vocabulary: Optional set of lowercase words for dictionary_ratio.
+    :return: Dictionary of NumPy arrays, one value per sentence, for each metric and "score".
+    """
+    count = len(sentences)
+    if count == 0:
+        return {name: np.zeros(0) for name in (*METRICS, "score")}
+
+    # Sentences are separated by a newline, which also ends the last token of each
+    joined = "\n".join(sentences) + "\n"
+    lengths = np.fromiter((len(sentence) + 1 for sentence in sentences), dtype=np.int64, count=count)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    # Character classes are looked up once per distinct code point; "alpha"
+    # means a word character of _WORD so alpha runs are exactly its matches
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    present = np.flatnonzero(np.bincount(codes))
+    alpha_table = np.zeros(present[-1] + 1, dtype=bool)
+    space_table = np.zeros(present[-1] + 1, dtype=bool)
+    alpha_table[present] = [_WORD.fullmatch(chr(code)) is not None for code in present.tolist()]
+    space_table[present] = [chr(code).isspace() for code in present.tolist()]
+    alpha = alpha_table[codes]
+    nonspace = ~space_table[codes]
+    token_starts = nonspace & np.concatenate(([True], ~nonspace[:-1]))
+    word_starts = alpha & np.concatenate(([True], ~alpha[:-1]))
+
+    alpha_count = _per_sentence_sums(alpha, offsets)
+    nonspace_count = _per_sentence_sums(nonspace, offsets)
+    tokens = _per_sentence_sums(token_starts, offsets)
+    word_count = _per_sentence_sums(word_starts, offsets)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics = {
+            "alpha_ratio": np.where(nonspace_count > 0, alpha_count / np.maximum(nonspace_count, 1), 0.0),
+            "tokens": tokens.astype(np.float64),
+            "avg_word_length": np.where(word_count > 0, alpha_count / np.maximum(word_count, 1), 0.0),
+        }
+
+    weights = dict(QUALITY_WEIGHTS)
+    if vocabulary:
+        # Words in order, each mapped to the sentence it starts in
+        words = _WORD.findall(joined)
+        owners = np.searchsorted(offsets, np.flatnonzero(word_starts), side="right") - 1
+        known = {word: _in_vocabulary(word.lower(), vocabulary) for word in set(words)}
+        hits = np.bincount(owners, weights=np.fromiter(map(known.__getitem__, words), dtype=bool,
+                                                       count=len(words)), minlength=count)
+        metrics["dictionary_ratio"] = np.where(word_count > 0, hits / np.maximum(word_count, 1), 0.0)
+    else:
+        metrics["dictionary_ratio"] = np.full(count, np.nan)
+        weights.pop("dictionary_ratio")
+
+    component_scores = {
+        "alpha_ratio": metrics["alpha_ratio"],
+        "dictionary_ratio": np.interp(metrics["dictionary_ratio"], *DICTIONARY_RATIO_SCORE),
+        "avg_word_length": np.interp(metrics["avg_word_length"], *AVG_WORD_LENGTH_SCORE),
+        "tokens": np.interp(metrics["tokens"], *TOKEN_COUNT_SCORE),
+    }
+    total = sum(weights.values())
+    log_score = sum(weight * np.log(np.maximum(component_scores[name], _MIN_COMPONENT_SCORE))
+                    for name, weight in weights.items())
+    metrics["score"] = np.exp(log_score / total)
+    return metrics
+
+
+def filter_sentences(sentences, vocabulary=None, threshold=None):
+    """
+    Keep the sentences whose quality score reaches the threshold.
+    :param sentences: List of sentence strings.
+    :param vocabulary: Optional set of lowercase words for dictionary_ratio.
+    :param threshold: Minimum score; defaults to SENTENCE_QUALITY_THRESHOLD.
+    :return: (kept sentences in input order, report with counts and mean metrics).
+    """
+    threshold = SENTENCE_QUALITY_THRESHOLD if threshold is None else threshold
+    metrics = score_sentences(sentences, vocabulary)
+    keep = metrics["score"] >= threshold
+    report = {
+        "threshold": threshold,
+        "scored": len(sentences),
+        "kept": int(keep.sum()),
+        "dropped": int(len(sentences) - keep.sum()),
+        "mean": {
+            name: (None if not len(sentences) or np.isnan(values).all() else round(float(np.mean(values)), 4))
+            for name, values in metrics.items()
+        },
+    }
+    return [sentence for sentence, kept in zip(sentences, keep.tolist()) if kept], report
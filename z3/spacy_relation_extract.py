@@ -1,8 +1,17 @@
+import atexit
+import hashlib
+import json
 import os
 import platform
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
 import nltk
 from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.tag import pos_tag
+from nltk.tag import PerceptronTagger
 from nltk.stem import PorterStemmer
 from nltk.stem import WordNetLemmatizer
 import re
@@ -13,6 +22,7 @@ import inflect
 # Try to import spaCy, but handle it gracefully if not available
 try:
     import spacy
+    from relation_rules import extract_doc_relations
     SPACY_AVAILABLE = True
 except ImportError:
     SPACY_AVAILABLE = False
@@ -46,18 +56,42 @@ def is_linux():
     """Check if the current operating system is Linux."""
     return platform.system().lower() == 'linux'
 
-_SPACY_MODEL = None
+# Named spaCy pipelines: the model to load and the components to leave out.
+# The relation rules only read POS tags, dependencies and lemmas, so
+# "svo-fast" never loads the NER component; "full" keeps the whole model.
+# Excluded components are not loaded at all, disabled ones are loaded but not run.
+PIPELINE_PROFILES = {
+    "svo-fast": {"model": "en_core_web_sm", "exclude": ["ner"], "disable": []},
+    "full": {"model": "en_core_web_sm", "exclude": [], "disable": []},
+}
+SPACY_PROFILE = os.environ.get("Z3_SPACY_PROFILE", "svo-fast")
+# Optional model name or path used instead of the profile's model
+SPACY_MODEL_OVERRIDE = os.environ.get("Z3_SPACY_MODEL")
+
+_SPACY_MODELS = {}
+
 
+def _load_profile_model(model, settings):
+    return spacy.load(model, exclude=settings.get("exclude", []), disable=settings.get("disable", []))
 
-def load_spacy_model():
-    """Load the spaCy model if available and on Linux."""
-    global _SPACY_MODEL
-    if _SPACY_MODEL is not None:
-        return _SPACY_MODEL
+
+def load_spacy_model(profile=None):
+    """
+    Load the spaCy pipeline for a profile if available and on Linux.
+    :param profile: Name in PIPELINE_PROFILES; defaults to SPACY_PROFILE.
+    :return: Loaded Language object (one per profile), or None.
+    """
+    profile = profile or SPACY_PROFILE
+    if profile in _SPACY_MODELS:
+        return _SPACY_MODELS[profile]
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(f"Unknown spaCy pipeline profile '{profile}'")
     if is_linux() and SPACY_AVAILABLE:
+        settings = PIPELINE_PROFILES[profile]
+        model = SPACY_MODEL_OVERRIDE or settings["model"]
         try:
-            _SPACY_MODEL = spacy.load("en_core_web_sm")
-            return _SPACY_MODEL
+            _SPACY_MODELS[profile] = _load_profile_model(model, settings)
+            return _SPACY_MODELS[profile]
         except OSError:
             # Model not installed
             try:
@@ -69,15 +103,55 @@ def load_spacy_model():
                         "-m",
                         "spacy",
                         "download",
-                        "en_core_web_sm",
+                        model,
                     ]
                 )
-                _SPACY_MODEL = spacy.load("en_core_web_sm")
-                return _SPACY_MODEL
+                _SPACY_MODELS[profile] = _load_profile_model(model, settings)
+                return _SPACY_MODELS[profile]
             except Exception:
                 return None
     return None
 
+
+def _add_timing(timings, name, start):
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def pipe_with_timings(nlp, texts, timings=None):
+    """
+    Parse a batch of texts one pipeline component at a time.
+    :param nlp: spaCy Language object.
+    :param texts: List of texts.
+    :param timings: Optional dictionary; milliseconds spent in the tokenizer and
+                    in each component are added under their pipeline names.
+    :return: List of parsed Docs, as nlp.pipe would produce them.
+    """
+    start = time.perf_counter()
+    docs = [nlp.make_doc(text) for text in texts]
+    _add_timing(timings, "tokenizer", start)
+    for name, component in nlp.pipeline:
+        start = time.perf_counter()
+        if hasattr(component, "pipe"):
+            docs = list(component.pipe(docs))
+        else:
+            docs = [component(doc) for doc in docs]
+        _add_timing(timings, name, start)
+    return docs
+
+
+@lru_cache(maxsize=4096)
+def singular_phrase(text):
+    """Singular form of a noun phrase according to inflect, or the phrase unchanged."""
+    return p.singular_noun(text) or text
+
+
+@lru_cache(maxsize=1)
+def get_pos_tagger():
+    """Return the shared NLTK perceptron tagger, loading its model once."""
+    return PerceptronTagger()
+
+
 def split_into_sentences(text):
     """Split text into sentences to handle compound structures."""
     try:
@@ -119,7 +193,7 @@ def convert_to_singular(text):
     """
     tokens = word_tokenize(text)
     # POS tag the tokens to identify nouns correctly
-    tagged = pos_tag(tokens)
+    tagged = get_pos_tagger().tag(tokens)
     
     singular_tokens = []
     for word, tag in tagged:
@@ -162,10 +236,11 @@ def apply_stemming(text, singular_tokens=None, singular_text=None):
     
     return stemmed_tokens, stemmed_text
 
-def extract_relations_spacy(text):
+def extract_relations_spacy(text, timings=None):
     """
     Extract relations from text using spaCy if on Linux.
     :param text: Input text
+    :param timings: Optional dictionary collecting milliseconds per pipeline component
     :return: List of extracted relation tuples (subject, relation, object)
     """
     nlp = load_spacy_model()
@@ -180,89 +255,14 @@ def extract_relations_spacy(text):
     # Split text into sentences
     sentences = split_into_sentences(text)
     relations = []
-    docs = list(nlp.pipe(sentences))
 
+    # Subject-verb-object, copula and preposition rules (see relation_rules)
+    docs = pipe_with_timings(nlp, sentences, timings)
+    start = time.perf_counter()
     for doc in docs:
-        # Extract subject-verb-object patterns
-        for token in doc:
-            # Find verbs - they often represent relations
-            if token.pos_ == "VERB" or token.lemma_ == "be":
-                # Find the subject
-                subj = None
-                for child in token.children:
-                    if child.dep_ in ["nsubj", "nsubjpass"]:
-                        # Get the full noun phrase, not just the head
-                        subj_span = get_span_for_token(child, doc)
-                        subj_text = subj_span.text.lower()
-
-                        # Convert to singular form if it's plural
-                        plural_check = p.singular_noun(subj_text)
-                        subj = plural_check if plural_check else subj_text
-                        break
-
-                # Find the object
-                obj = None
-                for child in token.children:
-                    if child.dep_ in ["dobj", "pobj", "attr"]:
-                        # Get the full noun phrase, not just the head
-                        obj_span = get_span_for_token(child, doc)
-                        obj_text = obj_span.text.lower()
-
-                        # Convert to singular form if it's plural
-                        plural_check = p.singular_noun(obj_text)
-                        obj = plural_check if plural_check else obj_text
-                        break
-
-                # Handle special case for "is a" patterns (e.g., "Socrates is a human")
-                if token.lemma_ == "be":
-                    for child in token.children:
-                        if child.dep_ == "attr":
-                            # Check for presence of determiner "a"/"an" before noun
-                            has_det = False
-                            for grandchild in child.children:
-                                if (
-                                    grandchild.dep_ == "det"
-                                    and grandchild.text.lower() in ["a", "an", "the"]
-                                ):
-                                    has_det = True
-                                    break
-
-                            if has_det or (obj and obj.startswith(("a ", "an ", "the "))):
-                                # Clean up object by removing leading article
-                                if obj:
-                                    obj_clean = (
-                                        obj.replace("a ", "")
-                                        .replace("an ", "")
-                                        .replace("the ", "")
-                                        .strip()
-                                    )
-                                    if obj_clean != obj:
-                                        obj = obj_clean
-
-                # If both subject and object found, record the relation
-                if subj and obj:
-                    rel = token.lemma_.lower()
-                    relations.append((subj, rel, obj))
-
-        # Extract noun phrases connected by prepositions
-        for token in doc:
-            if token.dep_ == "pobj" and token.head.dep_ == "prep":
-                prep = token.head.text  # the preposition
-                head_noun = token.head.head
-
-                if head_noun.pos_ in ["NOUN", "PROPN"]:
-                    # Get head noun and convert to singular if needed
-                    head_text = head_noun.text.lower()
-                    plural_check = p.singular_noun(head_text)
-                    head_singular = plural_check if plural_check else head_text
-
-                    # Get object noun and convert to singular if needed
-                    obj_text = token.text.lower()
-                    plural_check = p.singular_noun(obj_text)
-                    obj_singular = plural_check if plural_check else obj_text
-
-                    relations.append((head_singular, prep.lower(), obj_singular))
-    
+        relations.extend(extract_doc_relations(doc, singular_phrase))
+    _add_timing(timings, "relation_rules", start)
+
     # Process singular and stemmed sentences directly for common patterns
     # Get lowercase versions for easier matching
     singular_text_lower = singular_text.lower()
@@ -284,48 +284,12 @@ def extract_relations_spacy(text):
     
     return unique_relations
 
-def get_span_for_token(token, doc):
-    """Get the full noun phrase span for a token."""
-    if token.pos_ in ["NOUN", "PROPN"]:
-        # Check for compound words, adjectives and determiners
-        start = token.i
-        end = token.i + 1
-        
-        # Look for beginning of the phrase (going backwards)
-        for i in range(token.i - 1, -1, -1):
-            if doc[i].dep_ in ["compound", "amod", "det"] and doc[i].head == token:
-                start = i
-            else:
-                break
-        
-        # Look for end of the phrase (going forwards)
-        for i in range(token.i + 1, len(doc)):
-            if doc[i].dep_ in ["compound", "amod"] and doc[i].head == token:
-                end = i + 1
-            else:
-                break
-        
-        return doc[start:end]
-    return doc[token.i:token.i+1]  # Just the token itself if not a noun
-
 def extract_relations_nltk(text):
     """
     Extract relations from text using NLTK as a fallback.
     :param text: Input text
     :return: List of extracted relation tuples (subject, relation, object)
     """
-    # Apply conversion to singular form before stemming
-    singular_tokens, singular_text = convert_to_singular(text)
-    print(f"Singular form (NLTK): {singular_text}")
-    
-    # Then apply stemming
-    stemmed_tokens, stemmed_text = apply_stemming(
-        text, singular_tokens=singular_tokens, singular_text=singular_text
-    )
-    print(f"Stemmed text (NLTK): {stemmed_text}")
-    
-
-
     # Maximum words allowed in a subject / object noun phrase
     MAX_NP_WORDS = 5
 
@@ -384,10 +348,10 @@ def extract_relations_nltk(text):
     sentences = split_into_sentences(text)
     relations = []
 
-    for sentence in sentences:
-        tokens = word_tokenize(sentence.lower())
-        tagged = pos_tag(tokens)
+    # Tokenize every fragment first, then tag them all in one batch
+    tagged_sentences = get_pos_tagger().tag_sents([word_tokenize(sentence.lower()) for sentence in sentences])
 
+    for sentence, tagged in zip(sentences, tagged_sentences):
         i = 0
         while i < len(tagged):
             word, tag = tagged[i]
@@ -472,28 +436,173 @@ def extract_relations_nltk(text):
     return unique_relations
 
 
-def extract_relations(text):
+# Sentence cache: hash of the text -> triples returned by extract_relations.
+# Repeated headers, footers and disclaimers are parsed once per process, or
+# once per machine when Z3_RELATION_CACHE_PATH names a shared SQLite file.
+RELATION_CACHE_SIZE = int(os.environ.get("Z3_RELATION_CACHE_SIZE", "10000"))
+RELATION_CACHE_PATH = os.environ.get("Z3_RELATION_CACHE_PATH")
+# Stored triples come from this version of the extraction and normalization code;
+# bump it whenever their output changes so existing store files are cleared
+_RELATION_EXTRACTOR_VERSION = 3
+# New store rows are committed together once this many are pending (and on flush/exit)
+RELATION_STORE_BATCH_SIZE = int(os.environ.get("Z3_RELATION_STORE_BATCH_SIZE", "256"))
+
+_relation_cache = OrderedDict()
+_relation_cache_lock = threading.Lock()
+_relation_cache_stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+_relation_store = None
+_relation_store_pid = None
+# key -> JSON triples not yet written to the store
+_relation_store_pending = {}
+
+
+def _relation_cache_key(text):
+    # Results depend on the pipeline, so the method, profile and model are part of the key
+    method = "spacy" if is_linux() and SPACY_AVAILABLE else "nltk"
+    canonical = "\0".join((method, SPACY_PROFILE, SPACY_MODEL_OVERRIDE or "", text))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _get_relation_store():
+    """Open the on-disk relation store once per process; called with the cache lock held."""
+    global _relation_store, _relation_store_pid
+    if RELATION_CACHE_PATH and (_relation_store is None or _relation_store_pid != os.getpid()):
+        connection = sqlite3.connect(RELATION_CACHE_PATH, timeout=30, check_same_thread=False)
+        connection.execute("CREATE TABLE IF NOT EXISTS relations (key TEXT PRIMARY KEY, triples TEXT NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # Triples written by another extractor version are stale
+        row = connection.execute("SELECT value FROM meta WHERE key = 'extractor_version'").fetchone()
+        if row is None or row[0] != str(_RELATION_EXTRACTOR_VERSION):
+            connection.execute("DELETE FROM relations")
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('extractor_version', ?)",
+                               (str(_RELATION_EXTRACTOR_VERSION),))
+        connection.commit()
+        # Rows queued before a fork are written by the parent
+        _relation_store_pending.clear()
+        _relation_store = connection
+        _relation_store_pid = os.getpid()
+    return _relation_store
+
+
+def _flush_pending_relations(store):
+    """Write queued rows in one transaction; called with the cache lock held."""
+    if _relation_store_pending:
+        store.executemany("INSERT OR REPLACE INTO relations (key, triples) VALUES (?, ?)",
+                          list(_relation_store_pending.items()))
+        store.commit()
+        _relation_store_pending.clear()
+
+
+def _remember_relations(key, relations):
+    _relation_cache[key] = relations
+    _relation_cache.move_to_end(key)
+    while len(_relation_cache) > RELATION_CACHE_SIZE:
+        _relation_cache.popitem(last=False)
+
+
+def _cached_relations(key):
+    with _relation_cache_lock:
+        relations = _relation_cache.get(key)
+        if relations is not None:
+            _relation_cache.move_to_end(key)
+            _relation_cache_stats["hits"] += 1
+            return list(relations)
+        store = _get_relation_store()
+        if store is not None:
+            stored = _relation_store_pending.get(key)
+            if stored is None:
+                row = store.execute("SELECT triples FROM relations WHERE key = ?", (key,)).fetchone()
+                stored = row[0] if row is not None else None
+            if stored is not None:
+                relations = tuple(tuple(triple) for triple in json.loads(stored))
+                _remember_relations(key, relations)
+                _relation_cache_stats["disk_hits"] += 1
+                return list(relations)
+        _relation_cache_stats["misses"] += 1
+        return None
+
+
+def _store_relations(key, relations, persist=True):
+    relations = tuple(relations)
+    with _relation_cache_lock:
+        _remember_relations(key, relations)
+        store = _get_relation_store() if persist else None
+        if store is not None:
+            _relation_store_pending[key] = json.dumps(relations)
+            if len(_relation_store_pending) >= RELATION_STORE_BATCH_SIZE:
+                _flush_pending_relations(store)
+
+
+def flush_relation_store():
+    """Commit relations still queued for the on-disk store (run at exit and after each PDF)."""
+    with _relation_cache_lock:
+        if _relation_store is not None and _relation_store_pid == os.getpid():
+            _flush_pending_relations(_relation_store)
+
+
+atexit.register(flush_relation_store)
+
+
+def relation_cache_info():
+    """Return hit/miss counters, the hit ratio and the size of the sentence relation cache."""
+    with _relation_cache_lock:
+        hits = _relation_cache_stats["hits"] + _relation_cache_stats["disk_hits"]
+        lookups = hits + _relation_cache_stats["misses"]
+        return {
+            "hits": _relation_cache_stats["hits"],
+            "disk_hits": _relation_cache_stats["disk_hits"],
+            "misses": _relation_cache_stats["misses"],
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "size": len(_relation_cache),
+            "max_size": RELATION_CACHE_SIZE,
+            "store": RELATION_CACHE_PATH,
+        }
+
+
+def clear_relation_cache():
+    """Drop all cached sentence relations held in memory and reset the counters."""
+    flush_relation_store()
+    with _relation_cache_lock:
+        _relation_cache.clear()
+        for name in _relation_cache_stats:
+            _relation_cache_stats[name] = 0
+
+
+def extract_relations(text, timings=None):
     """
     Main function to extract relations, choosing the appropriate method.
     :param text: Input text
+    :param timings: Optional dictionary collecting milliseconds per pipeline
+                    component (spaCy) or for the "nltk" fallback
     :return: List of extracted relation tuples (subject, relation, object)
     """
     # Check if text is empty or None
     if not text or not text.strip():
         print("Warning: Empty text provided for relation extraction")
         return []
-    
+
+    key = _relation_cache_key(text)
+    cached = _cached_relations(key)
+    if cached is not None:
+        return cached
+
     try:
         # Prefer spaCy if available, fall back to NLTK on failure or missing model
         relations = []
+        spacy_failed = False
+        fallback = False
         if is_linux() and SPACY_AVAILABLE:
             try:
-                relations = extract_relations_spacy(text)
+                relations = extract_relations_spacy(text, timings)
             except Exception as e:
                 print(f"Error in spaCy extraction: {e}")
+                spacy_failed = True
 
         if not relations:
+            fallback = is_linux() and SPACY_AVAILABLE
+            start = time.perf_counter()
             relations = extract_relations_nltk(text)
+            _add_timing(timings, "nltk", start)
 
         # Normalize all relations to ensure singular forms using inflect
         def singularize_phrase(phrase):
@@ -513,7 +622,11 @@ def extract_relations(text):
             except Exception as e:
                 print(f"Error normalizing relation: {e}")
                 normalized_relations.append((subj, rel, obj))
-        
+
+        # A spaCy error may be transient: do not cache its fallback result. A fallback after
+        # an empty spaCy result is kept in memory only, never in the shared store.
+        if not spacy_failed:
+            _store_relations(key, normalized_relations, persist=not fallback)
         return normalized_relations
     
     except Exception as e:
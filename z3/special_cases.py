@@ -0,0 +1,208 @@
+"""
+Data-driven special-case templates for natural_language_to_logic.
+
+Templates live in JSON files (``special_case_templates/*.json`` by default, or
+the directory named by ``Z3_SPECIAL_CASES_DIR``).  Each file holds
+``{"templates": [...]}`` and each template looks like:
+
+    {
+      "name": "socrates",
+      "when": {"premises": ["socrates"], "conclusion": ["mortal"]},
+      "premises": ["Object = DeclareSort('Object')", ...],
+      "conclusion": "Mortal(socrates)"
+    }
+
+``when`` lists clauses that must all hold.  A clause is a keyword, or a list of
+alternative keywords, that must occur (as a lowercase substring) in at least
+one premise or in the conclusion respectively.  Templates are tried in file
+name order, then in order within a file; the first match wins.
+
+All keywords are compiled into one Aho–Corasick matcher with an index from
+keyword to the templates that use it, so a lookup is a single pass over the
+lowercased premises and conclusion no matter how many templates are loaded.
+Files are re-read when their modification times change.
+"""
+import glob
+import json
+import os
+import threading
+import time
+
+from keyword_matcher import build_matcher, matched_patterns
+
+TEMPLATE_DIR = os.environ.get(
+    "Z3_SPECIAL_CASES_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "special_case_templates"),
+)
+
+# Minimum seconds between checks of the template files for changes
+RELOAD_CHECK_INTERVAL = 2.0
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _template_files(directory):
+    return sorted(glob.glob(os.path.join(directory, "*.json")))
+
+
+def _files_signature(directory):
+    return tuple((path, os.path.getmtime(path)) for path in _template_files(directory))
+
+
+def _compile_clauses(template, side):
+    clauses = []
+    for clause in template["when"].get(side, []):
+        alternatives = [clause] if isinstance(clause, str) else clause
+        if not alternatives or not all(isinstance(k, str) and k for k in alternatives):
+            raise ValueError(f"Template '{template['name']}' has an invalid {side} clause: {clause!r}")
+        clauses.append(frozenset(keyword.lower() for keyword in alternatives))
+    return clauses
+
+
+def compile_templates(templates):
+    """
+    Compile template dictionaries into a registry.
+    :param templates: Templates in priority order.
+    :return: Registry dictionary used by match_special_case.
+    """
+    compiled = []
+    index = {}
+    for order, template in enumerate(templates):
+        for field in ("name", "when", "premises", "conclusion"):
+            if field not in template:
+                raise ValueError(f"Template #{order} is missing '{field}'")
+        entry = {
+            "order": order,
+            "name": template["name"],
+            "premise_clauses": _compile_clauses(template, "premises"),
+            "conclusion_clauses": _compile_clauses(template, "conclusion"),
+            "premises": list(template["premises"]),
+            "conclusion": template["conclusion"],
+        }
+        keywords = set().union(*entry["premise_clauses"], *entry["conclusion_clauses"])
+        if not keywords:
+            raise ValueError(f"Template '{entry['name']}' has no keywords")
+        compiled.append(entry)
+        for keyword in keywords:
+            index.setdefault(keyword, []).append(order)
+
+    return {
+        "templates": compiled,
+        "index": index,
+        "matcher": build_matcher(index) if index else None,
+    }
+
+
+def load_templates(directory=TEMPLATE_DIR):
+    """
+    Read every template file in a directory.
+    :param directory: Directory of *.json template files.
+    :return: List of template dictionaries in priority order.
+    """
+    templates = []
+    for path in _template_files(directory):
+        with open(path, encoding="utf-8") as handle:
+            try:
+                document = json.load(handle)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid template file '{path}': {str(e)}")
+        templates.extend(document.get("templates", []))
+    return templates
+
+
+def match_special_case(registry, premises, conclusion):
+    """
+    Find the first template matching the premises and conclusion.
+    :param registry: Result of compile_templates.
+    :param premises: List of natural language premise statements.
+    :param conclusion: Natural language conclusion statement.
+    :return: Dictionary with premises and conclusion, or None if no template matches.
+    """
+    matcher = registry["matcher"]
+    if matcher is None:
+        return None
+
+    # Premises are joined with a newline, which no keyword contains, so a
+    # keyword can only match inside a single premise.
+    premise_hits = matched_patterns(matcher, "\n".join(premises).lower())
+    conclusion_hits = matched_patterns(matcher, conclusion.lower())
+
+    index = registry["index"]
+    candidates = sorted({order for keyword in premise_hits | conclusion_hits
+                         for order in index[keyword]})
+    for order in candidates:
+        template = registry["templates"][order]
+        if (all(clause & premise_hits for clause in template["premise_clauses"]) and
+                all(clause & conclusion_hits for clause in template["conclusion_clauses"])):
+            return {
+                "premises": list(template["premises"]),
+                "conclusion": template["conclusion"],
+            }
+    return None
+
+
+def _load_registry(directory):
+    """Compile the templates of a directory into the active registry; called with the lock held."""
+    global _registry
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Special-case template directory not found: {directory}")
+    signature = _files_signature(directory)
+    registry = compile_templates(load_templates(directory))
+    registry.update({
+        "directory": directory,
+        "signature": signature,
+        "checked": time.monotonic(),
+        "loaded": time.time(),
+    })
+    _registry = registry
+
+
+def reload_special_cases(directory=None):
+    """
+    Re-read the template files now.  On error the previous templates stay active.
+    :param directory: Optional new template directory; it must exist.
+    :return: Registry description (see special_cases_info).
+    """
+    with _registry_lock:
+        _load_registry(directory or (_registry["directory"] if _registry else TEMPLATE_DIR))
+    return special_cases_info()
+
+
+def get_special_case_registry():
+    """Return the active registry, reloading it if the template files changed."""
+    registry = _registry
+    if registry is None:
+        reload_special_cases()
+        return _registry
+
+    now = time.monotonic()
+    if now - registry["checked"] < RELOAD_CHECK_INTERVAL:
+        return registry
+    with _registry_lock:
+        registry = _registry
+        # Another thread may have checked while this one waited for the lock
+        if now - registry["checked"] < RELOAD_CHECK_INTERVAL:
+            return registry
+        registry["checked"] = now
+        try:
+            if _files_signature(registry["directory"]) != registry["signature"]:
+                _load_registry(registry["directory"])
+        except (OSError, ValueError) as e:
+            print(f"Keeping previous special-case templates: {e}")
+    return _registry
+
+
+def special_cases_info():
+    """Describe the active template registry."""
+    registry = _registry
+    if registry is None:
+        return {"loaded": False}
+    return {
+        "loaded": True,
+        "directory": registry["directory"],
+        "files": len(registry["signature"]),
+        "templates": len(registry["templates"]),
+        "keywords": len(registry["index"]),
+        "loaded_at": registry["loaded"],
+    }
@@ -0,0 +1,123 @@
+import os
+import tempfile
+
+import entity_index as ei
+
+
+def _reset(path=None):
+    ei.ENTITY_INDEX_PATH = path
+    ei._entity_store = None
+    ei.set_entity_aliases({})
+    ei.clear_entity_cache()
+
+
+def test_surface_forms_share_one_entity():
+    _reset()
+    for surface in ("the sun", "sun", "suns", "Sun", "The Sun", "  the   suns. "):
+        assert ei.normalize_entity(surface) == "sun", surface
+    assert ei.normalize_entity("greenhouse gases") == "greenhouse gas"
+    assert ei.normalize_entity("An apple") == "apple"
+    # Words inflect would truncate are kept
+    for word in ("gas", "process", "physics", "virus"):
+        assert ei.normalize_entity(word) == word
+    for word in ("lens", "means", "bias"):
+        assert ei.normalize_entity(word) == word
+    # Capitalized words are taken for names and keep their final "s"
+    for surface, canonical in (("Los Angeles", "los angeles"), ("United States", "united states"),
+                               ("the Netherlands", "netherlands"), ("Athens", "athens"), ("Mars", "mars")):
+        assert ei.normalize_entity(surface) == canonical, surface
+    # A lone article is not dropped
+    assert ei.normalize_entity("The") == "the"
+    assert ei.entity_id("sun") == ei.entity_id(ei.normalize_entity("suns"))
+    assert ei.entity_id("sun") != ei.entity_id("moon")
+
+
+def test_aliases():
+    _reset()
+    try:
+        ei.set_entity_aliases({"Sol": "the Sun", "CO2": "carbon dioxide"})
+        assert ei.normalize_entity("sol") == "sun"
+        assert ei.normalize_entity("the CO2") == "carbon dioxide"
+        ids = [identifier for identifier, _ in ei.canonicalize_entities(["Sol", "suns", "co2"])]
+        assert ids[0] == ids[1] != ids[2]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "aliases.json")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write('{"H2O": "water"}')
+            assert ei.load_entity_aliases(path) == {"H2O": "water"}
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write('["water"]')
+            try:
+                ei.load_entity_aliases(path)
+                assert False, "expected ValueError"
+            except ValueError:
+                pass
+    finally:
+        _reset()
+
+
+def test_bulk_relations_and_cache():
+    _reset()
+    relations = [
+        {"subject": "The Sun", "relation": "emit", "object": "photons", "source_sentence": "s1"},
+        {"subject": "suns", "relation": "emit", "object": "heat", "source_sentence": "s2"},
+    ]
+    assert ei.canonicalize_relations(relations) is relations
+    assert [(r["subject"], r["object"]) for r in relations] == [("sun", "photon"), ("sun", "heat")]
+    assert relations[0]["subject_id"] == relations[1]["subject_id"] == ei.entity_id("sun")
+    assert relations[0]["object_id"] == ei.entity_id("photon")
+
+    info = ei.entity_index_info()
+    assert (info["hits"], info["misses"], info["size"]) == (0, 4, 4)
+    ei.canonicalize_entities(["The Sun", "heat", "moon", "moon"])
+    info = ei.entity_index_info()
+    assert (info["hits"], info["misses"]) == (2, 5)
+    assert ei.entity_surface_forms(ei.entity_id("sun")) == ["The Sun", "suns"]
+
+    size = ei.ENTITY_CACHE_SIZE
+    try:
+        ei.ENTITY_CACHE_SIZE = 2
+        ei.canonicalize_entities(["a", "b", "c"])
+        assert ei.entity_index_info()["size"] == 2
+    finally:
+        ei.ENTITY_CACHE_SIZE = size
+        _reset()
+
+
+def test_disk_index_is_shared():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "entities.sqlite")
+        _reset(path)
+        try:
+            first = ei.canonicalize_entities(["the suns", "Moon"])
+            # A fresh process-local cache finds the resolutions on disk
+            ei.clear_entity_cache()
+            assert ei.canonicalize_entities(["the suns", "Moon"]) == first
+            assert ei.entity_index_info()["disk_hits"] == 2
+            assert ei.entity_surface_forms(ei.entity_id("moon")) == ["Moon"]
+
+            # Changing the aliases drops resolutions made with the old table
+            ei.set_entity_aliases({"moon": "luna"})
+            assert ei.entity_surface_forms(ei.entity_id("moon")) == []
+            assert ei.canonicalize_entities(["Moon"]) == [(ei.entity_id("luna"), "luna")]
+
+            # Resolutions stored by an older normalization version are dropped
+            version = ei._NORMALIZATION_VERSION
+            ei._entity_store.close()
+            ei._entity_store = None
+            ei._NORMALIZATION_VERSION = version + 1
+            try:
+                assert ei.entity_surface_forms(ei.entity_id("luna")) == []
+            finally:
+                ei._NORMALIZATION_VERSION = version
+            ei._entity_store.close()
+        finally:
+            _reset()
+
+
+if __name__ == "__main__":
+    test_surface_forms_share_one_entity()
+    test_aliases()
+    test_bulk_relations_and_cache()
+    test_disk_index_is_shared()
+    print("All entity index tests passed!")
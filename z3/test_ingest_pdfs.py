@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+
+import pyarrow.parquet as pq
+
+from ingest_pdfs import JsonlSink, ParquetSink, find_pdfs, ingest, load_checkpoint
+
+
+def fake_process(path):
+    name = os.path.basename(path)
+    if name.startswith("broken"):
+        return {"path": path, "relations": [], "sentences": 0, "parsed": 0, "error": "unreadable"}
+    if name.startswith("crash"):
+        raise KeyboardInterrupt
+    relation = {"subject": "sun", "relation": "emit", "object": name, "source_sentence": f"The sun emits {name}."}
+    return {"path": path, "relations": [relation], "sentences": 2, "parsed": 1, "error": None}
+
+
+def no_models(quality_threshold):
+    pass
+
+
+def _make_files(directory, names):
+    for name in names:
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+
+
+def test_resume_after_interruption():
+    with tempfile.TemporaryDirectory() as directory:
+        _make_files(directory, ["a.pdf", "b.PDF", "nested/c.pdf", "crash.pdf", "notes.txt"])
+        paths = find_pdfs(directory)
+        assert [os.path.basename(path) for path in paths] == ["a.pdf", "b.PDF", "crash.pdf", "c.pdf"]
+        output = os.path.join(directory, "relations.jsonl")
+        checkpoint = output + ".checkpoint"
+
+        try:
+            ingest(paths, JsonlSink(output), checkpoint, checkpoint_every=1,
+                   process=fake_process, initializer=no_models)
+            assert False, "expected the run to be interrupted"
+        except KeyboardInterrupt:
+            pass
+        assert load_checkpoint(checkpoint) == set(paths[:2])
+
+        os.remove(paths[2])
+        _make_files(directory, ["broken.pdf"])
+        stats = ingest(find_pdfs(directory), JsonlSink(output), checkpoint,
+                       process=fake_process, initializer=no_models)
+        assert (stats["skipped"], stats["documents"], stats["failed"]) == (2, 1, 1)
+        assert (stats["sentences"], stats["parsed_sentences"], stats["relations"]) == (2, 1, 1)
+        assert stats["documents_per_s"] > 0 and stats["sentences_per_s"] > 0
+        assert list(stats["errors"].values()) == ["unreadable"]
+
+        with open(output, encoding="utf-8") as handle:
+            rows = [json.loads(line) for line in handle]
+        assert sorted(row["object"] for row in rows) == ["a.pdf", "b.PDF", "c.pdf"]
+        assert all(row["document"].endswith(row["object"]) for row in rows)
+        # Failed files are retried on the next run
+        assert os.path.join(directory, "broken.pdf") not in load_checkpoint(checkpoint)
+
+
+def test_parquet_sink():
+    with tempfile.TemporaryDirectory() as directory:
+        _make_files(directory, ["a.pdf", "b.pdf", "c.pdf"])
+        output = os.path.join(directory, "out")
+        stats = ingest(find_pdfs(directory), ParquetSink(output), output + ".checkpoint",
+                       checkpoint_every=2, process=fake_process, initializer=no_models)
+        assert stats["relations"] == 3
+        parts = sorted(os.listdir(output))
+        assert len(parts) == 2
+        table = pq.read_table(output)
+        assert sorted(table.column("object").to_pylist()) == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+if __name__ == "__main__":
+    test_resume_after_interruption()
+    test_parquet_sink()
+    print("All ingestion tests passed!")
@@ -0,0 +1,49 @@
+from keyword_matcher import (build_keyword_index, build_matcher, find_matches,
+                             first_position, hit_positions, matched_patterns, scan_keywords)
+from nlp_resources import RELATION_PHRASES
+
+
+def test_relation_phrases_match_substring_search():
+    matcher = build_matcher(RELATION_PHRASES)
+    for text in ["a is greater than b and b is part of c",
+                 "the set contains every element of the subset of x",
+                 "nothing relevant here",
+                 "john is connected to mary who is related to linked tom"]:
+        expected = {phrase for phrase in RELATION_PHRASES if phrase in text}
+        assert matched_patterns(matcher, text) == expected
+
+
+def test_overlapping_patterns_report_positions():
+    matcher = build_matcher(["he", "she", "his", "hers"])
+    assert find_matches(matcher, "ushers") == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_token_patterns():
+    matcher = build_matcher([("there", "is"), ("not",), ("is",)])
+    tokens = ["there", "is", "not", "a", "dog"]
+    assert find_matches(matcher, tokens) == [
+        (0, 2, ("there", "is")), (1, 2, ("is",)), (2, 3, ("not",))]
+
+
+def test_keyword_index_categories_and_phrases():
+    index = build_keyword_index({
+        "existential": ("some", "there is"),
+        "copula": ("is", "are"),
+        "negation": ("not", "don't"),
+    }, tokenize=lambda phrase: phrase.replace("n't", " n't").split())
+    hits = scan_keywords(index, ["there", "is", "a", "dog"])
+    assert hits["existential"] == [(0, 2, "there is")]
+    assert first_position(hits, "copula", "is") == 1
+    assert first_position(hits, "copula", "are") is None
+
+    # Contractions match whole and split by the tokenizer
+    assert hit_positions(scan_keywords(index, ["cats", "don't", "fly"]), "negation") == [1]
+    assert hit_positions(scan_keywords(index, ["cats", "do", "n't", "fly"]), "negation") == [2]
+
+
+if __name__ == "__main__":
+    test_relation_phrases_match_substring_search()
+    test_overlapping_patterns_report_positions()
+    test_token_patterns()
+    test_keyword_index_categories_and_phrases()
+    print("All keyword matcher tests passed!")
@@ -0,0 +1,48 @@
+import knowledge_base
+from test_premise_compiler import SOCRATES
+
+PYTHON_PREMISES = [
+    "Human = Function('Human', Object, BoolSort())",
+    "Mortal = Function('Mortal', Object, BoolSort())",
+    "socrates = Const('socrates', Object)",
+    "x = Const('x', Object)",
+    "s.add(ForAll([x], Implies(Human(x), Mortal(x))))",
+    "s.add(Human(socrates))",
+]
+
+
+def test_batch_conclusions_share_one_solver():
+    kb_id = knowledge_base.register_knowledge_base(SOCRATES, "json")
+    results = knowledge_base.prove_conclusions(kb_id, [
+        ["Mortal", "socrates"],
+        ["Not", ["Human", "socrates"]],
+        ["Mortal", "socrates"],
+    ])
+    assert [r["proved"] for r in results] == [True, False, True]
+    assert "counterexample" in results[1]
+    # push/pop must leave the premises untouched between queries
+    assert knowledge_base.knowledge_base_info(kb_id)["queries"] == 3
+
+
+def test_python_premises():
+    kb_id = knowledge_base.register_knowledge_base(PYTHON_PREMISES)
+    assert knowledge_base.prove_conclusion(kb_id, "Mortal(socrates)")["proved"]
+    assert knowledge_base.prove_conclusion(kb_id, "Undefined(socrates)")["status"] == "error"
+
+
+def test_delete_knowledge_base():
+    kb_id = knowledge_base.register_knowledge_base(SOCRATES, "json")
+    assert knowledge_base.delete_knowledge_base(kb_id)
+    try:
+        knowledge_base.prove_conclusion(kb_id, ["Mortal", "socrates"])
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("deleted knowledge base should be unknown")
+
+
+if __name__ == "__main__":
+    test_batch_conclusions_share_one_solver()
+    test_python_premises()
+    test_delete_knowledge_base()
+    print("All knowledge base tests passed!")
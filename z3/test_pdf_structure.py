@@ -0,0 +1,59 @@
+from pdf_structure import strip_document_structure
+
+
+def _page(number, body):
+    return "\n".join(["ACME Corp Annual Report 2023", *body, "Confidential - do not distribute", f"Page {number} of 4"])
+
+
+def test_headers_footers_and_page_numbers():
+    pages = [_page(n, [f"Solar panels reduce emissions in region {n}."]) for n in range(1, 5)]
+    text, report = strip_document_structure(pages)
+    assert "ACME" not in text and "Confidential" not in text and "Page" not in text
+    for n in range(1, 5):
+        assert f"Solar panels reduce emissions in region {n}." in text
+    assert report["header_footer"] == sum(len(page) + 1 for page in pages) - sum(
+        len(f"Solar panels reduce emissions in region {n}.") + 1 for n in range(1, 5))
+    assert report["removed"] == report["header_footer"]
+    assert len(text) == report["input"] - report["removed"]
+
+
+def test_references_and_tables():
+    body = [
+        "Wind farms produce electricity.",
+        "Region 2019 2020 2021",
+        "North 12.5 13.1 14.0",
+        "South 9.8 10.2 11.7",
+        "Turbines convert kinetic energy.",
+        "References",
+        "[1] Smith, J. (2020). Wind energy. Journal 4(2), 1-10.",
+        "[2] Doe, A. (2021). Turbines. Press.",
+        "Appendix A",
+        "Storage systems balance the grid.",
+    ]
+    text, report = strip_document_structure(["\n".join(body)])
+    assert text.split("\n") == [
+        "Wind farms produce electricity.",
+        "Turbines convert kinetic energy.",
+        "Appendix A",
+        "Storage systems balance the grid.",
+        "",
+    ]
+    assert report["references"] == sum(len(line) + 1 for line in body[5:8])
+    assert report["tables"] == sum(len(line) + 1 for line in body[1:4])
+    assert report["header_footer"] == 0
+
+
+def test_body_text_is_kept():
+    # A single page, a contents entry for references and one numeric line stay
+    pages = ["References\nThe 3 plants use 40 % less water in 2021 and 2022.\nPlants absorb carbon dioxide."
+             + "\nTrees store carbon." * 5]
+    text, report = strip_document_structure(pages)
+    assert text == pages[0] + "\n"
+    assert report["removed"] == 0
+
+
+if __name__ == "__main__":
+    test_headers_footers_and_page_numbers()
+    test_references_and_tables()
+    test_body_text_is_kept()
+    print("All PDF structure tests passed!")
@@ -0,0 +1,97 @@
+from z3 import Not, Solver, unsat, sat
+
+from premise_compiler import compile_premises, compile_conclusion, compiled_cache_info
+
+SOCRATES = {
+    "sorts": ["Object"],
+    "functions": [
+        {"name": "Human", "domain": ["Object"], "range": "Bool"},
+        {"name": "Mortal", "domain": ["Object"], "range": "Bool"},
+    ],
+    "constants": [
+        {"name": "socrates", "sort": "Object"},
+        {"name": "x", "sort": "Object"},
+    ],
+    "assertions": [
+        ["ForAll", ["x"], ["Implies", ["Human", "x"], ["Mortal", "x"]]],
+        ["Human", "socrates"],
+    ],
+}
+
+SOCRATES_SMT2 = """
+(declare-sort Object 0)
+(declare-fun Human (Object) Bool)
+(declare-fun Mortal (Object) Bool)
+(declare-const socrates Object)
+(declare-const plato Object)
+(assert (forall ((x Object)) (=> (Human x) (Mortal x))))
+(assert (Human socrates))
+"""
+
+
+def _check(compiled, conclusion):
+    s = Solver()
+    s.add(compiled["assertions"])
+    s.add(Not(compile_conclusion(conclusion, compiled)))
+    return s.check()
+
+
+def test_json_premises():
+    compiled = compile_premises(SOCRATES)
+    assert _check(compiled, ["Mortal", "socrates"]) == unsat
+    assert _check(compiled, ["Not", ["Mortal", "socrates"]]) == sat
+
+
+def test_json_bound_variables_and_arithmetic():
+    spec = {
+        "constants": [{"name": "a", "sort": "Int"}, {"name": "b", "sort": "Int"}],
+        "assertions": [[">", "a", 3], ["==", "b", ["+", "a", 1]]],
+    }
+    compiled = compile_premises(spec)
+    assert _check(compiled, [">", "b", 4]) == unsat
+    assert _check(compiled, ["Exists", [["n", "Int"]], ["==", "b", ["*", 2, "n"]]]) == sat
+
+
+def test_smt2_premises():
+    compiled = compile_premises(SOCRATES_SMT2, "smt2")
+    assert _check(compiled, "(Mortal socrates)") == unsat
+    # plato never appears in an assertion, so this exercises the fallback parse
+    assert _check(compiled, "(Mortal plato)") == sat
+
+
+def test_compiled_cache_hits():
+    before = compiled_cache_info()["hits"]
+    first = compile_premises(SOCRATES)
+    second = compile_premises(dict(SOCRATES))
+    assert first is second
+    assert compiled_cache_info()["hits"] >= before + 1
+
+
+def test_unknown_symbol_rejected():
+    try:
+        compile_premises({"assertions": [["Human", "nobody"]]})
+    except ValueError as e:
+        assert "Unknown" in str(e)
+    else:
+        raise AssertionError("unknown symbols should be rejected")
+
+
+
+def test_wrong_premise_type_rejected():
+    for premises, premise_format in (({"sorts": []}, "smt2"), (["(assert true)"], "smt2"), ("(assert true)", "json")):
+        try:
+            compile_premises(premises, premise_format=premise_format)
+        except ValueError as e:
+            assert "must be" in str(e)
+        else:
+            raise AssertionError(f"{premise_format} premises of type {type(premises).__name__} should be rejected")
+
+
+if __name__ == "__main__":
+    test_json_premises()
+    test_json_bound_variables_and_arithmetic()
+    test_smt2_premises()
+    test_compiled_cache_hits()
+    test_unknown_symbol_rejected()
+    test_wrong_premise_type_rejected()
+    print("All premise compiler tests passed!")
@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import tempfile
+
+import spacy_relation_extract as sre
+
+
+def _counting_extractor(calls):
+    def extract(text, timings=None):
+        calls.append(text)
+        return [("cats", "chase", "mice")]
+    return extract
+
+
+def _with_extractor(calls):
+    original = sre.extract_relations_spacy
+    sre.extract_relations_spacy = _counting_extractor(calls)
+    return original
+
+
+def test_repeated_sentences_are_parsed_once():
+    calls = []
+    original = _with_extractor(calls)
+    size = sre.RELATION_CACHE_SIZE
+    sre.clear_relation_cache()
+    try:
+        first = sre.extract_relations("Cats chase mice.")
+        second = sre.extract_relations("Cats chase mice.")
+        assert first == second == [("cat", "chase", "mouse")]
+        assert calls == ["Cats chase mice."]
+        second.append("changed")
+        assert sre.extract_relations("Cats chase mice.") == first
+
+        info = sre.relation_cache_info()
+        assert (info["hits"], info["misses"], info["size"]) == (2, 1, 1)
+        assert abs(info["hit_ratio"] - 2 / 3) < 1e-9
+
+        # Least recently used sentences are evicted
+        sre.RELATION_CACHE_SIZE = 2
+        for text in ("One page header.", "Another footer.", "Cats chase mice."):
+            sre.extract_relations(text)
+        assert sre.relation_cache_info()["size"] == 2
+        assert calls[-1] == "Cats chase mice."
+    finally:
+        sre.extract_relations_spacy = original
+        sre.RELATION_CACHE_SIZE = size
+        sre.clear_relation_cache()
+
+
+def test_disk_store_is_shared():
+    calls = []
+    original = _with_extractor(calls)
+    path = sre.RELATION_CACHE_PATH
+    with tempfile.TemporaryDirectory() as directory:
+        sre.RELATION_CACHE_PATH = os.path.join(directory, "relations.sqlite")
+        sre._relation_store = None
+        sre.clear_relation_cache()
+        try:
+            assert sre.extract_relations("Cats chase mice.") == [("cat", "chase", "mouse")]
+            # A fresh process-local cache still finds the triples on disk
+            sre.clear_relation_cache()
+            assert sre.extract_relations("Cats chase mice.") == [("cat", "chase", "mouse")]
+            assert len(calls) == 1
+            info = sre.relation_cache_info()
+            assert (info["disk_hits"], info["misses"]) == (1, 0)
+        finally:
+            sre._relation_store.close()
+            sre._relation_store = None
+            sre.RELATION_CACHE_PATH = path
+            sre.extract_relations_spacy = original
+            sre.clear_relation_cache()
+
+
+def test_store_writes_are_batched():
+    calls = []
+    original = _with_extractor(calls)
+    path, batch_size = sre.RELATION_CACHE_PATH, sre.RELATION_STORE_BATCH_SIZE
+    with tempfile.TemporaryDirectory() as directory:
+        sre.RELATION_CACHE_PATH = os.path.join(directory, "relations.sqlite")
+        sre.RELATION_STORE_BATCH_SIZE = 3
+        sre._relation_store = None
+        sre.clear_relation_cache()
+
+        def stored_rows():
+            with sqlite3.connect(sre.RELATION_CACHE_PATH) as connection:
+                return connection.execute("SELECT COUNT(*) FROM relations").fetchone()[0]
+
+        try:
+            sre.extract_relations("Cats chase mice.")
+            sre.extract_relations("Dogs chase cats.")
+            assert stored_rows() == 0
+            sre.extract_relations("Owls chase mice.")
+            assert stored_rows() == 3
+            sre.extract_relations("Foxes chase owls.")
+            sre.flush_relation_store()
+            assert stored_rows() == 4
+        finally:
+            sre._relation_store.close()
+            sre._relation_store = None
+            sre.RELATION_CACHE_PATH = path
+            sre.RELATION_STORE_BATCH_SIZE = batch_size
+            sre.extract_relations_spacy = original
+            sre.clear_relation_cache()
+
+
+def test_fallback_results_are_not_persisted():
+    original = (sre.extract_relations_spacy, sre.extract_relations_nltk, sre.is_linux, sre.SPACY_AVAILABLE)
+    path = sre.RELATION_CACHE_PATH
+    spacy_calls = []
+
+    def failing_spacy(text, timings=None):
+        spacy_calls.append(text)
+        raise RuntimeError("model busy")
+
+    def empty_spacy(text, timings=None):
+        spacy_calls.append(text)
+        return []
+
+    with tempfile.TemporaryDirectory() as directory:
+        sre.RELATION_CACHE_PATH = os.path.join(directory, "relations.sqlite")
+        sre._relation_store = None
+        sre.clear_relation_cache()
+        sre.is_linux, sre.SPACY_AVAILABLE = (lambda: True), True
+        sre.extract_relations_nltk = lambda text: [("dogs", "chase", "cats")]
+        try:
+            # A spaCy error is not cached at all: the next call tries spaCy again
+            sre.extract_relations_spacy = failing_spacy
+            assert sre.extract_relations("Dogs chase cats.") == [("dog", "chase", "cat")]
+            assert sre.extract_relations("Dogs chase cats.") == [("dog", "chase", "cat")]
+            assert len(spacy_calls) == 2
+
+            # A fallback after an empty spaCy result stays out of the shared store
+            sre.extract_relations_spacy = empty_spacy
+            sre.extract_relations("Dogs chase cats.")
+            sre.extract_relations("Dogs chase cats.")
+            assert len(spacy_calls) == 3
+            sre.clear_relation_cache()
+            with sqlite3.connect(sre.RELATION_CACHE_PATH) as connection:
+                assert connection.execute("SELECT COUNT(*) FROM relations").fetchone()[0] == 0
+        finally:
+            sre._relation_store.close()
+            sre._relation_store = None
+            sre.RELATION_CACHE_PATH = path
+            sre.extract_relations_spacy, sre.extract_relations_nltk, sre.is_linux, sre.SPACY_AVAILABLE = original
+            sre.clear_relation_cache()
+
+
+def test_extractor_version_change_clears_store():
+    calls = []
+    original = _with_extractor(calls)
+    path, version = sre.RELATION_CACHE_PATH, sre._RELATION_EXTRACTOR_VERSION
+    with tempfile.TemporaryDirectory() as directory:
+        sre.RELATION_CACHE_PATH = os.path.join(directory, "relations.sqlite")
+        sre._relation_store = None
+        sre.clear_relation_cache()
+        try:
+            sre.extract_relations("Cats chase mice.")
+            sre.clear_relation_cache()
+            sre._relation_store.close()
+            sre._relation_store = None
+            # Reopened by a newer extractor: the old triples are not served
+            sre._RELATION_EXTRACTOR_VERSION = version + 1
+            sre.extract_relations("Cats chase mice.")
+            assert len(calls) == 2
+            assert sre.relation_cache_info()["disk_hits"] == 0
+        finally:
+            sre._relation_store.close()
+            sre._relation_store = None
+            sre.RELATION_CACHE_PATH = path
+            sre._RELATION_EXTRACTOR_VERSION = version
+            sre.extract_relations_spacy = original
+            sre.clear_relation_cache()
+
+
+if __name__ == "__main__":
+    test_repeated_sentences_are_parsed_once()
+    test_disk_store_is_shared()
+    test_store_writes_are_batched()
+    test_fallback_results_are_not_persisted()
+    test_extractor_version_change_clears_store()
+    print("All relation cache tests passed!")
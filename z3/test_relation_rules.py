@@ -0,0 +1,46 @@
+import json
+from collections import Counter
+
+import inflect
+import spacy
+from spacy.tokens import Doc
+
+from relation_rules import GOLDEN_CORPUS_PATH, extract_doc_relations, get_span_for_token, load_golden_docs
+
+p = inflect.engine()
+vocab = spacy.blank("en").vocab
+
+
+def singularize(text):
+    return p.singular_noun(text) or text
+
+
+def test_golden_corpus():
+    with open(GOLDEN_CORPUS_PATH, encoding="utf-8") as handle:
+        expected = [[tuple(relation) for relation in entry["relations"]]
+                    for entry in json.load(handle)["sentences"]]
+    docs = load_golden_docs(vocab)
+    for doc, relations in zip(docs, expected):
+        assert extract_doc_relations(doc, singularize) == relations, doc.text
+
+    # All sentences as one document: the same triples (verb relations come first)
+    combined = extract_doc_relations(Doc.from_docs(docs), singularize)
+    assert Counter(combined) == Counter(relation for relations in expected for relation in relations)
+
+
+def test_noun_phrases_and_prepositions():
+    doc = Doc(vocab, words=["The", "old", "cat", "owns", "toy", "mice", "with", "stripes"],
+              pos=["DET", "ADJ", "NOUN", "VERB", "NOUN", "NOUN", "ADP", "NOUN"],
+              deps=["det", "amod", "nsubj", "ROOT", "compound", "dobj", "prep", "pobj"],
+              heads=[2, 2, 3, 3, 5, 3, 5, 6],
+              lemmas=["the", "old", "cat", "own", "toy", "mouse", "with", "stripe"])
+    assert get_span_for_token(doc[2], doc).text == "The old cat"
+    assert get_span_for_token(doc[3], doc).text == "owns"
+    assert extract_doc_relations(doc, singularize) == [("the old cat", "own", "toy mouse"),
+                                                       ("mouse", "with", "stripe")]
+
+
+if __name__ == "__main__":
+    test_golden_corpus()
+    test_noun_phrases_and_prepositions()
+    print("All relation rule tests passed!")
@@ -0,0 +1,43 @@
+import numpy as np
+
+from sentence_quality import filter_sentences, score_sentences
+
+VOCABULARY = {"solar", "panel", "reduce", "emission", "the", "cat", "chase", "mouse", "in"}
+SENTENCES = [
+    "Solar panels reduce emissions.",
+    "th e a p r o c",
+    "12.5 13.1 14.0 %% ##",
+    "The cat chases the mouse in Zurich.",
+    "x",
+]
+
+
+def test_metrics():
+    metrics = score_sentences(SENTENCES, VOCABULARY)
+    assert metrics["tokens"].tolist() == [4, 7, 5, 7, 1]
+    assert metrics["alpha_ratio"][2] == 0.0 and metrics["alpha_ratio"][1] == 1.0
+    assert np.isclose(metrics["alpha_ratio"][0], 26 / 27)
+    assert np.isclose(metrics["avg_word_length"][0], 26 / 4)
+    assert metrics["dictionary_ratio"][0] == 1.0
+    assert np.isclose(metrics["dictionary_ratio"][3], 6 / 7)
+    assert np.isnan(score_sentences(SENTENCES)["dictionary_ratio"]).all()
+
+
+def test_filter():
+    kept, report = filter_sentences(SENTENCES, VOCABULARY, threshold=0.5)
+    assert kept == [SENTENCES[0], SENTENCES[3]]
+    assert (report["scored"], report["kept"], report["dropped"]) == (5, 2, 3)
+    assert set(report["mean"]) == {"alpha_ratio", "tokens", "avg_word_length", "dictionary_ratio", "score"}
+
+    # The threshold is tunable; without a vocabulary the other metrics still score
+    assert filter_sentences(SENTENCES, VOCABULARY, threshold=0.0)[0] == SENTENCES
+    kept, report = filter_sentences(SENTENCES, threshold=0.5)
+    assert SENTENCES[0] in kept and SENTENCES[2] not in kept and SENTENCES[4] not in kept
+    assert report["mean"]["dictionary_ratio"] is None
+    assert filter_sentences([], VOCABULARY)[0] == []
+
+
+if __name__ == "__main__":
+    test_metrics()
+    test_filter()
+    print("All sentence quality tests passed!")
@@ -0,0 +1,70 @@
+import tempfile
+
+import spacy
+from spacy.language import Language
+
+import spacy_relation_extract as sre
+
+
+@Language.component("test_marker")
+def marker(doc):
+    doc.user_data["marked"] = True
+    return doc
+
+
+def _save_pipeline(directory):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("test_marker", name="ner")
+    nlp.to_disk(directory)
+
+
+def test_profiles_exclude_components():
+    with tempfile.TemporaryDirectory() as directory:
+        _save_pipeline(directory)
+        profiles = dict(sre.PIPELINE_PROFILES)
+        sre.PIPELINE_PROFILES["test-fast"] = {"model": directory, "exclude": ["ner"], "disable": []}
+        sre.PIPELINE_PROFILES["test-full"] = {"model": directory, "exclude": [], "disable": []}
+        try:
+            fast = sre.load_spacy_model("test-fast")
+            full = sre.load_spacy_model("test-full")
+            assert fast.pipe_names == ["sentencizer"]
+            assert full.pipe_names == ["sentencizer", "ner"]
+            assert sre.load_spacy_model("test-fast") is fast
+        finally:
+            sre.PIPELINE_PROFILES.clear()
+            sre.PIPELINE_PROFILES.update(profiles)
+            sre._SPACY_MODELS.pop("test-fast", None)
+            sre._SPACY_MODELS.pop("test-full", None)
+
+    try:
+        sre.load_spacy_model("no-such-profile")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_component_timings():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("test_marker")
+    texts = ["Socrates is a human.", "Humans are mortal."]
+
+    timings = {}
+    docs = sre.pipe_with_timings(nlp, texts, timings)
+    assert set(timings) == {"tokenizer", "sentencizer", "test_marker"}
+    assert all(value >= 0 for value in timings.values())
+    assert all(doc.user_data["marked"] for doc in docs)
+    assert [doc.text for doc in docs] == [doc.text for doc in nlp.pipe(texts)]
+
+    # Timings accumulate across calls and are optional
+    first = timings["tokenizer"]
+    sre.pipe_with_timings(nlp, texts, timings)
+    assert timings["tokenizer"] >= first
+    assert len(sre.pipe_with_timings(nlp, texts)) == 2
+
+
+if __name__ == "__main__":
+    test_profiles_exclude_components()
+    test_component_timings()
+    print("All spaCy profile tests passed!")
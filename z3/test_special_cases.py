@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import time
+
+import special_cases
+from special_cases import (compile_templates, get_special_case_registry, load_templates,
+                           match_special_case, reload_special_cases)
+
+
+def _write(directory, name, templates):
+    with open(os.path.join(directory, name), "w") as handle:
+        json.dump({"templates": templates}, handle)
+
+
+def _template(name, premises, conclusion):
+    return {"name": name, "when": {"premises": premises, "conclusion": conclusion},
+            "premises": [f"# {name}"], "conclusion": name}
+
+
+def test_builtin_templates():
+    registry = compile_templates(load_templates())
+    socrates = match_special_case(registry, ["All men are mortal", "Socrates is a man"],
+                                  "Socrates is mortal")
+    assert socrates["conclusion"] == "Mortal(socrates)"
+    assert match_special_case(registry, ["A bird"], "Tweety can not fly")["conclusion"] == "Not(Fly(bird))"
+    assert match_special_case(registry, ["A bird"], "Tweety can fly") is None
+    assert match_special_case(registry, ["Alice is parent of Bob"],
+                              "Alice is ancestor of Carl")["conclusion"] == "Ancestor(Alice, Charlie)"
+    # Keywords must occur within one premise
+    assert match_special_case(registry, ["greater", "than"], "x is greater than y") is None
+
+
+def test_first_template_wins_and_alternatives():
+    registry = compile_templates([
+        _template("first", ["alpha"], ["omega"]),
+        _template("second", ["alpha"], [["omega", "psi"]]),
+    ])
+    assert match_special_case(registry, ["ALPHA"], "omega")["conclusion"] == "first"
+    assert match_special_case(registry, ["alpha"], "psi")["conclusion"] == "second"
+    assert match_special_case(registry, ["beta"], "psi") is None
+
+
+def test_hot_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        _write(directory, "a.json", [_template("one", ["alpha"], ["omega"])])
+        reload_special_cases(directory)
+        registry = get_special_case_registry()
+        assert match_special_case(registry, ["alpha"], "omega")["conclusion"] == "one"
+
+        _write(directory, "b.json", [_template("two", ["beta"], ["omega"])])
+        # Make sure the modification times differ and skip the check interval
+        os.utime(os.path.join(directory, "b.json"), (time.time() + 5, time.time() + 5))
+        registry["checked"] -= special_cases.RELOAD_CHECK_INTERVAL
+        registry = get_special_case_registry()
+        assert match_special_case(registry, ["beta"], "omega")["conclusion"] == "two"
+
+        # A broken file keeps the previous templates
+        with open(os.path.join(directory, "c.json"), "w") as handle:
+            handle.write("{")
+        registry["checked"] -= special_cases.RELOAD_CHECK_INTERVAL
+        assert get_special_case_registry() is registry
+
+        # A missing directory is an error, not an empty registry
+        try:
+            reload_special_cases(os.path.join(directory, "missing"))
+            assert False, "expected FileNotFoundError"
+        except FileNotFoundError:
+            pass
+        assert get_special_case_registry() is registry
+    reload_special_cases(special_cases.TEMPLATE_DIR)
+
+
+if __name__ == "__main__":
+    test_builtin_templates()
+    test_first_template_wins_and_alternatives()
+    test_hot_reload()
+    print("All special case tests passed!")
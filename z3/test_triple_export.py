@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import pyarrow as pa
+
+from triple_export import TripleWriter, read_triples, relations_to_arrow_stream, write_triples
+
+RELATIONS = [
+    {"subject": "sun", "relation": "emit", "object": "light", "source_sentence": "The sun emits light and heat."},
+    {"subject": "sun", "relation": "emit", "object": "heat", "source_sentence": "The sun emits light and heat."},
+    {"subject": "moon", "relation": "orbit", "object": "earth", "source_sentence": "The moon orbits the earth."},
+    {"subject": "earth", "relation": "orbit", "object": "sun"},
+]
+
+
+def _rows(table):
+    return [(row["subject"], row["relation"], row["object"], row["sentence"], row["document"])
+            for row in table.to_pylist()]
+
+
+EXPECTED = [(r["subject"], r["relation"], r["object"], r.get("source_sentence"), "solar.pdf") for r in RELATIONS]
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("triples.arrow", "triples.parquet"):
+            path = os.path.join(directory, name)
+            # A small batch size writes several batches with growing dictionaries
+            with TripleWriter(path, batch_size=3) as writer:
+                writer.write(RELATIONS[:2], document="solar.pdf")
+                writer.write(RELATIONS[2:], document="solar.pdf")
+            assert writer.rows == 4
+            table = read_triples(path)
+            assert _rows(table) == EXPECTED, name
+            assert all(pa.types.is_dictionary(field.type) for field in table.schema)
+            assert read_triples(path, columns=["subject"]).column_names == ["subject"]
+
+
+def test_sentences_stored_once():
+    table = pa.ipc.open_stream(relations_to_arrow_stream(RELATIONS, "solar.pdf")).read_all()
+    sentences = table.column("sentence").combine_chunks()
+    assert sentences.dictionary.to_pylist() == ["The sun emits light and heat.", "The moon orbits the earth."]
+    assert sentences.indices.to_pylist() == [0, 0, 1, None]
+    assert table.column("subject").combine_chunks().dictionary.to_pylist() == ["sun", "moon", "earth"]
+
+
+def test_arrow_file_is_memory_mapped():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "triples.arrow")
+        write_triples(path, RELATIONS * 100, document="solar.pdf")
+        pool = pa.default_memory_pool()
+        before = pool.bytes_allocated()
+        table = read_triples(path)
+        assert table.num_rows == 400
+        assert pool.bytes_allocated() == before
+        try:
+            TripleWriter(path, file_format="csv")
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_sentences_stored_once()
+    test_arrow_file_is_memory_mapped()
+    print("All triple export tests passed!")
@@ -0,0 +1,109 @@
+import numpy as np
+
+from triple_store import TripleStore
+
+RELATIONS = [
+    {"subject": "sun", "relation": "emit", "object": "light", "source_sentence": "The sun emits light and heat."},
+    {"subject": "sun", "relation": "emit", "object": "heat", "source_sentence": "The sun emits light and heat."},
+    {"subject": "moon", "relation": "orbit", "object": "earth", "source_sentence": "The moon orbits the earth."},
+    {"subject": "sun", "relation": "emit", "object": "light", "source_sentence": "Stars like the sun emit light."},
+    {"subject": "sun", "relation": "emit", "object": "light", "source_sentence": "The sun emits light and heat."},
+    {"subject": "earth", "relation": "orbit", "object": "sun"},
+]
+
+
+def _store():
+    store = TripleStore()
+    store.add_many(RELATIONS)
+    return store
+
+
+def test_deduplicates_with_counts_and_postings():
+    store = _store()
+    assert store.occurrences == 6
+    assert len(store) == 4
+    # Distinct triples keep the order of their first occurrence
+    assert store.records() == [
+        {"subject": "sun", "relation": "emit", "object": "light", "count": 3,
+         "source_sentences": ["The sun emits light and heat.", "Stars like the sun emit light."]},
+        {"subject": "sun", "relation": "emit", "object": "heat", "count": 1,
+         "source_sentences": ["The sun emits light and heat."]},
+        {"subject": "moon", "relation": "orbit", "object": "earth", "count": 1,
+         "source_sentences": ["The moon orbits the earth."]},
+        {"subject": "earth", "relation": "orbit", "object": "sun", "count": 1, "source_sentences": []},
+    ]
+    compacted = store.compact()
+    assert compacted["triples"].dtype == np.int32
+    assert compacted["triples"].shape == (4, 3)
+    # Terms are interned once whatever their role
+    assert store.terms.count("sun") == 1
+    assert len(store.sentences) == 3
+
+
+def test_top_triples_and_relations():
+    store = _store()
+    top = store.top_triples(2)
+    assert [(t["subject"], t["object"], t["count"]) for t in top] == [("sun", "light", 3), ("sun", "heat", 1)]
+    assert store.top_triples(0) == []
+    assert len(store.top_triples(10)) == 4
+    assert store.top_relations(5) == [{"relation": "emit", "count": 4}, {"relation": "orbit", "count": 2}]
+    assert store.top_relations(1) == [{"relation": "emit", "count": 4}]
+
+
+def test_entity_triples():
+    store = _store()
+    assert [t["object"] for t in store.entity_triples("sun", role="subject")] == ["light", "heat"]
+    assert [t["subject"] for t in store.entity_triples("sun", role="object")] == ["earth"]
+    assert len(store.entity_triples("sun")) == 3
+    assert store.entity_triples("earth", role="object", with_sentences=True)[0]["source_sentences"] == [
+        "The moon orbits the earth."]
+    assert store.entity_triples("mars") == []
+    try:
+        store.entity_triples("sun", role="verb")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_add_after_compact():
+    store = _store()
+    assert len(store) == 4
+    store.add("moon", "orbit", "earth", "The moon orbits the earth.")
+    store.add("mars", "orbit", "sun")
+    assert len(store) == 5
+    assert store.top_triples(2)[1]["count"] == 2
+
+
+def test_packed_and_row_keys_agree():
+    import triple_store
+
+    rng = np.random.default_rng(0)
+    store = TripleStore()
+    for subject, relation, obj, sentence in rng.integers(0, 20, size=(2000, 4)).tolist():
+        store.add(f"e{subject}", f"r{relation % 3}", f"e{obj}", f"s{sentence}")
+    packed = store.records()
+    limit = triple_store._PACKED_TERM_LIMIT
+    try:
+        triple_store._PACKED_TERM_LIMIT = 0
+        store._compacted = None
+        assert store.records() == packed
+    finally:
+        triple_store._PACKED_TERM_LIMIT = limit
+
+
+def test_empty_store():
+    store = TripleStore()
+    assert len(store) == 0
+    assert store.records() == []
+    assert store.top_triples(3) == []
+    assert store.top_relations(3) == []
+
+
+if __name__ == "__main__":
+    test_deduplicates_with_counts_and_postings()
+    test_top_triples_and_relations()
+    test_entity_triples()
+    test_add_after_compact()
+    test_packed_and_row_keys_agree()
+    test_empty_store()
+    print("All triple store tests passed!")
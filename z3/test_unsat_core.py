@@ -0,0 +1,40 @@
+from z3 import Reals
+
+from unsat_core import explain_unsat
+
+
+def test_core_names_conflicting_constraints():
+    x, y = Reals('x y')
+    result = explain_unsat([x > 1, y > 1, x < 0, y < 5])
+    assert result["status"] == "unsat"
+    assert result["core"] == [0, 2]
+
+
+def test_minimized_core():
+    x, y = Reals('x y')
+    result = explain_unsat([x + y > 10, x < 3, y < 3, x > 0, x < 2], minimize=True)
+    assert result["core"] == [0, 2, 4]
+    assert result["minimal"]
+
+
+def test_satisfiable_constraints_have_no_core():
+    x, = Reals('x')
+    assert explain_unsat([x > 1, x < 3])["status"] == "sat"
+
+
+
+def test_python_bool_constraints():
+    # "1 < 2" or "False" evaluate to Python bools rather than Z3 expressions
+    x = Reals("x")[0]
+    result = explain_unsat([True, x > 1, False], minimize=True)
+    assert (result["status"], result["core"], result["minimal"]) == ("unsat", [2], True)
+    assert explain_unsat([1 < 2])["status"] == "sat"
+    assert explain_unsat([False])["core"] == [0]
+
+
+if __name__ == "__main__":
+    test_core_names_conflicting_constraints()
+    test_minimized_core()
+    test_satisfiable_constraints_have_no_core()
+    test_python_bool_constraints()
+    print("All unsat core tests passed!")
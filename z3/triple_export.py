@@ -0,0 +1,146 @@
+"""
+Columnar export of extracted relations as Arrow or Parquet.
+
+Every column of a triple table is dictionary-encoded (int32 indices into a
+table of distinct strings):
+
+    subject, relation, object   the triple terms
+    sentence                    the source sentence, stored once however many
+                                triples come from it
+    document                    optional source document
+
+``TripleWriter`` interns terms as relations arrive and writes a record batch
+every ``batch_size`` rows.  Dictionaries only grow, so later Arrow batches
+carry dictionary deltas instead of repeating earlier terms; Parquet stores one
+dictionary page per row group.  ``read_triples`` memory-maps the file, so Arrow
+files are loaded without copying.
+
+    with TripleWriter("relations.arrow") as writer:
+        writer.write(relations, document="report.pdf")
+    table = read_triples("relations.arrow")
+"""
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+COLUMNS = ("subject", "relation", "object", "sentence", "document")
+# Relation dictionary key for each column
+_SOURCE_KEYS = {"subject": "subject", "relation": "relation", "object": "object",
+                "sentence": "source_sentence", "document": "document"}
+FORMATS = ("arrow", "arrow-stream", "parquet")
+DEFAULT_BATCH_SIZE = 65536
+
+SCHEMA = pa.schema([(column, pa.dictionary(pa.int32(), pa.string())) for column in COLUMNS])
+
+
+def _format_for(path, file_format):
+    if file_format is not None:
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown triple export format '{file_format}'")
+        return file_format
+    if isinstance(path, str) and path.endswith(".parquet"):
+        return "parquet"
+    return "arrow"
+
+
+class TripleWriter:
+    """Stream relation dictionaries into a dictionary-encoded Arrow or Parquet file."""
+
+    def __init__(self, sink, file_format=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        :param sink: File path or writable pyarrow/Python file object.
+        :param file_format: "arrow" (IPC file), "arrow-stream" (IPC stream) or
+                            "parquet"; by default inferred from the path suffix.
+        :param batch_size: Rows per record batch / row group.
+        """
+        self.format = _format_for(sink, file_format)
+        self.batch_size = batch_size
+        self.terms = {column: {} for column in COLUMNS}
+        self.pending = {column: [] for column in COLUMNS}
+        self.rows = 0
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(sink, SCHEMA)
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            open_writer = pa.ipc.new_file if self.format == "arrow" else pa.ipc.new_stream
+            self._writer = open_writer(sink, SCHEMA, options=options)
+
+    def _intern(self, column, value):
+        terms = self.terms[column]
+        index = terms.get(value)
+        if index is None:
+            index = terms[value] = len(terms)
+        return index
+
+    def write(self, relations, document=None):
+        """
+        Add relations.
+        :param relations: Dictionaries with subject, relation, object and
+                          optionally source_sentence and document.
+        :param document: Document name used for relations without a "document" key.
+        """
+        for relation in relations:
+            for column in COLUMNS:
+                value = relation.get(_SOURCE_KEYS[column], document if column == "document" else None)
+                self.pending[column].append(-1 if value is None else self._intern(column, value))
+            if len(self.pending["subject"]) >= self.batch_size:
+                self._write_batch()
+
+    def _write_batch(self):
+        count = len(self.pending["subject"])
+        if not count:
+            return
+        arrays = []
+        for column in COLUMNS:
+            indices = np.array(self.pending[column], dtype=np.int32)
+            dictionary = pa.array(list(self.terms[column]), type=pa.string())
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(indices, mask=indices < 0), dictionary))
+            self.pending[column] = []
+        self._writer.write_batch(pa.record_batch(arrays, schema=SCHEMA))
+        self.rows += count
+
+    def close(self):
+        """Write the remaining rows and finish the file."""
+        self._write_batch()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def write_triples(sink, relations, file_format=None, document=None):
+    """
+    Write relations in one call.
+    :return: Number of rows written.
+    """
+    with TripleWriter(sink, file_format) as writer:
+        writer.write(relations, document)
+    return writer.rows
+
+
+def relations_to_arrow_stream(relations, document=None):
+    """Serialize relations as Arrow IPC stream bytes (e.g. for an HTTP response)."""
+    stream = pa.BufferOutputStream()
+    write_triples(stream, relations, "arrow-stream", document)
+    return stream.getvalue().to_pybytes()
+
+
+def read_triples(path, columns=None):
+    """
+    Read a triple file written by TripleWriter.
+    :param path: .parquet file, or an Arrow IPC file or stream.
+    :param columns: Optional subset of columns.
+    :return: pyarrow Table with dictionary-encoded columns, backed by a memory map.
+    """
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns, memory_map=True, read_dictionary=list(columns or COLUMNS))
+    source = pa.memory_map(path)
+    try:
+        table = pa.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        source.seek(0)
+        table = pa.ipc.open_stream(source).read_all()
+    return table.select(columns) if columns else table
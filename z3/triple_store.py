@@ -0,0 +1,185 @@
+"""
+Interned, array-backed store for aggregating extracted triples in process.
+
+Terms (subjects, relations, objects) and sentences are interned once into
+string tables; every occurrence of a triple is appended as four int32 ids
+(subject, relation, object, sentence) to a flat buffer that is viewed as NumPy
+columns, so a document run holds 16 bytes per occurrence instead of a
+dictionary of strings.  ``compact`` deduplicates the occurrences with one ``np.unique`` pass
+into distinct triples with occurrence counts and CSR sentence postings; queries
+(top-k, per-entity lookups) work on those columns and only turn the selected
+rows back into strings.
+
+    store = TripleStore()
+    store.add_many(relations)              # dictionaries as returned by extract_pdf_relations
+    store.top_triples(10)
+    store.entity_triples("sun")
+"""
+from array import array
+
+import numpy as np
+
+_NO_SENTENCE = -1
+# Below this many terms a triple's three ids are packed into one int64 key (21 bits each)
+_PACKED_TERM_LIMIT = 1 << 21
+
+
+class TripleStore:
+    """Deduplicating triple store backed by interned int32 NumPy columns."""
+
+    def __init__(self):
+        self.term_ids = {}
+        self.terms = []
+        self.sentence_ids = {}
+        self.sentences = []
+        # Flat (subject, relation, object, sentence) ids, four per occurrence
+        self._occurrences = array("i")
+        self._compacted = None
+
+    def _intern(self, value):
+        term_id = self.term_ids.get(value)
+        if term_id is None:
+            term_id = self.term_ids[value] = len(self.terms)
+            self.terms.append(value)
+        return term_id
+
+    def _intern_sentence(self, sentence):
+        if sentence is None:
+            return _NO_SENTENCE
+        sentence_id = self.sentence_ids.get(sentence)
+        if sentence_id is None:
+            sentence_id = self.sentence_ids[sentence] = len(self.sentences)
+            self.sentences.append(sentence)
+        return sentence_id
+
+    def add(self, subject, relation, obj, sentence=None):
+        """Record one occurrence of a triple, optionally with its source sentence."""
+        self._occurrences.extend((self._intern(subject), self._intern(relation),
+                                  self._intern(obj), self._intern_sentence(sentence)))
+        self._compacted = None
+
+    def add_many(self, relations):
+        """Record relation dictionaries (subject, relation, object, optional source_sentence)."""
+        for relation in relations:
+            self.add(relation["subject"], relation["relation"], relation["object"],
+                     relation.get("source_sentence"))
+
+    @property
+    def occurrences(self):
+        """Number of triple occurrences added, duplicates included."""
+        return len(self._occurrences) // 4
+
+    def compact(self):
+        """
+        Deduplicate the occurrences (cached until the next add).
+        :return: Dictionary of NumPy arrays: triples (n x 3 term ids, in order of
+                 first occurrence), counts, and postings_offsets / postings (sentence
+                 ids of triple i are postings[postings_offsets[i]:postings_offsets[i + 1]]).
+        """
+        if self._compacted is not None:
+            return self._compacted
+        occurrences = np.frombuffer(self._occurrences, dtype=np.int32).reshape(-1, 4)
+        ids = occurrences[:, :3].astype(np.int64)
+        if len(self.terms) <= _PACKED_TERM_LIMIT:
+            # One int64 key per triple sorts much faster than np.unique over rows
+            keys = (ids[:, 0] << 42) | (ids[:, 1] << 21) | ids[:, 2]
+            _, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True,
+                                                  return_counts=True)
+        else:
+            _, first, inverse, counts = np.unique(ids, axis=0, return_index=True, return_inverse=True,
+                                                  return_counts=True)
+        # Renumber distinct triples by first occurrence so results follow input order
+        order = np.argsort(first, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        triple_of = rank[inverse.ravel()]
+
+        # Distinct (triple, sentence) pairs, grouped by triple
+        sentences = occurrences[:, 3]
+        has_sentence = sentences != _NO_SENTENCE
+        pairs = np.unique((triple_of[has_sentence].astype(np.int64) << 32) | sentences[has_sentence])
+        postings_offsets = np.zeros(len(order) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(pairs >> 32, minlength=len(order)), out=postings_offsets[1:])
+
+        self._compacted = {
+            "triples": occurrences[first[order], :3].copy(),
+            "counts": counts[order].astype(np.int32),
+            "postings_offsets": postings_offsets,
+            "postings": (pairs & 0xFFFFFFFF).astype(np.int32),
+        }
+        return self._compacted
+
+    def __len__(self):
+        return len(self.compact()["triples"])
+
+    def _records(self, rows, with_sentences=False):
+        compacted = self.compact()
+        terms = self.terms
+        records = []
+        for row in rows.tolist():
+            subject, relation, obj = compacted["triples"][row].tolist()
+            record = {
+                "subject": terms[subject],
+                "relation": terms[relation],
+                "object": terms[obj],
+                "count": int(compacted["counts"][row]),
+            }
+            if with_sentences:
+                start, end = compacted["postings_offsets"][row:row + 2].tolist()
+                record["source_sentences"] = [self.sentences[i] for i in compacted["postings"][start:end].tolist()]
+            records.append(record)
+        return records
+
+    def records(self, with_sentences=True):
+        """Return every distinct triple as a dictionary with its count (and sentences)."""
+        return self._records(np.arange(len(self)), with_sentences)
+
+    def top_triples(self, k, with_sentences=False):
+        """Return the k most frequent distinct triples, most frequent first."""
+        counts = self.compact()["counts"]
+        k = min(k, len(counts))
+        if k <= 0:
+            return []
+        rows = np.argpartition(-counts, k - 1)[:k]
+        rows = rows[np.lexsort((rows, -counts[rows]))]
+        return self._records(rows, with_sentences)
+
+    def top_relations(self, k):
+        """Return the k most frequent relation labels with their occurrence counts."""
+        compacted = self.compact()
+        totals = np.bincount(compacted["triples"][:, 1], weights=compacted["counts"], minlength=len(self.terms))
+        ranked = np.lexsort((np.arange(len(totals)), -totals))[:k]
+        return [{"relation": self.terms[term], "count": int(totals[term])}
+                for term in ranked.tolist() if totals[term] > 0]
+
+    def entity_triples(self, entity, role="any", with_sentences=False):
+        """
+        Return the distinct triples in which an entity occurs.
+        :param entity: Subject or object term.
+        :param role: "subject", "object" or "any".
+        """
+        if role not in ("subject", "object", "any"):
+            raise ValueError(f"Unknown entity role '{role}'")
+        term = self.term_ids.get(entity)
+        if term is None:
+            return []
+        triples = self.compact()["triples"]
+        if role == "subject":
+            mask = triples[:, 0] == term
+        elif role == "object":
+            mask = triples[:, 2] == term
+        else:
+            mask = (triples[:, 0] == term) | (triples[:, 2] == term)
+        return self._records(np.flatnonzero(mask), with_sentences)
+
+    def nbytes(self):
+        """Approximate memory held by the arrays and string tables, in bytes."""
+        import sys
+
+        strings = sum(sys.getsizeof(term) for term in self.terms) + sum(sys.getsizeof(s) for s in self.sentences)
+        tables = sys.getsizeof(self.term_ids) + sys.getsizeof(self.sentence_ids)
+        tables += sys.getsizeof(self.terms) + sys.getsizeof(self.sentences)
+        arrays = self._occurrences.itemsize * len(self._occurrences)
+        if self._compacted is not None:
+            arrays += sum(array.nbytes for array in self._compacted.values())
+        return strings + tables + arrays
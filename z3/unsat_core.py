@@ -0,0 +1,90 @@
+"""
+Unsat-core extraction for the shared constraint solver.
+
+Constraints are re-asserted on a scratch solver with ``assert_and_track``
+labels so an unsatisfiable set can report which constraints conflict.  An
+optional deletion-based minimization pass shrinks the core within a time
+budget by re-checking subsets of the labels as assumptions.  Tracked labels
+are always assumed by ``check()``, so that pass asserts ``Implies(label, c)``
+on a second solver and passes the label subset explicitly.
+"""
+import time
+
+from z3 import Bool, BoolVal, Implies, Solver, is_expr, main_ctx, unknown, unsat
+
+# Default wall-clock budget for core minimization in milliseconds
+DEFAULT_CORE_BUDGET_MS = 2000
+
+
+def _label_name(index):
+    return f"__constraint_{index}"
+
+
+def _core_subset(s, labels):
+    """Return the labels (in their original order) that appear in the last unsat core."""
+    core_names = {str(label) for label in s.unsat_core()}
+    return [label for label in labels if str(label) in core_names]
+
+
+def explain_unsat(terms, minimize=False, budget_ms=DEFAULT_CORE_BUDGET_MS):
+    """
+    Find the constraints responsible for unsatisfiability.
+    :param terms: Z3 boolean constraints, in the order they were added.
+    :param minimize: Shrink the core further with deletion-based minimization.
+    :param budget_ms: Time budget for the minimization pass.
+    :return: Dictionary with the status, the indices of the core constraints,
+             whether the core is known to be minimal, and the number of checks.
+    """
+    if not terms:
+        return {"status": "sat", "core": [], "minimal": True, "checks": 0}
+
+    # Constraints such as "1 < 2" evaluate to plain Python bools
+    ctx = next((term.ctx for term in terms if is_expr(term)), None)
+    if ctx is None:
+        ctx = main_ctx()
+    terms = [term if is_expr(term) else BoolVal(bool(term), ctx) for term in terms]
+
+    s = Solver(ctx=ctx)
+    labels = []
+    index_by_label = {}
+    for index, term in enumerate(terms):
+        label = Bool(_label_name(index), ctx)
+        s.assert_and_track(term, label)
+        labels.append(label)
+        index_by_label[_label_name(index)] = index
+
+    result = s.check()
+    checks = 1
+    if result != unsat:
+        return {"status": str(result), "core": [], "minimal": False, "checks": checks}
+
+    core = _core_subset(s, labels)
+    minimal = False
+
+    if minimize:
+        s = Solver(ctx=ctx)
+        for label, term in zip(labels, terms):
+            s.add(Implies(label, term))
+        deadline = time.monotonic() + budget_ms / 1000.0
+        position = 0
+        undecided = False
+        while position < len(core):
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                break
+            s.set("timeout", remaining_ms)
+            candidate = core[:position] + core[position + 1:]
+            outcome = s.check(*candidate)
+            checks += 1
+            if outcome == unsat:
+                # Dropping this constraint keeps the conflict; keep the (possibly
+                # even smaller) core Z3 reports for the candidate set.
+                core = _core_subset(s, candidate)
+            else:
+                if outcome == unknown:
+                    undecided = True
+                position += 1
+        minimal = position >= len(core) and not undecided
+
+    core_indices = sorted(index_by_label[str(label)] for label in core)
+    return {"status": "unsat", "core": core_indices, "minimal": minimal, "checks": checks}
@@ -1,9 +1,27 @@
 # processing.py - Z3 Processing Functions
 from z3 import *
+import importlib.util
+import sys
 import traceback
 import re
+from pathlib import Path
 from typing import List, Dict, Tuple
 
+
+def _load_model_serialization():
+    """Load the backend's model serializer one directory up by file path (sys.path is left alone)."""
+    module = sys.modules.get("model_serialization")
+    if module is None:
+        path = Path(__file__).resolve().parent.parent / "model_serialization.py"
+        spec = importlib.util.spec_from_file_location("model_serialization", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["model_serialization"] = module
+    return module
+
+
+serialize_model = _load_model_serialization().serialize_model
+
 # Import NLTK for natural language processing
 try:
     import nltk
@@ -54,11 +72,8 @@ def solve_equation(equation: str) -> dict:
 
         # Check satisfiability
         if s.check() == sat:
-            model = s.model()
-            result = {}
-            for var in locals_dict:
-                if var in [decl.name() for decl in model.decls()]:
-                    result[var] = str(model[locals_dict[var]])
+            result = serialize_model(s.model(), locals_dict)
+            result = {var: value for var, value in result.items() if value is not None}
 
             return {
                 "status": "satisfiable",
@@ -1,71 +1,42 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from z3 import *
 from flask import request, Blueprint, flash, json
 from flask_cors import CORS
 import json
 import traceback
 import re
-import PyPDF2
 # Import the relation extraction functions
-from spacy_relation_extract import extract_relations, is_linux, SPACY_AVAILABLE
+from spacy_relation_extract import extract_relations, is_linux, relation_cache_info, SPACY_AVAILABLE
+from premise_compiler import compile_premises, compile_conclusion, compiled_cache_info
+import knowledge_base
+from batch_solver import solve_batch, iter_solve_batch, DEFAULT_ITEM_TIMEOUT_MS
+from unsat_core import explain_unsat, DEFAULT_CORE_BUDGET_MS
+from model_serialization import serialize_model, format_assignments
+from nl_analysis import analyze_sentence, AnalysisCache
+from nlp_resources import get_nlp_resources
+from keyword_matcher import hit_positions, first_position
+from special_cases import (TEMPLATE_DIR as SPECIAL_CASES_DIR, get_special_case_registry, match_special_case,
+                           reload_special_cases, special_cases_info)
+from entity_index import entity_index_info
+from pdf_pipeline import (clean_pdf_text, collect_pdf_relations, extract_pdf_relations, read_pdf_pages,
+                          split_pdf_sentences)
 import mongo_client  # Import the MongoDB client module instead of Neo4j
 
+# Arrow export of extracted relations is optional
+try:
+    from triple_export import relations_to_arrow_stream
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 # Flag to skip NLTK package check and downloads
 SKIP_NLTK_CHECK = True
 
 # Import NLTK for natural language processing
 import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.tag import pos_tag
-from nltk.chunk import RegexpParser, ne_chunk
 from nltk.tree import Tree
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import words as _nltk_words_corpus
 import os,sys
 
-# Build an English vocabulary set for PDF word-fragment repair.
-# Loaded once at startup so PDF requests are fast.
-try:
-    nltk.download('words', quiet=True)
-    _ENGLISH_VOCAB = set(w.lower() for w in _nltk_words_corpus.words())
-except Exception:
-    _ENGLISH_VOCAB = set()
-
-# Compile the reusable suffix+morpheme merge pattern once.
-# Group A: recognised English suffixes (ed, ing, tion …)
-# Group B: Latin/Greek-derived bound morphemes that PyPDF2 frequently splits
-#           (cess, ther, tial, ture, ance, ence, ward, wise, hood, ship …)
-_SUFFIX_PAT = re.compile(
-    r'(\b\w{3,})\s+'
-    r'(ed|ing|tion|ation|sion|ment|ness|ity|ies|ive'
-    r'|ous|ful|less|able|ible|ize|ise|ized|ised|izing|ising|ers|er'
-    r'|cess|ther|tial|ture|ance|ence|ward|wise|ship|hood'
-    r'|ling|ling|age|ary|ory|ory|ure|ure|al|ance)\b'
-)
-
-def _repair_word_spaces(text):
-    """
-    Merge adjacent token-pairs where PDF font-encoding inserted a spurious
-    space inside a word.  Strategy: if left+right concatenation is a valid
-    English word AND at least one side alone is NOT a valid English word,
-    collapse the space.  Only operates on short, all-alpha tokens.
-    """
-    def _try_merge(m):
-        left, right = m.group(1).lower(), m.group(2).lower()
-        merged = left + right
-        # Merge if the joined form is a valid English word AND long enough that
-        # it's unlikely to be two intentional separate words.
-        # Min length 5 guards against short false-positives like 'in to' → 'into'
-        # while still catching 'pro cess' (7), 'fur ther' (7), 'Clas s' (5), etc.
-        if merged in _ENGLISH_VOCAB and len(merged) >= 5:
-            return m.group(1) + m.group(2)  # preserve original casing
-        return m.group(0)  # leave unchanged
-
-    # Allow single-char right fragments ('Clas s' → 'Class', 'sys tem' → 'system')
-    return re.sub(r'\b([a-zA-Z]{2,6}) ([a-zA-Z]{1,7})\b', _try_merge, text)
-
-
 #os.chdir("/home/wiffzack/backend/relation_extraction/relation_extractor")
 
 # Download necessary NLTK data only if not skipping
@@ -107,7 +78,8 @@ CORS(app, resources={r"/*": {"origins": "*"}})  # Enable CORS for all routes wit
 solver_context = {
     'solver': None,
     'variables': {},
-    'constraints': []
+    'constraints': [],
+    'terms': []
 }
 
 def reset_solver_context():
@@ -115,6 +87,7 @@ def reset_solver_context():
     solver_context['solver'] = Solver()
     solver_context['variables'] = {}
     solver_context['constraints'] = []
+    solver_context['terms'] = []
     return solver_context
 
 # Initialize the solver context
@@ -145,10 +118,16 @@ def calculator(equation: str) -> str:
         print(e)
         return "Invalid equation"
 
-def solve_equation(equation: str) -> str:
+def solve_equation(equation: str, ctx=None, timeout_ms=None, variables=None,
+                   number_format="default", compact=False) -> str:
     """
     Calculate the result of an equation.
     :param equation: The equation to calculate.
+    :param ctx: Optional Z3 context, used by batch workers that each own one.
+    :param timeout_ms: Optional solver timeout in milliseconds.
+    :param variables: Optional subset of variable names to report.
+    :param number_format: "default", "exact" or "decimal" (see model_serialization).
+    :param compact: Report "x=1,y=2" instead of "x = 1, y = 2".
     """
 
     try:
@@ -164,10 +143,12 @@ def solve_equation(equation: str) -> str:
         
         # Create Z3 variables in the local scope
         for entry in single_cache:
-            locals_dict[entry] = Real(entry)
+            locals_dict[entry] = Real(entry, ctx)
         
         # Create solver
-        s = Solver()
+        s = Solver(ctx=ctx)
+        if timeout_ms:
+            s.set("timeout", int(timeout_ms))
         
         # Split constraints by comma
         constraints = equation.split(',')
@@ -176,12 +157,14 @@ def solve_equation(equation: str) -> str:
             s.add(eval(constraint.strip(), globals(), locals_dict))
         
         # Check satisfiability
-        if s.check() == sat:
-            model = s.model()
-            result = ", ".join([f"{var} = {model[locals_dict[var]]}" for var in locals_dict])
-            return f"Solution found: {result}"
-        else:
+        result = s.check()
+        if result == sat:
+            assignments = serialize_model(s.model(), variables or locals_dict, number_format)
+            return f"Solution found: {format_assignments(assignments, compact)}"
+        elif result == unsat:
             return "No solution exists for the given constraints"
+        else:
+            return f"Unknown - Z3 could not determine satisfiability ({s.reason_unknown()})"
     except Exception as e:
         print(f"Error: {e}")
         traceback.print_exc()
@@ -240,21 +223,22 @@ def prove_theorem(premises, conclusion):
             try:
                 # Execute each premise in the context
                 exec(premise, globals(), locals_dict)
-                # Store any new variables/functions in our context
-                for key, value in locals_dict.items():
-                    if key not in ['s', 'Object'] and key not in globals():
-                        if isinstance(value, FuncDeclRef):
-                            context['functions'][key] = value
-                        elif isinstance(value, ExprRef):
-                            context['variables'][key] = value
-                        elif isinstance(value, SortRef):
-                            context['sorts'][key] = value
-                        elif isinstance(value, ConstRef):
-                            context['constants'][key] = value
             except Exception as e:
                 print(f"Error executing premise '{premise}': {e}")
                 traceback.print_exc()
                 return f"Error in premise '{premise}': {str(e)}"
+
+        # Store the new variables/functions in our context once all premises ran
+        for key, value in locals_dict.items():
+            if key not in ['s', 'Object'] and key not in globals():
+                if isinstance(value, FuncDeclRef):
+                    context['functions'][key] = value
+                elif isinstance(value, ExprRef):
+                    context['variables'][key] = value
+                elif isinstance(value, SortRef):
+                    context['sorts'][key] = value
+                elif isinstance(value, ConstRef):
+                    context['constants'][key] = value
             
         # Test the conclusion through refutation
         try:
@@ -266,29 +250,60 @@ def prove_theorem(premises, conclusion):
             return f"Error in conclusion '{conclusion}': {str(e)}"
         
         # Check if the conclusion follows from the premises
-        result = locals_dict.get('s').check()
-        
-        if result == unsat:
-            return "Theorem proven: The conclusion follows from the premises."
-        elif result == sat:
-            model = locals_dict.get('s').model()
-            # Create a more informative counterexample message
-            counterexample = []
-            for decl in model.decls():
-                name = decl.name()
-                value = model[decl]
-                counterexample.append(f"{name} = {value}")
-            
-            counterexample_str = ", ".join(counterexample)
-            return f"Theorem not proven: Found a counterexample. {counterexample_str}"
-        else:
-            return "The theorem proof is undetermined."
+        return proof_result_message(locals_dict.get('s'))
             
     except Exception as e:
         print(f"Error: {e}")
         traceback.print_exc()
         return f"Error proving theorem: {str(e)}"
 
+def proof_result_message(solver):
+    """
+    Check a solver holding premises plus the negated conclusion and describe the outcome.
+    :param solver: Solver with the negated conclusion asserted.
+    :return: Result of the proof attempt.
+    """
+    result = solver.check()
+
+    if result == unsat:
+        return "Theorem proven: The conclusion follows from the premises."
+    elif result == sat:
+        # Create a more informative counterexample message
+        counterexample_str = format_assignments(serialize_model(solver.model()))
+        return f"Theorem not proven: Found a counterexample. {counterexample_str}"
+    else:
+        return "The theorem proof is undetermined."
+
+def prove_theorem_declarative(premises, conclusion, premise_format="json"):
+    """
+    Prove a theorem from structured (JSON) or SMT-LIB2 premises without exec.
+    :param premises: JSON premise document or SMT-LIB2 text, see premise_compiler.
+    :param conclusion: Conclusion as a JSON term or SMT-LIB2 term.
+    :param premise_format: "json" or "smt2".
+    :return: Result of the proof attempt.
+    """
+    try:
+        compiled = compile_premises(premises, premise_format)
+    except (ValueError, KeyError, Z3Exception) as e:
+        print(f"Error compiling premises: {e}")
+        return f"Error in premises: {str(e)}"
+
+    try:
+        negated_conclusion = Not(compile_conclusion(conclusion, compiled))
+    except (ValueError, Z3Exception) as e:
+        print(f"Error compiling conclusion '{conclusion}': {e}")
+        return f"Error in conclusion '{conclusion}': {str(e)}"
+
+    try:
+        s = Solver()
+        s.add(compiled['assertions'])
+        s.add(negated_conclusion)
+        return proof_result_message(s)
+    except Exception as e:
+        print(f"Error: {e}")
+        traceback.print_exc()
+        return f"Error proving theorem: {str(e)}"
+
 def natural_language_to_logic(premises, conclusion):
     """
     Convert natural language premises and conclusion to Z3 logic.
@@ -298,8 +313,12 @@ def natural_language_to_logic(premises, conclusion):
     """
     try:
         # Special case handling for common examples
-        if handle_special_cases(premises, conclusion):
-            return handle_special_cases(premises, conclusion)
+        special_case = handle_special_cases(premises, conclusion)
+        if special_case:
+            return special_case
+
+        # Tokenize, tag and chunk each sentence once; every stage below reads these
+        analyses = AnalysisCache()
             
         # For other cases, continue with NLP approach
         converted_premises = []
@@ -319,17 +338,19 @@ def natural_language_to_logic(premises, conclusion):
         # Extract semantic relations from all premises
         semantic_relations = []
         for premise in premises:
-            semantic_relations.extend(extract_semantic_relations(premise))
+            semantic_relations.extend(extract_semantic_relations(premise, analyses.get(premise)))
         
         # Also extract from conclusion
-        semantic_relations.extend(extract_semantic_relations(conclusion))
+        semantic_relations.extend(extract_semantic_relations(conclusion, analyses.get(conclusion)))
         
         # Pre-process premises to extract entities and predicates
         for premise in premises:
-            extract_entities_and_predicates(premise, entities, predicates, relations)
+            extract_entities_and_predicates(premise, entities, predicates, relations,
+                                            analyses.get(premise))
         
         # Also extract from conclusion
-        extract_entities_and_predicates(conclusion, entities, predicates, relations)
+        extract_entities_and_predicates(conclusion, entities, predicates, relations,
+                                        analyses.get(conclusion))
         
         # Add relation types from semantic relations
         for _, rel_type, _ in semantic_relations:
@@ -415,10 +436,12 @@ def natural_language_to_logic(premises, conclusion):
         # Process premises using traditional method as fallback
         for premise in premises:
             process_premise(premise, converted_premises, entities, predicates, relations, 
-                           defined_functions, defined_constants, defined_relations)
+                           defined_functions, defined_constants, defined_relations,
+                           analyses.get(premise))
         
         # Process conclusion
-        converted_conclusion = process_conclusion(conclusion, entities, predicates, relations)
+        converted_conclusion = process_conclusion(conclusion, entities, predicates, relations,
+                                                  analyses.get(conclusion))
         
         # Ensure we have a valid conclusion
         if not converted_conclusion:
@@ -437,121 +460,35 @@ def natural_language_to_logic(premises, conclusion):
 def handle_special_cases(premises, conclusion):
     """
     Handle special cases with predefined patterns.
+    The templates are loaded from special_case_templates/ (see special_cases.py).
     :param premises: List of natural language premise statements.
     :param conclusion: Natural language conclusion statement.
     :return: Dictionary with converted premises and conclusion, or None if no special case matches.
     """
-    # Socrates example
-    if any("socrates" in premise.lower() for premise in premises) and "mortal" in conclusion.lower():
-        return {
-            "premises": [
-                "Object = DeclareSort('Object')",
-                "Human = Function('Human', Object, BoolSort())",
-                "Mortal = Function('Mortal', Object, BoolSort())",
-                "socrates = Const('socrates', Object)",
-                "x = Const('x', Object)",
-                "s.add(ForAll([x], Implies(Human(x), Mortal(x))))",
-                "s.add(Human(socrates))"
-            ],
-            "conclusion": "Mortal(socrates)"
-        }
-    
-    # Bird/fly example with negation
-    if any("bird" in premise.lower() for premise in premises) and "not" in conclusion.lower() and "fly" in conclusion.lower():
-        return {
-            "premises": [
-                "Object = DeclareSort('Object')",
-                "Bird = Function('Bird', Object, BoolSort())",
-                "Fly = Function('Fly', Object, BoolSort())",
-                "bird = Const('bird', Object)",
-                "x = Const('x', Object)",
-                "s.add(ForAll([x], Implies(Bird(x), Fly(x))))",
-                "s.add(Bird(bird))"
-            ],
-            "conclusion": "Not(Fly(bird))"
-        }
-    
-    # Set theory example
-    if any("subset" in premise.lower() for premise in premises) and "element" in conclusion.lower():
-        return {
-            "premises": [
-                "Object = DeclareSort('Object')",
-                "Set = DeclareSort('Set')",
-                "ElementOf = Function('ElementOf', Object, Set, BoolSort())",
-                "SubsetOf = Function('SubsetOf', Set, Set, BoolSort())",
-                "x = Const('x', Object)",
-                "A = Const('A', Set)",
-                "B = Const('B', Set)",
-                "s.add(SubsetOf(A, B))",
-                "s.add(ElementOf(x, A))",
-                "s.add(ForAll([x], ForAll([A, B], Implies(And(ElementOf(x, A), SubsetOf(A, B)), ElementOf(x, B)))))"
-            ],
-            "conclusion": "ElementOf(x, B)"
-        }
-    
-    # Transitivity example
-    if any("greater than" in premise.lower() for premise in premises) and "greater than" in conclusion.lower():
-        return {
-            "premises": [
-                "Object = DeclareSort('Object')",
-                "GreaterThan = Function('GreaterThan', Object, Object, BoolSort())",
-                "A = Const('A', Object)",
-                "B = Const('B', Object)",
-                "C = Const('C', Object)",
-                "x = Const('x', Object)",
-                "y = Const('y', Object)",
-                "z = Const('z', Object)",
-                "s.add(GreaterThan(A, B))",
-                "s.add(GreaterThan(B, C))",
-                "s.add(ForAll([x, y, z], Implies(And(GreaterThan(x, y), GreaterThan(y, z)), GreaterThan(x, z))))"
-            ],
-            "conclusion": "GreaterThan(A, C)"
-        }
-    
-    # Family relations example
-    if any("parent" in premise.lower() for premise in premises) and ("ancestor" in conclusion.lower() or "parent" in conclusion.lower()):
-        return {
-            "premises": [
-                "Object = DeclareSort('Object')",
-                "Person = DeclareSort('Person')",
-                "Parent = Function('Parent', Person, Person, BoolSort())",
-                "Ancestor = Function('Ancestor', Person, Person, BoolSort())",
-                "x = Const('x', Person)",
-                "y = Const('y', Person)",
-                "z = Const('z', Person)",
-                "Alice = Const('Alice', Person)",
-                "Bob = Const('Bob', Person)",
-                "Charlie = Const('Charlie', Person)",
-                "s.add(Parent(Alice, Bob))",
-                "s.add(Parent(Bob, Charlie))",
-                "s.add(ForAll([x, y], Implies(Parent(x, y), Ancestor(x, y))))",
-                "s.add(ForAll([x, y, z], Implies(And(Ancestor(x, y), Ancestor(y, z)), Ancestor(x, z))))"
-            ],
-            "conclusion": "Ancestor(Alice, Charlie)"
-        }
-    
-    return None
+    return match_special_case(get_special_case_registry(), premises, conclusion)
 
-def extract_entities_and_predicates(text, entities, predicates, relations):
+def extract_entities_and_predicates(text, entities, predicates, relations, analysis=None):
     """
     Extract entities, predicates, and relations from text using advanced NLTK features.
     :param text: Text to analyze.
     :param entities: Set to store identified entities.
     :param predicates: Set to store identified predicates.
     :param relations: Set to store identified relations.
+    :param analysis: Optional result of analyze_sentence(text) to reuse.
     """
-    # Initialize lemmatizer for normalizing words
-    lemmatizer = WordNetLemmatizer()
+    if analysis is None:
+        analysis = analyze_sentence(text)
     
-    # Get stopwords to filter out common words
-    stop_words = set(stopwords.words('english'))
+    resources = get_nlp_resources()
+    stop_words = resources['stop_words']
+    quantifiers = resources['quantifiers']
     
-    # Tokenize and tag parts of speech
-    tokens = word_tokenize(text.lower())
-    tagged = pos_tag(tokens)
+    # Tokens and parts of speech
+    tagged = analysis['tagged']
+    lemmas = analysis['lemmas']
     
     # Named Entity Recognition
-    chunked = ne_chunk(tagged)
+    chunked = analysis['chunks']
     
     # Extract named entities
     for subtree in chunked:
@@ -564,27 +501,19 @@ def extract_entities_and_predicates(text, entities, predicates, relations):
     # Extract common nouns as entities
     for i, (word, tag) in enumerate(tagged):
         # Skip stopwords and quantifiers
-        if word in stop_words or word in ['all', 'every', 'some', 'any']:
+        if word in stop_words or word in quantifiers:
             continue
             
         # Add nouns as entities
         if tag.startswith('NN'):
-            lemma = lemmatizer.lemmatize(word, 'n')
-            entities.add(lemma)
+            entities.add(lemmas[i])
         
         # Add verbs and adjectives as predicates
         elif tag.startswith('VB') or tag.startswith('JJ'):
-            lemma = lemmatizer.lemmatize(word, 'v' if tag.startswith('VB') else 'a')
-            predicates.add(lemma)
+            predicates.add(lemmas[i])
     
-    # Define patterns for chunking to identify relations
-    grammar = r"""
-        Relation: {<NN.*><VB.*><NN.*>}                 # Noun-Verb-Noun pattern
-                 {<NN.*><IN><NN.*>}                    # Noun-Preposition-Noun pattern
-                 {<NN.*><JJ.*><NN.*>}                  # Noun-Adjective-Noun pattern
-        """
-    chunk_parser = RegexpParser(grammar)
-    chunked_relations = chunk_parser.parse(tagged)
+    # Chunk relation patterns with the precompiled grammar
+    chunked_relations = resources['chunk_parser'].parse(tagged)
     
     # Extract relations from chunks
     for subtree in chunked_relations:
@@ -610,21 +539,16 @@ def extract_entities_and_predicates(text, entities, predicates, relations):
                 if subject in entities and object in entities:
                     relations.add(relation)
     
-    # Look for common relation phrases
-    relation_phrases = ["greater than", "less than", "equal to", "parent of", "child of", 
-                       "subset of", "element of", "member of", "belongs to", "contains",
-                       "includes", "part of", "related to", "connected to", "linked to"]
-    for phrase in relation_phrases:
-        if phrase in text.lower():
-            relations.add(phrase)
+    # Common relation phrases found by the keyword scan
+    relations.update(phrase for _, _, phrase in analysis['hits']['relation'])
             
     # Look for "is a" and "is an" patterns which indicate class membership
     is_a_pattern = r"\b(is|are) (a|an|the)\b"
-    if re.search(is_a_pattern, text.lower()):
+    if re.search(is_a_pattern, analysis['lower']):
         relations.add("is_a")
 
 def process_premise(premise, converted_premises, entities, predicates, relations, 
-                   defined_functions, defined_constants, defined_relations):
+                   defined_functions, defined_constants, defined_relations, analysis=None):
     """
     Process a single premise and convert it to Z3 logic.
     :param premise: Natural language premise statement.
@@ -635,33 +559,38 @@ def process_premise(premise, converted_premises, entities, predicates, relations
     :param defined_functions: Set of already defined functions.
     :param defined_constants: Set of already defined constants.
     :param defined_relations: Set of already defined relations.
+    :param analysis: Optional result of analyze_sentence(premise) to reuse.
     """
-    tokens = word_tokenize(premise.lower())
-    tagged = pos_tag(tokens)
+    if analysis is None:
+        analysis = analyze_sentence(premise)
+    tokens = analysis['tokens']
+    tagged = analysis['tagged']
+    hits = analysis['hits']
     
     # Process different types of statements
-    if "all" in tokens or "every" in tokens or "any" in tokens:
+    if hits['universal']:
         process_universal_statement(premise, tokens, tagged, converted_premises, 
                                    entities, predicates, defined_functions, defined_constants)
     
-    elif "some" in tokens or "exists" in tokens or "there is" in tokens or "there are" in tokens:
+    elif hits['existential']:
         process_existential_statement(premise, tokens, tagged, converted_premises, 
                                      entities, predicates, defined_functions, defined_constants)
     
-    elif "is" in tokens or "are" in tokens:
+    elif hits['copula']:
         process_is_statement(premise, tokens, tagged, converted_premises, 
                            entities, predicates, relations, 
                            defined_functions, defined_constants, defined_relations)
     
-    elif "if" in tokens and "then" in tokens:
+    elif hits['condition'] and hits['consequence']:
         process_implication_statement(premise, tokens, tagged, converted_premises, 
                                      entities, predicates, relations, 
                                      defined_functions, defined_constants, defined_relations)
     
-    elif "not" in tokens or "don't" in tokens or "doesn't" in tokens or "isn't" in tokens or "aren't" in tokens:
+    elif hits['negation']:
         process_negation_statement(premise, tokens, tagged, converted_premises, 
                                   entities, predicates, relations, 
-                                  defined_functions, defined_constants, defined_relations)
+                                  defined_functions, defined_constants, defined_relations,
+                                  analysis)
     
     # Add more statement types as needed
 
@@ -881,10 +810,13 @@ def process_implication_statement(premise, tokens, tagged, converted_premises,
 
 def process_negation_statement(premise, tokens, tagged, converted_premises, 
                              entities, predicates, relations, 
-                             defined_functions, defined_constants, defined_relations):
+                             defined_functions, defined_constants, defined_relations,
+                             analysis=None):
     """Process negation statements like 'X is not Y'"""
+    if analysis is None:
+        analysis = analyze_sentence(premise)
     # Use the advanced negation detection
-    negation_info = detect_negation_patterns(premise)
+    negation_info = detect_negation_patterns(premise, analysis)
     
     if negation_info["has_negation"]:
         if negation_info["negation_type"] == "predicate" and negation_info["negated_entity"] and negation_info["negated_predicate"]:
@@ -958,8 +890,7 @@ def process_negation_statement(premise, tokens, tagged, converted_premises,
         else:
             # Fall back to the simple approach for other cases
             # Find negation words
-            negation_indices = [i for i, token in enumerate(tokens) 
-                              if token in ["not", "don't", "doesn't", "isn't", "aren't"]]
+            negation_indices = hit_positions(analysis['hits'], 'negation')
             
             if negation_indices:
                 neg_index = negation_indices[0]
@@ -996,47 +927,47 @@ def process_negation_statement(premise, tokens, tagged, converted_premises,
         # No negation detected, fall back to other statement types
         pass
 
-def process_conclusion(conclusion, entities, predicates, relations):
+def process_conclusion(conclusion, entities, predicates, relations, analysis=None):
     """
     Process the conclusion and convert it to Z3 logic.
     :param conclusion: Natural language conclusion statement.
     :param entities: Set of identified entities.
     :param predicates: Set of identified predicates.
     :param relations: Set of identified relations.
+    :param analysis: Optional result of analyze_sentence(conclusion) to reuse.
     :return: Converted conclusion as Z3 logic.
     """
-    tokens = word_tokenize(conclusion.lower())
-    tagged = pos_tag(tokens)
+    if analysis is None:
+        analysis = analyze_sentence(conclusion)
+    tokens = analysis['tokens']
+    hits = analysis['hits']
     
     # Process negation in conclusion
-    if "not" in tokens or "don't" in tokens or "doesn't" in tokens or "isn't" in tokens or "aren't" in tokens:
-        neg_indices = [i for i, token in enumerate(tokens) 
-                      if token in ["not", "don't", "doesn't", "isn't", "aren't"]]
+    neg_index = first_position(hits, 'negation')
+    if neg_index is not None:
+        # Find subject (before negation)
+        subj = None
+        for i in range(neg_index):
+            if tokens[i] in entities:
+                subj = tokens[i]
+                break
         
-        if neg_indices:
-            neg_index = neg_indices[0]
-            
-            # Find subject (before negation)
-            subj = None
-            for i in range(neg_index):
-                if tokens[i] in entities:
-                    subj = tokens[i]
-                    break
-            
-            # Find predicate (after negation)
-            pred = None
-            for i in range(neg_index + 1, len(tokens)):
-                if tokens[i] in predicates:
-                    pred = tokens[i]
-                    break
-            
-            if subj and pred:
-                capitalized_pred = pred.capitalize()
-                return f"Not({capitalized_pred}({subj}))"
+        # Find predicate (after negation)
+        pred = None
+        for i in range(neg_index + 1, len(tokens)):
+            if tokens[i] in predicates:
+                pred = tokens[i]
+                break
+        
+        if subj and pred:
+            capitalized_pred = pred.capitalize()
+            return f"Not({capitalized_pred}({subj}))"
     
     # Process "is" statements in conclusion
-    if "is" in tokens or "are" in tokens:
-        is_index = tokens.index("is") if "is" in tokens else tokens.index("are")
+    if hits['copula']:
+        is_index = first_position(hits, 'copula', 'is')
+        if is_index is None:
+            is_index = first_position(hits, 'copula', 'are')
         
         # Get entity before "is"
         subj = None
@@ -1075,15 +1006,17 @@ def process_conclusion(conclusion, entities, predicates, relations):
     # Default case: return a simple True
     return "True"
 
-def extract_semantic_relations(text):
+def extract_semantic_relations(text, analysis=None):
     """
     Extract semantic relations from text using dependency parsing and pattern matching.
     :param text: Input text to analyze
+    :param analysis: Optional result of analyze_sentence(text) to reuse
     :return: List of (subject, relation, object) tuples
     """
-    # Tokenize and tag the text
-    tokens = word_tokenize(text.lower())
-    tagged = pos_tag(tokens)
+    # Tokenized and tagged text
+    if analysis is None:
+        analysis = analyze_sentence(text)
+    tagged = analysis['tagged']
     
     # Initialize results
     relations = []
@@ -1153,15 +1086,19 @@ def extract_semantic_relations(text):
     
     return relations
 
-def detect_negation_patterns(text):
+def detect_negation_patterns(text, analysis=None):
     """
     Detect complex negation patterns in natural language.
     :param text: Input text to analyze
+    :param analysis: Optional result of analyze_sentence(text) to reuse
     :return: Dictionary with negation information
     """
-    # Tokenize and tag the text
-    tokens = word_tokenize(text.lower())
-    tagged = pos_tag(tokens)
+    # Tokenized and tagged text
+    if analysis is None:
+        analysis = analyze_sentence(text)
+    tokens = analysis['tokens']
+    tagged = analysis['tagged']
+    hits = analysis['hits']
     
     # Initialize results
     result = {
@@ -1172,53 +1109,48 @@ def detect_negation_patterns(text):
         "negated_relation": None
     }
     
-    # Direct negation words
-    negation_words = ["not", "no", "never", "none", "neither", "nor", "nothing", "nowhere"]
+    # Direct negation words, negative verbs and contractions, in text order
+    negation_positions = sorted(set(hit_positions(hits, 'negation')) |
+                                set(hit_positions(hits, 'negative')))
     
-    # Negative verbs and contractions
-    negative_verbs = ["isn't", "aren't", "wasn't", "weren't", "don't", "doesn't", 
-                     "didn't", "won't", "wouldn't", "can't", "cannot", "couldn't"]
-    
-    # Check for direct negation words
-    for i, (word, tag) in enumerate(tagged):
-        if word in negation_words or word in negative_verbs:
-            result["has_negation"] = True
+    for i in negation_positions:
+        result["has_negation"] = True
+        
+        # Determine negation type and what's being negated
+        if i > 0 and i < len(tagged) - 1:
+            # Check if negating a predicate (verb/adjective)
+            if tagged[i+1][1].startswith('VB') or tagged[i+1][1].startswith('JJ'):
+                result["negation_type"] = "predicate"
+                result["negated_predicate"] = tagged[i+1][0]
+                
+                # Look for the subject being negated
+                for j in range(i-1, -1, -1):
+                    if tagged[j][1].startswith('NN'):
+                        result["negated_entity"] = tagged[j][0]
+                        break
             
-            # Determine negation type and what's being negated
-            if i > 0 and i < len(tagged) - 1:
-                # Check if negating a predicate (verb/adjective)
-                if tagged[i+1][1].startswith('VB') or tagged[i+1][1].startswith('JJ'):
-                    result["negation_type"] = "predicate"
-                    result["negated_predicate"] = tagged[i+1][0]
+            # Check if negating an entity (noun)
+            elif tagged[i+1][1].startswith('NN'):
+                result["negation_type"] = "entity"
+                result["negated_entity"] = tagged[i+1][0]
+            
+            # Check for relation negation (X is not related to Y)
+            elif i > 1 and i+2 < len(tagged):
+                if (tagged[i-2][1].startswith('NN') and 
+                    tagged[i-1][0] in ["is", "are"] and
+                    tagged[i+1][0] in ["related", "connected", "linked"] and
+                    tagged[i+2][0] == "to" and
+                    i+3 < len(tagged) and tagged[i+3][1].startswith('NN')):
                     
-                    # Look for the subject being negated
-                    for j in range(i-1, -1, -1):
-                        if tagged[j][1].startswith('NN'):
-                            result["negated_entity"] = tagged[j][0]
-                            break
-                
-                # Check if negating an entity (noun)
-                elif tagged[i+1][1].startswith('NN'):
-                    result["negation_type"] = "entity"
-                    result["negated_entity"] = tagged[i+1][0]
-                
-                # Check for relation negation (X is not related to Y)
-                elif i > 1 and i+2 < len(tagged):
-                    if (tagged[i-2][1].startswith('NN') and 
-                        tagged[i-1][0] in ["is", "are"] and
-                        tagged[i+1][0] in ["related", "connected", "linked"] and
-                        tagged[i+2][0] == "to" and
-                        i+3 < len(tagged) and tagged[i+3][1].startswith('NN')):
-                        
-                        result["negation_type"] = "relation"
-                        result["negated_relation"] = f"{tagged[i+1][0]}_to"
-                        result["negated_entity"] = tagged[i-2][0]
-                        result["negated_object"] = tagged[i+3][0]
+                    result["negation_type"] = "relation"
+                    result["negated_relation"] = f"{tagged[i+1][0]}_to"
+                    result["negated_entity"] = tagged[i-2][0]
+                    result["negated_object"] = tagged[i+3][0]
     
     # Check for "neither X nor Y" pattern
-    if "neither" in tokens and "nor" in tokens:
-        neither_idx = tokens.index("neither")
-        nor_idx = tokens.index("nor")
+    if hits['neither'] and hits['nor']:
+        neither_idx = first_position(hits, 'neither')
+        nor_idx = first_position(hits, 'nor')
         
         if neither_idx < nor_idx and neither_idx + 1 < len(tokens) and nor_idx + 1 < len(tokens):
             result["has_negation"] = True
@@ -1249,13 +1181,51 @@ def create_solver():
         cache = request.get_data()
         cache_json = json.loads(cache)
         equation = cache_json['equation']
-        result = solve_equation(equation)
+        result = solve_equation(
+            equation,
+            variables=cache_json.get('variables'),
+            number_format=cache_json.get('number_format', 'default'),
+            compact=cache_json.get('compact', False)
+        )
         return jsonify({"message": str(result)}), 200
     except Exception as e:
         print(f"Error in create_solver: {e}")
         traceback.print_exc()
         return jsonify({"message": f"Error: {str(e)}"}), 400
 
+@app.route('/solver/batch', methods=['POST'])
+def solve_batch_endpoint():
+    """
+    Solve many independent equation strings in one request.
+    Body: {"problems": [...], "timeout_ms": 5000, "stream": false}. Results keep the
+    input order; with "stream": true they are sent as NDJSON lines as they complete.
+    """
+    try:
+        data = request.json
+        problems = data.get('problems', [])
+        timeout_ms = int(data.get('timeout_ms', DEFAULT_ITEM_TIMEOUT_MS))
+
+        if not problems or not isinstance(problems, list):
+            return jsonify({"message": "No problems provided"}), 400
+
+        equations = [p['equation'] if isinstance(p, dict) else p for p in problems]
+
+        if data.get('stream', False):
+            def generate():
+                for index, result in iter_solve_batch(equations, solve_equation, timeout_ms):
+                    yield json.dumps({"index": index, "message": str(result)}) + "\n"
+            return Response(generate(), mimetype='application/x-ndjson')
+
+        results = solve_batch(equations, solve_equation, timeout_ms)
+        return jsonify({
+            "count": len(results),
+            "results": [{"index": i, "message": str(r)} for i, r in enumerate(results)]
+        }), 200
+    except Exception as e:
+        print(f"Error in solve_batch: {e}")
+        traceback.print_exc()
+        return jsonify({"message": f"Error: {str(e)}"}), 400
+
 @app.route('/add_constraint', methods=['POST'])
 def add_constraint():
     try:
@@ -1283,8 +1253,10 @@ def add_constraint():
         
         # Add the constraint to the solver
         locals_dict = {**solver_context['variables']}
-        solver_context['solver'].add(eval(constraint.strip(), globals(), locals_dict))
+        term = eval(constraint.strip(), globals(), locals_dict)
+        solver_context['solver'].add(term)
         solver_context['constraints'].append(constraint)
+        solver_context['terms'].append(term)
         
         return jsonify({
             "message": "Constraint added", 
@@ -1298,7 +1270,14 @@ def add_constraint():
 
 @app.route('/check_satisfiability', methods=['POST'])
 def check_satisfiability():
+    """
+    Check the shared constraints. Optional body: {"unsat_core": true} to report the
+    conflicting constraints when unsat, "minimize_core": true to shrink that core
+    and "core_budget_ms" to bound the minimization.
+    """
     try:
+        options = request.get_json(silent=True) or {}
+
         # Ensure we have a solver
         if not solver_context['solver']:
             return jsonify({"message": "No constraints have been added yet"}), 400
@@ -1308,10 +1287,8 @@ def check_satisfiability():
         
         if result == sat:
             model = solver_context['solver'].model()
-            assignments = {}
-            for var_name, var in solver_context['variables'].items():
-                if var in model:
-                    assignments[var_name] = str(model[var])
+            assignments = serialize_model(model, solver_context['variables'])
+            assignments = {name: value for name, value in assignments.items() if value is not None}
             
             return jsonify({
                 "message": "Satisfiable",
@@ -1319,10 +1296,16 @@ def check_satisfiability():
                 "constraints": solver_context['constraints']
             }), 200
         elif result == unsat:
-            return jsonify({
+            response = {
                 "message": "Unsatisfiable - no solution exists for the given constraints",
                 "constraints": solver_context['constraints']
-            }), 200
+            }
+            if options.get('unsat_core') or options.get('minimize_core'):
+                response.update(unsat_core_payload(
+                    options.get('minimize_core', False),
+                    options.get('core_budget_ms', DEFAULT_CORE_BUDGET_MS)
+                ))
+            return jsonify(response), 200
         else:
             return jsonify({
                 "message": "Unknown - Z3 could not determine satisfiability",
@@ -1333,6 +1316,16 @@ def check_satisfiability():
         traceback.print_exc()
         return jsonify({"message": f"Error checking satisfiability: {str(e)}"}), 400
 
+def unsat_core_payload(minimize=False, budget_ms=DEFAULT_CORE_BUDGET_MS):
+    """Explain an unsat shared context by the constraints in its unsat core."""
+    explanation = explain_unsat(solver_context['terms'], minimize, budget_ms)
+    return {
+        "unsat_core": [solver_context['constraints'][i] for i in explanation['core']],
+        "unsat_core_indices": explanation['core'],
+        "core_minimal": explanation['minimal'],
+        "core_checks": explanation['checks']
+    }
+
 @app.route('/reset_solver', methods=['POST'])
 def reset_solver_endpoint():
     try:
@@ -1349,6 +1342,8 @@ def theorem_prover_endpoint():
         data = request.json
         premises = data.get('premises', [])
         conclusion = data.get('conclusion', '')
+        # "python" (exec'd statements, default), "json" or "smt2"
+        premise_format = data.get('format', 'json' if isinstance(premises, dict) else 'python')
         
         if not premises:
             return jsonify({"message": "No premises provided"}), 400
@@ -1356,13 +1351,72 @@ def theorem_prover_endpoint():
         if not conclusion:
             return jsonify({"message": "No conclusion provided"}), 400
         
-        result = prove_theorem(premises, conclusion)
+        if premise_format == 'python':
+            result = prove_theorem(premises, conclusion)
+        else:
+            result = prove_theorem_declarative(premises, conclusion, premise_format)
         return jsonify({"message": str(result)}), 200
     except Exception as e:
         print(f"Error in theorem prover: {e}")
         traceback.print_exc()
         return jsonify({"message": f"Error proving theorem: {str(e)}"}), 400
 
+@app.route('/knowledge_base', methods=['POST'])
+def register_knowledge_base_endpoint():
+    """Register a premise set once so many conclusions can be checked against it."""
+    try:
+        data = request.json
+        premises = data.get('premises', [])
+        premise_format = data.get('format', 'json' if isinstance(premises, dict) else 'python')
+
+        if not premises:
+            return jsonify({"message": "No premises provided"}), 400
+
+        kb_id = knowledge_base.register_knowledge_base(premises, premise_format)
+        return jsonify({
+            "message": "Knowledge base registered",
+            **knowledge_base.knowledge_base_info(kb_id)
+        }), 200
+    except ValueError as e:
+        return jsonify({"message": f"Error registering knowledge base: {str(e)}"}), 400
+    except Exception as e:
+        print(f"Error registering knowledge base: {e}")
+        traceback.print_exc()
+        return jsonify({"message": f"Error registering knowledge base: {str(e)}"}), 400
+
+@app.route('/knowledge_base/<kb_id>/prove', methods=['POST'])
+def prove_with_knowledge_base_endpoint(kb_id):
+    """Check one ("conclusion") or many ("conclusions") conclusions against a knowledge base."""
+    try:
+        data = request.json
+        conclusions = data.get('conclusions')
+        if conclusions is None:
+            conclusion = data.get('conclusion')
+            conclusions = [conclusion] if conclusion else []
+
+        if not conclusions:
+            return jsonify({"message": "No conclusion provided"}), 400
+
+        results = knowledge_base.prove_conclusions(kb_id, conclusions)
+        return jsonify({"kb_id": kb_id, "results": results}), 200
+    except KeyError as e:
+        return jsonify({"message": str(e)}), 404
+    except Exception as e:
+        print(f"Error proving with knowledge base: {e}")
+        traceback.print_exc()
+        return jsonify({"message": f"Error proving theorem: {str(e)}"}), 400
+
+@app.route('/knowledge_base/<kb_id>', methods=['GET', 'DELETE'])
+def knowledge_base_endpoint(kb_id):
+    try:
+        if request.method == 'DELETE':
+            if not knowledge_base.delete_knowledge_base(kb_id):
+                return jsonify({"message": f"Unknown knowledge base '{kb_id}'"}), 404
+            return jsonify({"message": "Knowledge base deleted", "kb_id": kb_id}), 200
+        return jsonify(knowledge_base.knowledge_base_info(kb_id)), 200
+    except KeyError as e:
+        return jsonify({"message": str(e)}), 404
+
 @app.route('/convert_natural_language', methods=['POST'])
 def convert_natural_language_endpoint():
     try:
@@ -1389,6 +1443,17 @@ def convert_natural_language_endpoint():
         traceback.print_exc()
         return jsonify({"message": f"Error converting natural language: {str(e)}"}), 400
 
+@app.route('/special_cases/reload', methods=['POST'])
+def reload_special_cases_endpoint():
+    """Re-read the special-case template files without restarting the server"""
+    try:
+        # Always the configured directory: the request body cannot choose a path on the server
+        return jsonify(reload_special_cases(SPECIAL_CASES_DIR)), 200
+    except Exception as e:
+        print(f"Error reloading special cases: {e}")
+        traceback.print_exc()
+        return jsonify({"message": f"Error reloading special cases: {str(e)}"}), 400
+
 @app.route('/status', methods=['GET'])
 def status():
     """Return the current status of the solver context"""
@@ -1400,7 +1465,11 @@ def status():
             "status": "active" if solver_context['solver'] else "inactive",
             "constraints_count": constraints_count,
             "variables_count": variables_count,
-            "constraints": solver_context['constraints']
+            "constraints": solver_context['constraints'],
+            "premise_cache": compiled_cache_info(),
+            "relation_cache": relation_cache_info(),
+            "entity_index": entity_index_info(),
+            "special_cases": special_cases_info()
         }), 200
     except Exception as e:
         print(f"Error getting status: {e}")
@@ -1421,8 +1490,9 @@ def extract_relations_endpoint():
         
         print(f"Extracting relations from: '{sentence}'")
         
-        # Extract relations
-        relations = extract_relations(sentence)
+        # Extract relations, timing each pipeline component
+        timings = {}
+        relations = extract_relations(sentence, timings)
         
         # Format the response
         formatted_relations = []
@@ -1445,7 +1515,8 @@ def extract_relations_endpoint():
         return jsonify({
             "method": method,
             "relations": formatted_relations,
-            "sentence": sentence
+            "sentence": sentence,
+            "timings_ms": timings
         }), 200
     except Exception as e:
         print(f"Error extracting relations: {e}")
@@ -1472,82 +1543,50 @@ def extract_relations_from_pdf_endpoint():
         print(f"Extracting relations from PDF: '{file.filename}'")
         
         # Read the PDF file
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            except Exception as e:
-                print(f"Warning: Could not extract text from a page in {file.filename}: {e}")
-            
-        # ── PDF text cleanup ──────────────────────────────────────────────────
-        # 0. Strip inline citation references like [2], [19], [64] from raw text
-        text = re.sub(r'\[\d+\]', ' ', text)
-        # 1. Rejoin words broken by a hyphen + newline  "environ-\nment" → "environment"
-        text = re.sub(r'-\n', '', text)
-        # 2. Rejoin words broken by a hyphen + space   "nec- essary" → "necessary"
-        text = re.sub(r'(\w)-\s+(\w)', r'\1\2', text)
-        # 3. Replace remaining newlines with spaces
-        text = text.replace('\n', ' ')
-        # 4. Rejoin word fragments split by PDF font-encoding artefacts
-        #    Pass A: suffix-only patterns (fast regex, covers ~80 % of cases)
-        text = _SUFFIX_PAT.sub(r'\1\2', text)
-        #    Pass B: dictionary-backed merge for arbitrary mid-word spaces
-        #    e.g. "fur ther" → "further", "pro cess" → "process", "th e" → "the"
-        if _ENGLISH_VOCAB:
-            text = _repair_word_spaces(text)
-        # 5. Insert a missing space when a word is fused to the next via a period
-        #    e.g. "mitigation.science" → "mitigation. science"
-        text = re.sub(r'([a-z]{3,})\.([a-zA-Z]{3,})', r'\1. \2', text)
-        # 6. Collapse multiple whitespace characters into a single space
-        text = re.sub(r' {2,}', ' ', text).strip()
-        # ─────────────────────────────────────────────────────────────────────
+        pages = read_pdf_pages(file, file.filename)
+
+        # Drop headers/footers, references and tables, then repair PDF text artefacts
+        text, removed_chars = clean_pdf_text(pages)
+        print(f"Removed {removed_chars['removed']} of {removed_chars['input']} characters "
+              f"(headers/footers, references, tables)")
 
         # Split into sentences using NLTK
-        sentences = sent_tokenize(text)
+        sentences = split_pdf_sentences(text)
         print(f"Extracted {len(sentences)} sentences from PDF.")
 
-        def _is_meaningful(token):
-            """Return True if a token is a meaningful word (not punctuation, not 1-2 chars)."""
-            token = token.strip()
-            if len(token) <= 2:
-                return False
-            # Reject tokens that are only punctuation/symbols/digits
-            if re.match(r'^[^a-zA-Z]+$', token):
-                return False
-            # Reject phrases that don't start with a letter (PDF number/bracket artifacts)
-            if not token[0].isalpha():
-                return False
-            # Reject unrealistically long noun phrases (> 6 words = noise)
-            if len(token.split()) > 6:
-                return False
-            # Reject multi-word phrases where any component word is ≤ 2 chars
-            # (indicates a spurious space inserted mid-word by the PDF extractor,
-            # e.g. 'th e', 'a p').
-            words_in_phrase = token.split()
-            if len(words_in_phrase) > 1 and any(len(w) <= 2 for w in words_in_phrase):
-                return False
-            return True
-
-        all_relations = []
-        for sentence in sentences:
-            if len(sentence.strip()) > 10:  # Skip very short fragments
-                relations = extract_relations(sentence)
-                for subj, rel, obj in relations:
-                    # Filter out garbage relations with meaningless tokens
-                    if _is_meaningful(subj) and _is_meaningful(rel) and _is_meaningful(obj):
-                        all_relations.append({
-                            "subject": subj,
-                            "relation": rel,
-                            "object": obj,
-                            "source_sentence": sentence
-                        })
-        
-        # Include method information
+        timings = {}
+        threshold = request.form.get('quality_threshold', type=float)
         method = "spaCy" if is_linux() and SPACY_AVAILABLE else "NLTK"
-        
+
+        # Aggregated response: distinct triples with counts from an interned TripleStore
+        if request.form.get('aggregate', '').lower() in ('1', 'true', 'yes'):
+            store, sentence_quality = collect_pdf_relations(sentences, quality_threshold=threshold,
+                                                            timings=timings)
+            print(f"Found {store.occurrences} relations in PDF, {len(store)} distinct.")
+            return jsonify({
+                "method": method,
+                "sentences_processed": len(sentences),
+                "relations": store.records(),
+                "occurrences": store.occurrences,
+                "top_relations": store.top_relations(10),
+                "filename": file.filename,
+                "timings_ms": timings,
+                "relation_cache": relation_cache_info(),
+                "removed_chars": removed_chars,
+                "sentence_quality": sentence_quality
+            }), 200
+
+        all_relations, sentence_quality = extract_pdf_relations(sentences, threshold, timings)
+        print(f"Parsed {sentence_quality['kept']} sentences, "
+              f"{sentence_quality['dropped']} below quality {sentence_quality['threshold']}.")
+
+        # Columnar response: dictionary-encoded Arrow stream, each sentence stored once
+        if request.form.get('format') == 'arrow':
+            if not ARROW_AVAILABLE:
+                return jsonify({"message": "pyarrow is not installed. Install it to export Arrow."}), 400
+            return Response(relations_to_arrow_stream(all_relations, file.filename),
+                            mimetype='application/vnd.apache.arrow.stream')
+
         print(f"Found {len(all_relations)} relations in PDF:")
         for relation in all_relations[:5]: # print first 5 for debug
             print(f"  {relation['subject']} --[{relation['relation']}]--> {relation['object']}")
@@ -1558,7 +1597,11 @@ def extract_relations_from_pdf_endpoint():
             "method": method,
             "sentences_processed": len(sentences),
             "relations": all_relations,
-            "filename": file.filename
+            "filename": file.filename,
+            "timings_ms": timings,
+            "relation_cache": relation_cache_info(),
+            "removed_chars": removed_chars,
+            "sentence_quality": sentence_quality
         }), 200
         
     except Exception as e:
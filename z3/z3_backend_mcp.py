@@ -11,6 +11,12 @@ if str(CURRENT_DIR) not in sys.path:
 
 import z3_backend as backend
 
+try:
+    from triple_export import write_triples
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 
 mcp = FastMCP("z3-backend")
 
@@ -28,13 +34,45 @@ def _status_payload() -> dict:
         "constraints_count": len(backend.solver_context["constraints"]),
         "variables_count": len(backend.solver_context["variables"]),
         "constraints": list(backend.solver_context["constraints"]),
+        "premise_cache": backend.compiled_cache_info(),
+        "relation_cache": backend.relation_cache_info(),
+        "entity_index": backend.entity_index_info(),
     }
 
 
 @mcp.tool()
-def solve_equation(equation: str) -> dict:
-    """Solve one or more comma-separated Z3 constraints and return a result string."""
-    return {"message": backend.solve_equation(equation)}
+def solve_equation(
+    equation: str,
+    variables: list[str] | None = None,
+    number_format: str = "default",
+    compact: bool = False,
+) -> dict:
+    """Solve one or more comma-separated Z3 constraints and return a result string.
+
+    variables limits the reported assignments, number_format is "default", "exact"
+    or "decimal", and compact=True returns "x=1,y=2".
+    """
+    return {
+        "message": backend.solve_equation(
+            equation, variables=variables, number_format=number_format, compact=compact
+        )
+    }
+
+
+@mcp.tool()
+def solve_equation_batch(equations: list[str], timeout_ms: int = 5000) -> dict:
+    """Solve many independent comma-separated constraint strings in one call.
+
+    Problems run in parallel, each with its own solver timeout; results are returned in
+    input order.
+    """
+    if not equations:
+        return {"message": "No problems provided"}
+    results = backend.solve_batch(equations, backend.solve_equation, timeout_ms)
+    return {
+        "count": len(results),
+        "results": [{"index": i, "message": r} for i, r in enumerate(results)],
+    }
 
 
 @mcp.tool()
@@ -58,8 +96,10 @@ def add_constraint(constraint: str) -> dict:
             backend.solver_context["variables"][entry] = backend.Real(entry)
 
     locals_dict = {**backend.solver_context["variables"]}
-    backend.solver_context["solver"].add(eval(constraint.strip(), backend.__dict__, locals_dict))
+    term = eval(constraint.strip(), backend.__dict__, locals_dict)
+    backend.solver_context["solver"].add(term)
     backend.solver_context["constraints"].append(constraint)
+    backend.solver_context["terms"].append(term)
 
     return {
         "message": "Constraint added",
@@ -69,8 +109,14 @@ def add_constraint(constraint: str) -> dict:
 
 
 @mcp.tool()
-def check_satisfiability() -> dict:
-    """Check satisfiability for the shared solver context."""
+def check_satisfiability(
+    unsat_core: bool = False, minimize_core: bool = False, core_budget_ms: int = 2000
+) -> dict:
+    """Check satisfiability for the shared solver context.
+
+    With unsat_core=True an unsat result also lists the conflicting constraints;
+    minimize_core=True shrinks that list within core_budget_ms milliseconds.
+    """
     if not backend.solver_context["solver"]:
         return {"message": "No constraints have been added yet"}
 
@@ -79,13 +125,13 @@ def check_satisfiability() -> dict:
 
     if result == sat:
         model = backend.solver_context["solver"].model()
-        assignments = {}
-        for var_name, var in backend.solver_context["variables"].items():
-            if var in model:
-                assignments[var_name] = str(model[var])
+        assignments = backend.serialize_model(model, backend.solver_context["variables"])
+        assignments = {name: value for name, value in assignments.items() if value is not None}
         return {"message": "Satisfiable", "model": assignments, **payload}
 
     if result == unsat:
+        if unsat_core or minimize_core:
+            payload.update(backend.unsat_core_payload(minimize_core, core_budget_ms))
         return {
             "message": "Unsatisfiable - no solution exists for the given constraints",
             **payload,
@@ -104,6 +150,63 @@ def prove_theorem(premises: list[str], conclusion: str) -> dict:
     return {"message": backend.prove_theorem(premises, conclusion)}
 
 
+@mcp.tool()
+def prove_theorem_declarative(
+    premises: dict | str, conclusion: list | str, premise_format: str = "json"
+) -> dict:
+    """Prove a theorem from JSON-structured or SMT-LIB2 premises without executing Python.
+
+    JSON premises declare "sorts", "functions", "constants" and "assertions", where
+    assertions and the conclusion are nested lists such as ["Implies", ["Human", "x"],
+    ["Mortal", "x"]]. With premise_format="smt2", premises is SMT-LIB2 text and the
+    conclusion an SMT-LIB2 term like "(Mortal socrates)".
+    """
+    if not premises:
+        return {"message": "No premises provided"}
+    if not conclusion:
+        return {"message": "No conclusion provided"}
+    return {"message": backend.prove_theorem_declarative(premises, conclusion, premise_format)}
+
+
+@mcp.tool()
+def register_knowledge_base(premises: list[str] | dict | str, premise_format: str = "python") -> dict:
+    """Register a premise set once and return a kb_id for repeated proofs.
+
+    premise_format is "python" (the same statements prove_theorem accepts), "json" or
+    "smt2" (the formats prove_theorem_declarative accepts).
+    """
+    if not premises:
+        return {"message": "No premises provided"}
+    try:
+        kb_id = backend.knowledge_base.register_knowledge_base(premises, premise_format)
+    except ValueError as exc:
+        return {"message": f"Error registering knowledge base: {exc}"}
+    return {
+        "message": "Knowledge base registered",
+        **backend.knowledge_base.knowledge_base_info(kb_id),
+    }
+
+
+@mcp.tool()
+def prove_with_knowledge_base(kb_id: str, conclusions: list) -> dict:
+    """Check each conclusion against a registered knowledge base with one incremental check."""
+    if not conclusions:
+        return {"message": "No conclusion provided"}
+    try:
+        results = backend.knowledge_base.prove_conclusions(kb_id, conclusions)
+    except KeyError as exc:
+        return {"message": str(exc)}
+    return {"kb_id": kb_id, "results": results}
+
+
+@mcp.tool()
+def delete_knowledge_base(kb_id: str) -> dict:
+    """Forget a registered knowledge base."""
+    if not backend.knowledge_base.delete_knowledge_base(kb_id):
+        return {"message": f"Unknown knowledge base '{kb_id}'"}
+    return {"message": "Knowledge base deleted", "kb_id": kb_id}
+
+
 @mcp.tool()
 def convert_natural_language(premises: list[str], conclusion: str) -> dict:
     """Convert natural-language premises and a conclusion into Z3 declarations and formulas."""
@@ -126,7 +229,8 @@ def extract_relations(sentence: str) -> dict:
     if not sentence:
         return {"message": "No sentence provided"}
 
-    relations = backend.extract_relations(sentence)
+    timings = {}
+    relations = backend.extract_relations(sentence, timings)
     formatted_relations = [
         {"subject": subj, "relation": rel, "object": obj}
         for subj, rel, obj in relations
@@ -137,20 +241,27 @@ def extract_relations(sentence: str) -> dict:
         "method": method,
         "relations": formatted_relations,
         "sentence": sentence,
+        "timings_ms": timings,
     }
 
 
 @mcp.tool()
-def extract_relations_from_pdf(pdf_path: str) -> dict:
-    """Extract relations from a local PDF path."""
+def extract_relations_from_pdf(
+    pdf_path: str,
+    quality_threshold: float | None = None,
+    export_path: str | None = None,
+    aggregate: bool = False,
+) -> dict:
+    """Extract relations from a local PDF path, skipping sentences below quality_threshold.
+
+    With export_path (.parquet or .arrow) the relations are written there as
+    dictionary-encoded columns and only their count is returned.  With
+    aggregate, duplicate triples are merged and returned with their count and
+    source sentences.
+    """
     if not pdf_path:
         return {"message": "No PDF path provided"}
 
-    try:
-        import PyPDF2
-    except ImportError:
-        return {"message": "PyPDF2 is not installed. Install it to use PDF extraction."}
-
     path = Path(pdf_path).expanduser().resolve()
     if not path.exists():
         return {"message": f"PDF file not found: {path}"}
@@ -158,65 +269,54 @@ def extract_relations_from_pdf(pdf_path: str) -> dict:
         return {"message": "File must be a PDF"}
 
     with path.open("rb") as handle:
-        pdf_reader = PyPDF2.PdfReader(handle)
-        text = ""
-        for page in pdf_reader.pages:
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            except Exception as exc:
-                print(f"Warning: Could not extract text from a page in {path.name}: {exc}")
-
-    text = backend.re.sub(r"\[\d+\]", " ", text)
-    text = backend.re.sub(r"-\n", "", text)
-    text = backend.re.sub(r"(\w)-\s+(\w)", r"\1\2", text)
-    text = text.replace("\n", " ")
-    text = backend._SUFFIX_PAT.sub(r"\1\2", text)
-    if backend._ENGLISH_VOCAB:
-        text = backend._repair_word_spaces(text)
-    text = backend.re.sub(r"([a-z]{3,})\.([a-zA-Z]{3,})", r"\1. \2", text)
-    text = backend.re.sub(r" {2,}", " ", text).strip()
-
-    sentences = backend.sent_tokenize(text)
-
-    def is_meaningful(token: str) -> bool:
-        token = token.strip()
-        if len(token) <= 2:
-            return False
-        if backend.re.match(r"^[^a-zA-Z]+$", token):
-            return False
-        if not token[0].isalpha():
-            return False
-        if len(token.split()) > 6:
-            return False
-        words_in_phrase = token.split()
-        if len(words_in_phrase) > 1 and any(len(word) <= 2 for word in words_in_phrase):
-            return False
-        return True
-
-    all_relations = []
-    for sentence in sentences:
-        if len(sentence.strip()) <= 10:
-            continue
-        relations = backend.extract_relations(sentence)
-        for subj, rel, obj in relations:
-            if is_meaningful(subj) and is_meaningful(rel) and is_meaningful(obj):
-                all_relations.append(
-                    {
-                        "subject": subj,
-                        "relation": rel,
-                        "object": obj,
-                        "source_sentence": sentence,
-                    }
-                )
+        pages = backend.read_pdf_pages(handle, path.name)
 
+    text, removed_chars = backend.clean_pdf_text(pages)
+    sentences = backend.split_pdf_sentences(text)
+    timings = {}
     method = "spaCy" if backend.is_linux() and backend.SPACY_AVAILABLE else "NLTK"
+    if aggregate and not export_path:
+        store, sentence_quality = backend.collect_pdf_relations(sentences, quality_threshold=quality_threshold,
+                                                                timings=timings)
+        return {
+            "method": method,
+            "sentences_processed": len(sentences),
+            "relations": store.records(),
+            "occurrences": store.occurrences,
+            "top_relations": store.top_relations(10),
+            "filename": path.name,
+            "timings_ms": timings,
+            "relation_cache": backend.relation_cache_info(),
+            "removed_chars": removed_chars,
+            "sentence_quality": sentence_quality,
+        }
+
+    all_relations, sentence_quality = backend.extract_pdf_relations(sentences, quality_threshold, timings)
+    if export_path:
+        if not ARROW_AVAILABLE:
+            return {"message": "pyarrow is not installed. Install it to export relations."}
+        export = Path(export_path).expanduser().resolve()
+        rows = write_triples(str(export), all_relations, document=path.name)
+        return {
+            "method": method,
+            "sentences_processed": len(sentences),
+            "relations_count": rows,
+            "export_path": str(export),
+            "filename": path.name,
+            "timings_ms": timings,
+            "removed_chars": removed_chars,
+            "sentence_quality": sentence_quality,
+        }
+
     return {
         "method": method,
         "sentences_processed": len(sentences),
         "relations": all_relations,
         "filename": path.name,
+        "timings_ms": timings,
+        "relation_cache": backend.relation_cache_info(),
+        "removed_chars": removed_chars,
+        "sentence_quality": sentence_quality,
     }
 
 